@@ -5,26 +5,157 @@ ElfScope 演示脚本
 此脚本演示 ElfScope 项目的完整功能和使用方法
 """
 
+import io
 import os
 import sys
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 
-def print_header(title):
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 演示中展示的静态数据，模块导入时构建一次
+_MODULES = [
+    {
+        "name": "ElfParser",
+        "file": "elfscope/core/elf_parser.py",
+        "description": "ELF文件解析器，支持多种架构",
+        "features": [
+            "自动架构检测 (x86_64, ARM, MIPS等)",
+            "符号表解析和函数提取",
+            "代码段识别和数据提取",
+            "文件信息摘要生成"
+        ]
+    },
+    {
+        "name": "Disassembler", 
+        "file": "elfscope/core/disassembler.py",
+        "description": "多架构反汇编引擎",
+        "features": [
+            "基于Capstone引擎的反汇编",
+            "调用指令识别 (call, jmp, bl等)",
+            "目标地址提取",
+            "尾调用检测"
+        ]
+    },
+    {
+        "name": "CallAnalyzer",
+        "file": "elfscope/core/call_analyzer.py", 
+        "description": "函数调用关系分析器",
+        "features": [
+            "构建有向调用图",
+            "递归调用检测",
+            "外部函数识别",
+            "调用统计信息生成"
+        ]
+    },
+    {
+        "name": "PathFinder",
+        "file": "elfscope/core/path_finder.py",
+        "description": "调用路径查找器",
+        "features": [
+            "多路径搜索算法",
+            "环检测和处理",
+            "可达性分析",
+            "关键函数识别"
+        ]
+    },
+    {
+        "name": "JsonExporter",
+        "file": "elfscope/utils/json_exporter.py",
+        "description": "结果导出工具",
+        "features": [
+            "结构化JSON导出",
+            "多种导出格式",
+            "复杂度评估",
+            "摘要报告生成"
+        ]
+    }
+]
+
+# 示例输出（export_time 在运行时填充）
+_SAMPLE_OUTPUT_TEMPLATE = {
+    "metadata": {
+        "tool_name": "ElfScope",
+        "version": "1.0.0", 
+        "export_time": None,
+        "elf_file": "/example/binary",
+        "architecture": "x86_64"
+    },
+    "functions": {
+        "main": {
+            "name": "main",
+            "address": "0x401000", 
+            "size": 100,
+            "type": "STT_FUNC",
+            "external": False
+        },
+        "helper_func": {
+            "name": "helper_func",
+            "address": "0x401100",
+            "size": 50, 
+            "type": "STT_FUNC",
+            "external": False
+        }
+    },
+    "call_relationships": [
+        {
+            "from_function": "main",
+            "to_function": "helper_func",
+            "from_address": "0x401010",
+            "to_address": "0x401100", 
+            "instruction": "call 0x401100",
+            "type": "call"
+        }
+    ],
+    "statistics": {
+        "total_functions": 2,
+        "total_calls": 1,
+        "external_functions": 0,
+        "recursive_functions": 0,
+        "average_calls_per_function": 0.5
+    }
+}
+
+_ARCHITECTURES = [
+    ("x86_64", "✅ 完全支持", "Intel/AMD 64位架构"),
+    ("x86", "✅ 完全支持", "Intel/AMD 32位架构"), 
+    ("ARM", "✅ 完全支持", "ARM 32位架构"),
+    ("AArch64", "✅ 完全支持", "ARM 64位架构"),
+    ("MIPS", "✅ 完全支持", "MIPS 架构"),
+    ("PowerPC", "✅ 完全支持", "PowerPC 32/64位"),
+    ("RISC-V", "✅ 完全支持", "RISC-V 架构")
+]
+
+_SCENARIOS = [
+    ("逆向工程", "分析二进制文件的内部结构和调用关系"),
+    ("安全研究", "识别潜在的安全漏洞和攻击路径"), 
+    ("代码审计", "理解复杂系统的函数调用流程"),
+    ("性能分析", "识别热点函数和调用瓶颈"),
+    ("依赖分析", "分析模块间的依赖关系"),
+    ("漏洞分析", "跟踪漏洞函数的调用路径"),
+    ("恶意软件分析", "理解恶意软件的行为模式")
+]
+
+def print_header(title, out=None):
     """打印标题"""
-    print(f"\n{'='*60}")
-    print(f"  {title}")
-    print(f"{'='*60}")
+    print(f"\n{'='*60}", file=out)
+    print(f"  {title}", file=out)
+    print(f"{'='*60}", file=out)
 
-def print_section(title):
+def print_section(title, out=None):
     """打印小节标题"""
-    print(f"\n{'-'*40}")
-    print(f"  {title}")
-    print(f"{'-'*40}")
+    print(f"\n{'-'*40}", file=out)
+    print(f"  {title}", file=out)
+    print(f"{'-'*40}", file=out)
 
 def main():
     """主演示函数"""
-    print_header("ElfScope - ELF 文件函数调用关系分析工具演示")
+    out = io.StringIO()
+    
+    print_header("ElfScope - ELF 文件函数调用关系分析工具演示", out)
     
     print("""
 ElfScope 是一个强大的 ELF 文件分析工具，具有以下特性：
@@ -40,9 +171,9 @@ ElfScope 是一个强大的 ELF 文件分析工具，具有以下特性：
 - 模块化架构
 - 完整测试覆盖
 - 命令行友好界面
-    """)
+    """, file=out)
     
-    print_section("项目结构")
+    print_section("项目结构", out)
     
     print("""
 ElfScope/
@@ -62,77 +193,19 @@ ElfScope/
 ├── requirements.txt         # 项目依赖
 ├── setup.py                # 安装脚本
 └── README.md               # 详细文档
-    """)
-    
-    print_section("主要模块介绍")
+    """, file=out)
     
-    modules = [
-        {
-            "name": "ElfParser",
-            "file": "elfscope/core/elf_parser.py",
-            "description": "ELF文件解析器，支持多种架构",
-            "features": [
-                "自动架构检测 (x86_64, ARM, MIPS等)",
-                "符号表解析和函数提取",
-                "代码段识别和数据提取",
-                "文件信息摘要生成"
-            ]
-        },
-        {
-            "name": "Disassembler", 
-            "file": "elfscope/core/disassembler.py",
-            "description": "多架构反汇编引擎",
-            "features": [
-                "基于Capstone引擎的反汇编",
-                "调用指令识别 (call, jmp, bl等)",
-                "目标地址提取",
-                "尾调用检测"
-            ]
-        },
-        {
-            "name": "CallAnalyzer",
-            "file": "elfscope/core/call_analyzer.py", 
-            "description": "函数调用关系分析器",
-            "features": [
-                "构建有向调用图",
-                "递归调用检测",
-                "外部函数识别",
-                "调用统计信息生成"
-            ]
-        },
-        {
-            "name": "PathFinder",
-            "file": "elfscope/core/path_finder.py",
-            "description": "调用路径查找器",
-            "features": [
-                "多路径搜索算法",
-                "环检测和处理",
-                "可达性分析",
-                "关键函数识别"
-            ]
-        },
-        {
-            "name": "JsonExporter",
-            "file": "elfscope/utils/json_exporter.py",
-            "description": "结果导出工具",
-            "features": [
-                "结构化JSON导出",
-                "多种导出格式",
-                "复杂度评估",
-                "摘要报告生成"
-            ]
-        }
-    ]
+    print_section("主要模块介绍", out)
     
-    for module in modules:
-        print(f"\n📦 {module['name']}")
-        print(f"   文件: {module['file']}")
-        print(f"   功能: {module['description']}")
-        print(f"   特性:")
+    for module in _MODULES:
+        print(f"\n📦 {module['name']}", file=out)
+        print(f"   文件: {module['file']}", file=out)
+        print(f"   功能: {module['description']}", file=out)
+        print(f"   特性:", file=out)
         for feature in module['features']:
-            print(f"     • {feature}")
+            print(f"     • {feature}", file=out)
     
-    print_section("使用示例")
+    print_section("使用示例", out)
     
     print("""
 1. 命令行使用：
@@ -169,76 +242,34 @@ paths = path_finder.find_paths('target_function')
 # 导出结果
 exporter = JsonExporter()
 exporter.export_call_relationships(analyzer, 'output.json')
-    """)
+    """, file=out)
     
-    print_section("输出格式示例")
+    print_section("输出格式示例", out)
     
-    # 创建示例输出
     sample_output = {
+        **_SAMPLE_OUTPUT_TEMPLATE,
         "metadata": {
-            "tool_name": "ElfScope",
-            "version": "1.0.0", 
-            "export_time": datetime.now().isoformat(),
-            "elf_file": "/example/binary",
-            "architecture": "x86_64"
-        },
-        "functions": {
-            "main": {
-                "name": "main",
-                "address": "0x401000", 
-                "size": 100,
-                "type": "STT_FUNC",
-                "external": False
-            },
-            "helper_func": {
-                "name": "helper_func",
-                "address": "0x401100",
-                "size": 50, 
-                "type": "STT_FUNC",
-                "external": False
-            }
-        },
-        "call_relationships": [
-            {
-                "from_function": "main",
-                "to_function": "helper_func",
-                "from_address": "0x401010",
-                "to_address": "0x401100", 
-                "instruction": "call 0x401100",
-                "type": "call"
-            }
-        ],
-        "statistics": {
-            "total_functions": 2,
-            "total_calls": 1,
-            "external_functions": 0,
-            "recursive_functions": 0,
-            "average_calls_per_function": 0.5
+            **_SAMPLE_OUTPUT_TEMPLATE["metadata"],
+            "export_time": datetime.now(timezone.utc).isoformat(timespec='seconds')
         }
     }
     
-    print("示例JSON输出:")
-    print(json.dumps(sample_output, indent=2, ensure_ascii=False))
+    print("示例JSON输出:", file=out)
+    if orjson is not None:
+        print(orjson.dumps(sample_output,
+                           option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode(), file=out)
+    else:
+        print(json.dumps(sample_output, indent=2, ensure_ascii=False), file=out)
     
-    print_section("架构支持")
+    print_section("架构支持", out)
     
-    architectures = [
-        ("x86_64", "✅ 完全支持", "Intel/AMD 64位架构"),
-        ("x86", "✅ 完全支持", "Intel/AMD 32位架构"), 
-        ("ARM", "✅ 完全支持", "ARM 32位架构"),
-        ("AArch64", "✅ 完全支持", "ARM 64位架构"),
-        ("MIPS", "✅ 完全支持", "MIPS 架构"),
-        ("PowerPC", "✅ 完全支持", "PowerPC 32/64位"),
-        ("RISC-V", "✅ 完全支持", "RISC-V 架构")
-    ]
+    print("\n支持的架构:", file=out)
+    print("架构        | 支持状态    | 说明", file=out)
+    print("-" * 45, file=out)
+    for arch, status, desc in _ARCHITECTURES:
+        print(f"{arch:<10} | {status:<10} | {desc}", file=out)
     
-    print("\n支持的架构:")
-    print("架构        | 支持状态    | 说明")
-    print("-" * 45)
-    for arch, status, desc in architectures:
-        print(f"{arch:<10} | {status:<10} | {desc}")
-    
-    print_section("测试覆盖")
+    print_section("测试覆盖", out)
     
     print("""
 ElfScope 具有完整的测试套件：
@@ -265,25 +296,15 @@ ElfScope 具有完整的测试套件：
   pytest -m unit           # 单元测试  
   pytest -m integration    # 集成测试
   pytest --cov=elfscope    # 覆盖率报告
-    """)
-    
-    print_section("应用场景")
+    """, file=out)
     
-    scenarios = [
-        ("逆向工程", "分析二进制文件的内部结构和调用关系"),
-        ("安全研究", "识别潜在的安全漏洞和攻击路径"), 
-        ("代码审计", "理解复杂系统的函数调用流程"),
-        ("性能分析", "识别热点函数和调用瓶颈"),
-        ("依赖分析", "分析模块间的依赖关系"),
-        ("漏洞分析", "跟踪漏洞函数的调用路径"),
-        ("恶意软件分析", "理解恶意软件的行为模式")
-    ]
+    print_section("应用场景", out)
     
-    print("\n应用场景:")
-    for scenario, desc in scenarios:
-        print(f"🎯 {scenario}: {desc}")
+    print("\n应用场景:", file=out)
+    for scenario, desc in _SCENARIOS:
+        print(f"🎯 {scenario}: {desc}", file=out)
     
-    print_section("性能特点")
+    print_section("性能特点", out)
     
     print("""
 🚀 高性能设计：
@@ -297,9 +318,9 @@ ElfScope 具有完整的测试套件：
 • 分析速度: 平均每秒处理数千个函数
 • 内存使用: 典型使用量 < 文件大小的2倍
 • 路径查找: 支持10层以上的深度搜索
-    """)
+    """, file=out)
     
-    print_section("未来规划")
+    print_section("未来规划", out)
     
     print("""
 🔮 后续开发计划：
@@ -321,9 +342,9 @@ v2.0 (长期目标):
 • 云端分析服务
 • 大规模批处理
 • API服务化
-    """)
+    """, file=out)
     
-    print_header("演示完成")
+    print_header("演示完成", out)
     
     print(f"""
 感谢使用 ElfScope！
@@ -345,7 +366,11 @@ v2.0 (长期目标):
 • 文档完善: 帮助改进文档
 
 ElfScope - 让ELF文件分析变得简单高效！
-    """)
+    """, file=out)
+    
+    # 整个演示文本一次性写出，避免逐行写终端
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
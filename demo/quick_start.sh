@@ -26,9 +26,9 @@ if ! command -v python3 &> /dev/null; then
     exit 1
 fi
 
-# 检查GCC（如果需要重新编译）
-if [[ ! -f "test_program" ]]; then
-    echo "📋 测试程序不存在，正在编译..."
+# 检查GCC（测试程序不存在或早于源文件时重新编译）
+if [[ ! -f "test_program" || "test_program.c" -nt "test_program" ]]; then
+    echo "📋 测试程序不存在或已过期，正在编译..."
     if ! command -v gcc &> /dev/null; then
         echo "❌ 错误: 未找到gcc，请先安装GCC编译器"
         echo "   Ubuntu/Debian: sudo apt install gcc"
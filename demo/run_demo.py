@@ -13,17 +13,30 @@ ElfScope 演示脚本
 
 使用方法:
     python3 run_demo.py
+    python3 run_demo.py --subprocess   # 通过 CLI 子进程逐步执行（用于 CLI 冒烟测试）
+
+默认模式下所有步骤在同一进程内共享一次 ELF 解析和调用关系分析的结果。
 
 注意：确保已经安装了 ElfScope 的所有依赖
 """
 
 import os
 import sys
+import argparse
+import importlib.util
 import subprocess
 import json
-import time
+import mmap
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 # 添加 ElfScope 到 Python 路径
 script_dir = Path(__file__).parent
 project_root = script_dir.parent
@@ -45,26 +58,49 @@ def run_command(cmd, description):
     print(f"🔧 执行: {description}")
     print(f"   命令: {' '.join(cmd)}")
     
+    # 子进程直接继承标准输出/错误，输出实时显示且无需在内存中缓冲
+    sys.stdout.flush()
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=project_root)
+        result = subprocess.run(cmd, cwd=project_root)
         if result.returncode == 0:
             print("✅ 成功!")
-            if result.stdout.strip():
-                print(f"输出:\n{result.stdout}")
         else:
             print("❌ 出错!")
-            if result.stderr.strip():
-                print(f"错误: {result.stderr}")
     except Exception as e:
         print(f"❌ 执行失败: {e}")
+
+def run_step(func, description):
+    """在当前进程内执行一个演示步骤并显示结果"""
+    print(f"🔧 执行: {description}")
     
-    time.sleep(1)  # 让用户有时间查看结果
+    try:
+        if func() is False:
+            print("❌ 出错!")
+        else:
+            print("✅ 成功!")
+    except Exception as e:
+        print(f"❌ 执行失败: {e}")
+
+def load_json_file(filepath):
+    """
+    读取JSON文件
+    
+    可用时使用 orjson 直接解析 mmap 映射的文件内容，避免额外的读缓冲和字符串解码；
+    空文件无法建立 mmap 映射，交由 json.load 处理
+    """
+    if ORJSON_AVAILABLE and os.path.getsize(filepath) > 0:
+        with open(filepath, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+    
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 def display_json_summary(filepath, title):
     """显示JSON文件的摘要信息"""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json_file(filepath)
         
         print(f"\n📊 {title} 摘要:")
         
@@ -117,19 +153,23 @@ def check_prerequisites():
     """检查运行环境"""
     print_header("🔍 环境检查")
     
-    # 检查test_program是否存在
+    # 检查test_program是否存在且不早于源文件（与 make 相同的时间戳判断）
     test_program = script_dir / "test_program"
-    if not test_program.exists():
-        print("❌ 测试程序不存在，尝试重新编译...")
+    test_source = script_dir / "test_program.c"
+    if test_program.exists() and test_program.stat().st_mtime >= test_source.stat().st_mtime:
+        print("✅ 测试程序已是最新")
+    else:
+        if test_program.exists():
+            print("⚠️  测试程序早于源文件，重新编译...")
+        else:
+            print("❌ 测试程序不存在，尝试重新编译...")
         try:
             subprocess.run(["gcc", "-o", "test_program", "test_program.c", "-g"], 
                          cwd=script_dir, check=True)
             print("✅ 测试程序编译成功!")
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, FileNotFoundError):
             print("❌ 无法编译测试程序，请确保安装了gcc")
             return False
-    else:
-        print("✅ 测试程序存在")
     
     # 检查Python依赖
     missing_deps = []
@@ -140,13 +180,13 @@ def check_prerequisites():
         ("click", "click")
     ]
     
+    # 只定位模块而不执行导入，避免为检查存在性加载 C 扩展
     for module_name, package_name in dependencies:
-        try:
-            __import__(module_name)
-            print(f"✅ {module_name} 模块可用")
-        except ImportError:
+        if importlib.util.find_spec(module_name) is None:
             print(f"❌ {module_name} 模块缺失")
             missing_deps.append(package_name)
+        else:
+            print(f"✅ {module_name} 模块可用")
     
     if missing_deps:
         print(f"\n⚠️  缺少依赖包: {', '.join(missing_deps)}")
@@ -167,34 +207,16 @@ def check_prerequisites():
         return False
     
     # 检查ElfScope模块
-    try:
-        import elfscope
-        print("✅ ElfScope 模块可用")
-    except ImportError as e:
-        print(f"❌ ElfScope 模块不可用: {e}")
+    if importlib.util.find_spec("elfscope") is None:
+        print("❌ ElfScope 模块不可用")
         print("\n📋 请确保在正确的目录运行此脚本，并且所有依赖已安装。")
         return False
+    print("✅ ElfScope 模块可用")
     
     return True
 
-def main():
-    """主演示函数"""
-    print_header("🚀 ElfScope 全功能演示")
-    print("欢迎使用 ElfScope - 专业的 ELF 文件函数调用关系分析工具!")
-    print("本演示将展示 ElfScope 的所有核心功能。")
-    
-    # 环境检查
-    if not check_prerequisites():
-        print("\n❌ 环境检查失败，演示终止。")
-        return
-    
-    demo_dir = script_dir
-    output_dir = demo_dir / "output"
-    test_program = "./test_program"
-    
-    # 创建输出目录
-    output_dir.mkdir(exist_ok=True)
-    
+def run_cli_demo(demo_dir, output_dir):
+    """通过 CLI 子进程逐步执行演示（每一步都会重新解析 ELF 文件）"""
     # 步骤1: 查看基本信息
     print_step(1, "查看测试程序基本信息")
     run_command([
@@ -308,6 +330,185 @@ def main():
     
     if complete_file.exists():
         display_json_summary(complete_file, "完整分析")
+
+# 工作进程内的分析结果（由 _init_export_worker 从磁盘缓存加载）
+_worker_analyzers = None
+
+def _init_export_worker(elf_path):
+    """工作进程初始化：从磁盘缓存加载调用关系和栈分析结果"""
+    global _worker_analyzers
+    from elfscope import load_or_analyze
+    _worker_analyzers = load_or_analyze(elf_path)
+
+def _export_analysis(call_analyzer, stack_analyzer, exporter, output_file):
+    return exporter.export_call_relationships(
+        call_analyzer=call_analyzer,
+        output_file=output_file
+    )
+
+def _export_fibonacci_paths(call_analyzer, stack_analyzer, exporter, output_file):
+    from elfscope import PathFinder
+    return exporter.export_call_paths(
+        path_finder=PathFinder(call_analyzer),
+        target_function="fibonacci_recursive",
+        source_function="main",
+        output_file=output_file
+    )
+
+def _export_utility_paths(call_analyzer, stack_analyzer, exporter, output_file):
+    from elfscope import PathFinder
+    return exporter.export_call_paths(
+        path_finder=PathFinder(call_analyzer),
+        target_function="utility_function_1",
+        output_file=output_file
+    )
+
+def _export_main_details(call_analyzer, stack_analyzer, exporter, output_file):
+    return exporter.export_function_details(
+        call_analyzer=call_analyzer,
+        function_name="main",
+        output_file=output_file
+    )
+
+def _export_summary(call_analyzer, stack_analyzer, exporter, output_file):
+    return exporter.create_summary_report(
+        elf_parser=call_analyzer.elf_parser,
+        call_analyzer=call_analyzer,
+        output_file=output_file
+    )
+
+def _export_stack_main(call_analyzer, stack_analyzer, exporter, output_file):
+    return exporter.export_data(stack_analyzer.get_function_stack_info("main"), output_file)
+
+def _export_stack_summary(call_analyzer, stack_analyzer, exporter, output_file):
+    return exporter.export_data({
+        'summary': stack_analyzer.get_stack_summary(),
+        'heavy_functions': stack_analyzer.find_stack_heavy_functions(limit=10)
+    }, output_file)
+
+def _export_complete(call_analyzer, stack_analyzer, exporter, output_file):
+    return exporter.export_complete_analysis(
+        elf_parser=call_analyzer.elf_parser,
+        call_analyzer=call_analyzer,
+        output_file=output_file
+    )
+
+# 相互独立的导出步骤：(步骤标题, 输出文件, 导出函数, 说明, 摘要标题)
+EXPORT_STEPS = [
+    ("2: 分析函数调用关系", "demo_analysis.json", _export_analysis,
+     "分析所有函数调用关系", "调用关系分析"),
+    ("3: 查找调用路径 (main → fibonacci_recursive)", "demo_fibonacci_paths.json", _export_fibonacci_paths,
+     "查找从main到fibonacci_recursive的所有路径", "调用路径分析"),
+    ("4: 查找所有调用路径 (→ utility_function_1)", "demo_utility_paths.json", _export_utility_paths,
+     "查找所有调用utility_function_1的路径", "所有调用路径"),
+    ("5: 分析特定函数 (main)", "demo_main_details.json", _export_main_details,
+     "分析main函数的详细信息", None),
+    ("6: 生成分析摘要", "demo_summary.json", _export_summary,
+     "生成完整的分析摘要报告", "摘要报告"),
+    ("7.1: 分析main函数的栈使用情况 ⭐ 新功能", "demo_stack_main.json", _export_stack_main,
+     "分析main函数的栈使用情况", "main函数栈分析"),
+    ("7.3: 生成程序栈使用摘要 ⭐ 新功能", "demo_stack_summary.json", _export_stack_summary,
+     "生成程序的栈使用摘要（显示栈消耗最大的10个函数）", "栈使用摘要"),
+    ("8: 完整分析 (包含所有信息)", "demo_complete.json", _export_complete,
+     "执行完整分析，包含所有信息", "完整分析"),
+]
+
+def _run_export_step(index, output_file):
+    """在工作进程中执行一个导出步骤"""
+    from elfscope import JsonExporter
+    call_analyzer, stack_analyzer = _worker_analyzers
+    export_func = EXPORT_STEPS[index][2]
+    return export_func(call_analyzer, stack_analyzer, JsonExporter(), output_file)
+
+def run_inprocess_demo(demo_dir, output_dir, jobs=None):
+    """
+    在进程内执行演示，所有步骤共享同一次解析和调用关系分析的结果
+    
+    分析结果先写入磁盘缓存，各导出步骤相互独立，由进程池并行执行。
+    """
+    from elfscope import load_or_analyze
+    
+    elf_path = str(demo_dir / "test_program")
+    
+    # 只解析和分析一次；工作进程从同一份磁盘缓存加载结果
+    call_analyzer, stack_analyzer = load_or_analyze(elf_path)
+    elf_parser = call_analyzer.elf_parser
+    
+    # 步骤1: 查看基本信息
+    print_step(1, "查看测试程序基本信息")
+    
+    def show_info():
+        file_info = elf_parser.get_file_info()
+        print(f"\nELF 文件信息: {elf_path}")
+        print(f"   架构:       {file_info['architecture']}")
+        print(f"   文件类型:   {file_info['file_type']}")
+        print(f"   入口点:     {file_info['entry_point']}")
+        print(f"   段数量:     {file_info['num_sections']}")
+        print(f"   符号数量:   {file_info['num_symbols']}")
+        print(f"   函数数量:   {file_info['num_functions']}")
+    
+    run_step(show_info, "获取ELF文件基本信息")
+    
+    # 步骤2-8: 并行导出，完成后按步骤顺序显示结果
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count(),
+                             initializer=_init_export_worker,
+                             initargs=(elf_path,)) as executor:
+        futures = {
+            executor.submit(_run_export_step, index, str(output_dir / filename)): index
+            for index, (_, filename, _, _, _) in enumerate(EXPORT_STEPS)
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future
+    
+    for index, (step, filename, _, description, summary_title) in enumerate(EXPORT_STEPS):
+        print_step(step.split(":")[0], step.split(": ", 1)[1])
+        run_step(results[index].result, description)
+        
+        output_file = output_dir / filename
+        if summary_title and output_file.exists():
+            display_json_summary(output_file, summary_title)
+        
+        # 7.2: 分析深度调用链的栈使用（仅输出到终端）
+        if filename == "demo_stack_main.json":
+            print("   🔍 分析深度调用链栈消耗...")
+            
+            def show_deep_chain_stack():
+                stack_info = stack_analyzer.get_function_stack_info("deep_call_chain_1")
+                if not stack_info['found']:
+                    print(f"   {stack_info['error']}")
+                    return False
+                print(f"   本地栈帧:     {stack_info['local_stack_frame']} 字节")
+                print(f"   最大总栈消耗: {stack_info['max_total_stack']} 字节")
+                path = stack_info.get('max_stack_call_path', [])
+                if path:
+                    print(f"   调用路径:     {' → '.join(path)}")
+            
+            run_step(show_deep_chain_stack, "分析deep_call_chain_1的栈使用情况（不保存到文件）")
+    
+    elf_parser.close()
+
+def main(use_subprocess=False, jobs=None):
+    """主演示函数"""
+    print_header("🚀 ElfScope 全功能演示")
+    print("欢迎使用 ElfScope - 专业的 ELF 文件函数调用关系分析工具!")
+    print("本演示将展示 ElfScope 的所有核心功能。")
+    
+    # 环境检查
+    if not check_prerequisites():
+        print("\n❌ 环境检查失败，演示终止。")
+        return
+    
+    demo_dir = script_dir
+    output_dir = demo_dir / "output"
+    
+    # 创建输出目录
+    output_dir.mkdir(exist_ok=True)
+    
+    if use_subprocess:
+        run_cli_demo(demo_dir, output_dir)
+    else:
+        run_inprocess_demo(demo_dir, output_dir, jobs)
     
     # 演示结束
     print_header("🎉 演示完成!")
@@ -340,8 +541,15 @@ def main():
     print("\n🚀 ElfScope 演示完成! 感谢使用!")
 
 if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="ElfScope 全功能演示")
+    arg_parser.add_argument("--subprocess", action="store_true",
+                            help="通过 CLI 子进程逐步执行（用于 CLI 冒烟测试）")
+    arg_parser.add_argument("--jobs", "-j", type=int, default=None,
+                            help="并行导出的进程数（默认使用全部 CPU 核心）")
+    args = arg_parser.parse_args()
+    
     try:
-        main()
+        main(use_subprocess=args.subprocess, jobs=args.jobs)
     except KeyboardInterrupt:
         print("\n\n⏹️  演示被用户终止。")
     except Exception as e:
@@ -7,11 +7,31 @@ ElfScope - ELF 文件分析和函数调用关系解析工具
 __version__ = "1.0.0"
 __author__ = "ElfScope Team"
 
-from .core.elf_parser import ElfParser
-from .core.call_analyzer import CallAnalyzer
-from .core.path_finder import PathFinder
-from .core.stack_analyzer import StackAnalyzer
-from .core.objdump import ObjdumpAnalyzer
-from .utils.json_exporter import JsonExporter
-
-__all__ = ['ElfParser', 'CallAnalyzer', 'PathFinder', 'StackAnalyzer', 'ObjdumpAnalyzer', 'JsonExporter']
+# 公开名称 -> 所在模块，首次访问时才导入（PEP 562），避免包导入时加载 capstone/networkx
+_LAZY_ATTRS = {
+    'ElfParser': '.core.elf_parser',
+    'CallAnalyzer': '.core.call_analyzer',
+    'PathFinder': '.core.path_finder',
+    'StackAnalyzer': '.core.stack_analyzer',
+    'ObjdumpAnalyzer': '.core.objdump',
+    'JsonExporter': '.utils.json_exporter',
+    'load_or_analyze': '.utils.analysis_cache',
+    'load_or_analyze_calls': '.utils.analysis_cache',
+}
+
+__all__ = ['ElfParser', 'CallAnalyzer', 'PathFinder', 'StackAnalyzer', 'ObjdumpAnalyzer',
+           'JsonExporter', 'load_or_analyze', 'load_or_analyze_calls']
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        import importlib
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
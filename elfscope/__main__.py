@@ -0,0 +1,9 @@
+"""
+支持以 python -m elfscope 运行命令行工具，与 elfscope 命令使用同一个入口
+"""
+
+from .cli import main
+
+
+if __name__ == '__main__':
+    main()
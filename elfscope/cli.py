@@ -11,16 +11,17 @@ import os
 import sys
 import logging
 from pathlib import Path
-from typing import Optional
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Tuple, Optional
 
 import click
 
-from .core.elf_parser import ElfParser
-from .core.call_analyzer import CallAnalyzer
-from .core.path_finder import PathFinder
-from .core.stack_analyzer import StackAnalyzer
-from .core.objdump import ObjdumpAnalyzer
-from .utils.json_exporter import JsonExporter
+# 分析模块依赖 pyelftools/capstone/networkx，导入较慢，在用到它们的命令中才导入，
+# 使 --help 等命令无需加载这些依赖
+if TYPE_CHECKING:
+    from .core.elf_parser import ElfParser
+    from .core.call_analyzer import CallAnalyzer
+    from .utils.json_exporter import JsonExporter
 
 
 def setup_logging(verbose: bool = False):
@@ -33,16 +34,212 @@ def setup_logging(verbose: bool = False):
     )
 
 
+# info 命令优先展示的入口函数名
+_ENTRY_FUNCTION_NAMES = frozenset(('main', '_start', '__libc_start_main'))
+
+# 是否使用磁盘上的分析结果缓存，由 --no-cache 关闭
+_disk_cache_enabled = True
+
+# 各命令共享的 JSON 导出器，由 _get_exporter 创建
+_exporter: Optional['JsonExporter'] = None
+
+# (绝对路径, 修改时间, 文件大小) -> 已完成分析的 (ElfParser, CallAnalyzer)
+_analyzer_cache: Dict[Tuple[str, int, int], Tuple['ElfParser', 'CallAnalyzer']] = {}
+
+
+def _get_exporter() -> 'JsonExporter':
+    """
+    获取进程内共享的 JSON 导出器，首次使用时才导入并创建
+    
+    Returns:
+        JSON 导出器
+    """
+    global _exporter
+    if _exporter is None:
+        from .utils.json_exporter import JsonExporter
+        _exporter = JsonExporter()
+    return _exporter
+
+
+def _run_with_progress(build: Callable[[Callable[[int, int], None]], Any], label: str,
+                       interval: float = 0.1) -> Any:
+    """
+    在后台线程执行 build(progress)，主线程按固定间隔刷新进度条
+    
+    分析线程的进度回调只记录最新进度，终端输出全部在主线程完成，不随函数数量增加。
+    主线程收到 Ctrl-C 时通知分析线程在下一次进度回调处停止。
+    
+    Args:
+        build: 接收进度回调并返回结果的函数
+        label: 进度条标签
+        interval: 刷新间隔（秒）
+        
+    Returns:
+        build 的返回值
+    """
+    import threading
+    from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+    
+    latest = None
+    cancelled = threading.Event()
+    
+    def progress(done: int, total: int) -> None:
+        nonlocal latest
+        if cancelled.is_set():
+            raise KeyboardInterrupt
+        latest = (done, total)
+    
+    with ThreadPoolExecutor(max_workers=1) as executor, ExitStack() as stack:
+        future = executor.submit(build, progress)
+        bar = None
+        
+        while True:
+            try:
+                result = future.result(timeout=interval)
+                finished = True
+            except FutureTimeoutError:
+                finished = False
+            except KeyboardInterrupt:
+                cancelled.set()
+                raise
+            
+            # 首次有进度时才显示进度条，命中磁盘缓存时不显示
+            if latest is not None:
+                done, total = latest
+                if bar is None:
+                    bar = stack.enter_context(click.progressbar(length=total, label=label))
+                bar.update(done - bar.pos)
+            
+            if finished:
+                return result
+
+
+def _analyzer_cache_key(elf_file: str) -> Tuple[str, int, int]:
+    """进程内分析结果缓存的键：(绝对路径, 修改时间, 文件大小)"""
+    filepath = os.path.abspath(elf_file)
+    stat = os.stat(filepath)
+    return filepath, stat.st_mtime_ns, stat.st_size
+
+
+def _get_cached_analyzer(elf_file: str) -> Optional[Tuple['ElfParser', 'CallAnalyzer']]:
+    """
+    获取已有的调用关系分析结果，不执行分析
+    
+    先查找本进程内的结果，未指定 --no-cache 时再查找磁盘缓存；
+    从磁盘缓存载入的结果同样供本进程内之后的调用复用。
+    
+    Args:
+        elf_file: ELF 文件路径
+        
+    Returns:
+        (ELF解析器, 已完成分析的调用关系分析器)，都没有时返回 None
+    """
+    key = _analyzer_cache_key(elf_file)
+    cached = _analyzer_cache.get(key)
+    if cached is not None or not _disk_cache_enabled:
+        return cached
+    
+    from .utils.analysis_cache import load_cached_calls
+    cached = load_cached_calls(elf_file)
+    if cached is not None:
+        _analyzer_cache[key] = cached
+    return cached
+
+
+def _get_analyzer(elf_file: str, progress_label: Optional[str] = None,
+                  jobs: int = 1) -> Tuple['ElfParser', 'CallAnalyzer']:
+    """
+    获取已完成调用关系分析的解析器和分析器
+    
+    同一进程内对同一文件的多次调用共享一次分析结果，文件修改时间或大小变化后重新分析。
+    未指定 --no-cache 时，跨进程复用磁盘缓存中的分析结果。
+    
+    Args:
+        elf_file: ELF 文件路径
+        progress_label: 进度条标签，为 None 时不显示进度条
+        jobs: 并行分析的进程数
+        
+    Returns:
+        (ELF解析器, 已完成分析的调用关系分析器)
+    """
+    key = _analyzer_cache_key(elf_file)
+    
+    cached = _analyzer_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    # 丢弃同一文件的过期结果
+    for stale_key in [k for k in _analyzer_cache if k[0] == key[0]]:
+        _analyzer_cache.pop(stale_key)[0].close()
+    
+    def build(progress: Optional[Callable[[int, int], None]]) -> Tuple['ElfParser', 'CallAnalyzer']:
+        if _disk_cache_enabled:
+            from .utils.analysis_cache import load_or_analyze_calls
+            return load_or_analyze_calls(elf_file, jobs=jobs, progress=progress)
+        
+        from .core.elf_parser import ElfParser
+        from .core.call_analyzer import CallAnalyzer
+        
+        elf_parser = ElfParser(elf_file)
+        call_analyzer = CallAnalyzer(elf_parser)
+        call_analyzer.analyze(jobs=jobs, progress=progress)
+        return elf_parser, call_analyzer
+    
+    if progress_label:
+        elf_parser, call_analyzer = _run_with_progress(build, progress_label)
+    else:
+        elf_parser, call_analyzer = build(None)
+    
+    _analyzer_cache[key] = (elf_parser, call_analyzer)
+    return elf_parser, call_analyzer
+
+
+def _start_profiling(ctx: click.Context, output_file: str = 'elfscope.prof') -> None:
+    """
+    对子命令的执行进行 cProfile 分析
+    
+    命令结束（包括出错退出）时把统计数据写入 output_file，
+    并在标准错误输出按累计耗时排序的前 20 项。
+    
+    Args:
+        ctx: 命令组的上下文
+        output_file: 统计数据输出路径，可用 pstats 或 snakeviz 查看
+    """
+    import cProfile
+    import pstats
+    
+    profiler = cProfile.Profile()
+    
+    def finish():
+        profiler.disable()
+        profiler.dump_stats(output_file)
+        stats = pstats.Stats(profiler, stream=sys.stderr)
+        stats.sort_stats('cumulative').print_stats(20)
+        click.echo(f"性能分析结果已保存到: {output_file}", err=True)
+    
+    ctx.call_on_close(finish)
+    profiler.enable()
+
+
 @click.group()
 @click.version_option(version='1.0.0', prog_name='ElfScope')
 @click.option('--verbose', '-v', is_flag=True, help='启用详细输出')
-def cli(verbose):
+@click.option('--no-cache', is_flag=True, help='不读写 ~/.cache/elfscope 中的分析结果缓存')
+@click.option('--profile', is_flag=True, hidden=True,
+              help='使用 cProfile 分析本次运行，结果写入 elfscope.prof')
+@click.pass_context
+def cli(ctx, verbose, no_cache, profile):
     """
     ElfScope - ELF 文件函数调用关系分析工具
     
     分析 ELF 文件中的函数调用关系，支持多种架构的反汇编和调用路径查找。
     """
+    global _disk_cache_enabled
+    _disk_cache_enabled = not no_cache
     setup_logging(verbose)
+    
+    if profile or os.environ.get('ELFSCOPE_PROFILE'):
+        _start_profiling(ctx)
 
 
 @cli.command()
@@ -50,7 +247,10 @@ def cli(verbose):
 @click.option('--output', '-o', required=True, help='输出 JSON 文件路径')
 @click.option('--include-stats', is_flag=True, default=True, help='包含统计信息')
 @click.option('--include-details', is_flag=True, default=True, help='包含函数详细信息')
-def analyze(elf_file: str, output: str, include_stats: bool, include_details: bool):
+@click.option('--stream', is_flag=True, help='逐条流式写出结果，降低大型文件的内存占用')
+@click.option('--jobs', '-j', default=1, type=click.IntRange(min=1), help='并行分析的进程数')
+def analyze(elf_file: str, output: str, include_stats: bool, include_details: bool, stream: bool,
+            jobs: int):
     """
     分析 ELF 文件的函数调用关系
     
@@ -58,33 +258,32 @@ def analyze(elf_file: str, output: str, include_stats: bool, include_details: bo
     示例:
         elfscope analyze /path/to/binary -o analysis.json
         elfscope analyze ./program -o results.json --include-stats --include-details
+        elfscope analyze ./large_binary -o results.json --stream
+        elfscope analyze ./large_binary -o results.json -j 8
     """
     try:
         click.echo(f"正在分析 ELF 文件: {elf_file}")
         
-        # 初始化解析器
-        elf_parser = ElfParser(elf_file)
-        click.echo(f"架构: {elf_parser.get_architecture()}")
-        click.echo(f"函数数量: {len(elf_parser.get_functions())}")
-        
         # 分析调用关系
-        call_analyzer = CallAnalyzer(elf_parser)
-        with click.progressbar(length=100, label='分析调用关系') as bar:
-            call_analyzer.analyze()
-            bar.update(100)
+        elf_parser, call_analyzer = _get_analyzer(elf_file, '分析调用关系', jobs=jobs)
         
         # 获取统计信息
         stats = call_analyzer.get_statistics()
-        click.echo(f"发现调用关系: {stats['total_calls']}")
-        click.echo(f"外部函数: {stats['external_functions']}")
+        _banner([
+            f"架构: {elf_parser.get_architecture()}",
+            f"函数数量: {len(elf_parser.get_functions())}",
+            f"发现调用关系: {stats['total_calls']}",
+            f"外部函数: {stats['external_functions']}",
+        ])
         
         # 导出结果
-        exporter = JsonExporter()
+        exporter = _get_exporter()
         success = exporter.export_call_relationships(
             call_analyzer=call_analyzer,
             output_file=output,
             include_statistics=include_stats,
-            include_function_details=include_details
+            include_function_details=include_details,
+            stream=stream
         )
         
         if success:
@@ -105,8 +304,10 @@ def analyze(elf_file: str, output: str, include_stats: bool, include_details: bo
 @click.option('--output', '-o', required=True, help='输出 JSON 文件路径')
 @click.option('--max-depth', '-d', default=10, help='最大搜索深度')
 @click.option('--include-cycles', is_flag=True, help='包含存在环的路径')
+@click.option('--stream', is_flag=True, help='找到每条路径后立即写出，降低内存占用')
+@click.option('--jobs', '-j', default=1, type=click.IntRange(min=1), help='并行分析的进程数')
 def paths(elf_file: str, target_function: str, source: Optional[str], 
-         output: str, max_depth: int, include_cycles: bool):
+         output: str, max_depth: int, include_cycles: bool, stream: bool, jobs: int):
     """
     查找函数调用路径
     
@@ -120,17 +321,17 @@ def paths(elf_file: str, target_function: str, source: Optional[str],
         
         # 限制搜索深度并包含环
         elfscope paths /path/to/binary target_func -d 5 --include-cycles -o paths.json
+        
+        # 路径数量很多时逐条写出
+        elfscope paths /path/to/binary target_func --include-cycles --stream -o paths.json
     """
+    from .core.path_finder import PathFinder
+    
     try:
         click.echo(f"正在分析 ELF 文件: {elf_file}")
         
         # 初始化解析器和分析器
-        elf_parser = ElfParser(elf_file)
-        call_analyzer = CallAnalyzer(elf_parser)
-        
-        with click.progressbar(length=100, label='分析调用关系') as bar:
-            call_analyzer.analyze()
-            bar.update(100)
+        elf_parser, call_analyzer = _get_analyzer(elf_file, '分析调用关系', jobs=jobs)
         
         # 查找路径
         path_finder = PathFinder(call_analyzer)
@@ -142,14 +343,15 @@ def paths(elf_file: str, target_function: str, source: Optional[str],
             click.echo("搜索所有可能的调用路径")
         
         # 导出路径
-        exporter = JsonExporter()
+        exporter = _get_exporter()
         success = exporter.export_call_paths(
             path_finder=path_finder,
             target_function=target_function,
             source_function=source,
             output_file=output,
             max_depth=max_depth,
-            include_cycles=include_cycles
+            include_cycles=include_cycles,
+            stream=stream
         )
         
         if success:
@@ -166,43 +368,42 @@ def paths(elf_file: str, target_function: str, source: Optional[str],
 @cli.command()
 @click.argument('elf_file', type=click.Path(exists=True, readable=True))
 @click.option('--output', '-o', required=True, help='输出 JSON 文件路径')
-def complete(elf_file: str, output: str):
+@click.option('--stream', is_flag=True, help='逐条流式写出结果，降低大型文件的内存占用')
+@click.option('--jobs', '-j', default=1, type=click.IntRange(min=1), help='并行分析的进程数')
+def complete(elf_file: str, output: str, stream: bool, jobs: int):
     """
     进行完整的 ELF 文件分析
     
     \b
     示例:
         elfscope complete /path/to/binary -o complete_analysis.json
+        elfscope complete /path/to/large_binary -o complete_analysis.json --stream
     """
     try:
         click.echo(f"正在进行完整分析: {elf_file}")
         
         # 初始化所有组件
-        elf_parser = ElfParser(elf_file)
-        click.echo(f"ELF 信息: {elf_parser.get_architecture()}, "
-                  f"入口点: {hex(elf_parser.get_entry_point())}")
-        
-        call_analyzer = CallAnalyzer(elf_parser)
-        
-        with click.progressbar(length=100, label='执行完整分析') as bar:
-            call_analyzer.analyze()
-            bar.update(100)
+        elf_parser, call_analyzer = _get_analyzer(elf_file, '执行完整分析', jobs=jobs)
         
         # 显示分析摘要
         stats = call_analyzer.get_statistics()
-        click.echo("\n分析摘要:")
-        click.echo(f"  函数总数: {stats['total_functions']}")
-        click.echo(f"  调用关系: {stats['total_calls']}")
-        click.echo(f"  递归函数: {stats['recursive_functions']}")
-        click.echo(f"  外部函数: {stats['external_functions']}")
-        click.echo(f"  调用环: {stats['cycles']}")
+        _banner([
+            f"ELF 信息: {elf_parser.get_architecture()}, "
+            f"入口点: {hex(elf_parser.get_entry_point())}",
+            "\n分析摘要:",
+            f"  函数总数: {stats['total_functions']}",
+            f"  调用关系: {stats['total_calls']}",
+            f"  递归函数: {stats['recursive_functions']}",
+            f"  外部函数: {stats['external_functions']}",
+            f"  调用环: {stats['cycles']}",
+        ])
         
         # 导出完整分析结果
-        exporter = JsonExporter()
+        exporter = _get_exporter()
         success = exporter.export_complete_analysis(
-            elf_parser=elf_parser,
             call_analyzer=call_analyzer,
-            output_file=output
+            output_file=output,
+            stream=stream
         )
         
         if success:
@@ -216,11 +417,122 @@ def complete(elf_file: str, output: str):
         sys.exit(1)
 
 
+def _batch_analyze_one(elf_file: str, output_file: str, complete: bool,
+                       use_cache: bool) -> Tuple[str, str, Optional[str]]:
+    """
+    批量模式的工作进程任务：分析单个 ELF 文件并导出 JSON
+    
+    Args:
+        elf_file: ELF 文件路径
+        output_file: 输出 JSON 文件路径
+        complete: 是否导出完整分析（否则导出调用关系）
+        use_cache: 是否使用分析结果磁盘缓存
+        
+    Returns:
+        (ELF 文件路径, 输出文件路径, 错误信息)，成功时错误信息为 None
+    """
+    global _disk_cache_enabled
+    _disk_cache_enabled = use_cache
+    
+    try:
+        elf_parser, call_analyzer = _get_analyzer(elf_file)
+        exporter = _get_exporter()
+        if complete:
+            success = exporter.export_complete_analysis(call_analyzer=call_analyzer,
+                                                        output_file=output_file)
+        else:
+            success = exporter.export_call_relationships(call_analyzer=call_analyzer,
+                                                         output_file=output_file)
+        return elf_file, output_file, None if success else "导出失败"
+    except Exception as e:
+        return elf_file, output_file, str(e)
+    finally:
+        # 工作进程会被复用，处理完即释放本文件的解析结果
+        for cached_parser, _ in _analyzer_cache.values():
+            cached_parser.close()
+        _analyzer_cache.clear()
+
+
+@cli.command()
+@click.argument('patterns', nargs=-1, required=True)
+@click.option('--output-dir', '-o', required=True, type=click.Path(file_okay=False),
+              help='输出目录，每个文件生成 <文件名>.json')
+@click.option('--complete', 'complete_analysis', is_flag=True, help='导出完整分析（默认导出调用关系）')
+@click.option('--jobs', '-j', default=os.cpu_count() or 1, type=click.IntRange(min=1),
+              help='同时分析的文件数（默认为 CPU 核数）')
+def batch(patterns: Tuple[str, ...], output_dir: str, complete_analysis: bool, jobs: int):
+    """
+    批量分析多个 ELF 文件，各文件在独立进程中并行分析
+    
+    PATTERNS 为文件路径或通配符（支持 ** 递归匹配）。
+    
+    \b
+    示例:
+        elfscope batch 'build/bin/*' -o results/
+        elfscope batch 'firmware/**/*.elf' -o results/ --complete -j 8
+    """
+    import glob
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    files = []
+    seen = set()
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern, recursive=True)) or [pattern]:
+            if os.path.isfile(path) and os.path.abspath(path) not in seen:
+                seen.add(os.path.abspath(path))
+                files.append(path)
+    
+    if not files:
+        click.echo("✗ 没有匹配的文件", err=True)
+        sys.exit(1)
+    
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # 同名文件（位于不同目录）的输出加序号区分
+    tasks = []
+    used_names = set()
+    for path in files:
+        name = os.path.basename(path)
+        output_name = f"{name}.json"
+        index = 1
+        while output_name in used_names:
+            output_name = f"{name}-{index}.json"
+            index += 1
+        used_names.add(output_name)
+        tasks.append((path, os.path.join(output_dir, output_name)))
+    
+    workers = min(jobs, len(tasks))
+    click.echo(f"批量分析 {len(tasks)} 个文件，并行数: {workers}")
+    
+    failures = 0
+    # 使用 spawn 启动工作进程，避免 fork 复制已加载的 capstone 等状态
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = [executor.submit(_batch_analyze_one, path, output_file, complete_analysis,
+                                   _disk_cache_enabled)
+                   for path, output_file in tasks]
+        for future in as_completed(futures):
+            elf_file, output_file, error = future.result()
+            if error is None:
+                click.echo(f"✓ {elf_file} -> {output_file}")
+            else:
+                failures += 1
+                click.echo(f"✗ {elf_file}: {error}", err=True)
+    
+    click.echo(f"\n完成: {len(tasks) - failures} 个成功，{failures} 个失败")
+    if failures:
+        sys.exit(1)
+
+
 @cli.command()
 @click.argument('elf_file', type=click.Path(exists=True, readable=True))
 @click.argument('function_name')
 @click.option('--output', '-o', required=True, help='输出 JSON 文件路径')
-def function(elf_file: str, function_name: str, output: str):
+@click.option('--fast', is_flag=True,
+              help='没有缓存的分析结果时只分析该函数的调用者和被调用函数，不构建完整调用图'
+                   '（仍需扫描所有函数的调用指令；不输出调用深度和可达性）')
+def function(elf_file: str, function_name: str, output: str, fast: bool):
     """
     分析特定函数的详细信息
     
@@ -228,43 +540,67 @@ def function(elf_file: str, function_name: str, output: str):
     示例:
         elfscope function /path/to/binary main -o main_details.json
         elfscope function ./program my_function -o function_info.json
+        elfscope function ./large_binary my_function -o function_info.json --fast
     """
     try:
         click.echo(f"正在分析函数 '{function_name}' 在文件: {elf_file}")
         
         # 初始化分析器
-        elf_parser = ElfParser(elf_file)
-        call_analyzer = CallAnalyzer(elf_parser)
-        call_analyzer.analyze()
+        function_info = None
+        if fast:
+            # 已有完整分析结果（本进程内或磁盘缓存）时直接查图，比单函数分析快得多
+            cached = _get_cached_analyzer(elf_file)
+            if cached is not None:
+                elf_parser, call_analyzer = cached
+                function_info = call_analyzer.analyze_function(function_name)
+            else:
+                from .core.elf_parser import ElfParser
+                from .core.call_analyzer import CallAnalyzer
+                
+                # 之后只用到调用图数据和文件路径，分析完即可释放文件映射
+                with ElfParser(elf_file) as elf_parser:
+                    call_analyzer = CallAnalyzer(elf_parser)
+                    function_info = call_analyzer.analyze_function(function_name)
+            function_exists = function_info is not None
+        else:
+            elf_parser, call_analyzer = _get_analyzer(elf_file)
+            function_exists = call_analyzer.has_function(function_name)
         
         # 检查函数是否存在
-        if function_name not in call_analyzer.call_graph:
+        if not function_exists:
             click.echo(f"✗ 函数 '{function_name}' 不存在", err=True)
             # 建议相似的函数名
-            all_functions = list(call_analyzer.call_graph.nodes)
-            similar_functions = [f for f in all_functions if function_name.lower() in f.lower()]
+            similar_functions = call_analyzer.find_similar_functions(function_name, limit=5)
             if similar_functions:
                 click.echo("可能的函数名:")
-                for func in similar_functions[:5]:
+                for func in similar_functions:
                     click.echo(f"  - {func}")
             sys.exit(1)
         
         # 获取函数信息
-        callers = call_analyzer.get_callers(function_name)
-        callees = call_analyzer.get_callees(function_name)
-        is_recursive = call_analyzer.is_recursive_function(function_name)
+        if function_info is not None:
+            callers = function_info['callers']
+            callees = function_info['callees']
+            is_recursive = function_info['is_recursive']
+        else:
+            callers = call_analyzer.get_callers(function_name)
+            callees = call_analyzer.get_callees(function_name)
+            is_recursive = call_analyzer.is_recursive_function(function_name)
         
-        click.echo(f"\n函数信息:")
-        click.echo(f"  调用者数量: {len(callers)}")
-        click.echo(f"  被调用函数数量: {len(callees)}")
-        click.echo(f"  是否递归: {'是' if is_recursive else '否'}")
+        _banner([
+            "\n函数信息:",
+            f"  调用者数量: {len(callers)}",
+            f"  被调用函数数量: {len(callees)}",
+            f"  是否递归: {'是' if is_recursive else '否'}",
+        ])
         
         # 导出详细信息
-        exporter = JsonExporter()
+        exporter = _get_exporter()
         success = exporter.export_function_details(
             call_analyzer=call_analyzer,
             function_name=function_name,
-            output_file=output
+            output_file=output,
+            function_info=function_info
         )
         
         if success:
@@ -281,7 +617,8 @@ def function(elf_file: str, function_name: str, output: str):
 @cli.command()
 @click.argument('elf_file', type=click.Path(exists=True, readable=True))
 @click.option('--output', '-o', required=True, help='输出摘要报告路径')
-def summary(elf_file: str, output: str):
+@click.option('--jobs', '-j', default=1, type=click.IntRange(min=1), help='并行分析的进程数')
+def summary(elf_file: str, output: str, jobs: int):
     """
     生成分析摘要报告
     
@@ -293,27 +630,25 @@ def summary(elf_file: str, output: str):
         click.echo(f"正在生成摘要报告: {elf_file}")
         
         # 快速分析
-        elf_parser = ElfParser(elf_file)
-        call_analyzer = CallAnalyzer(elf_parser)
-        call_analyzer.analyze()
+        _, call_analyzer = _get_analyzer(elf_file, jobs=jobs)
         
         # 生成摘要报告
-        exporter = JsonExporter()
+        exporter = _get_exporter()
         success = exporter.create_summary_report(
-            elf_parser=elf_parser,
             call_analyzer=call_analyzer,
             output_file=output
         )
         
         if success:
-            click.echo(f"✓ 摘要报告已保存到: {output}")
-            
-            # 显示简要统计
-            stats = call_analyzer.get_statistics()
-            click.echo("\n快速统计:")
-            click.echo(f"  函数数量: {stats['total_functions']}")
-            click.echo(f"  调用关系: {stats['total_calls']}")
-            click.echo(f"  复杂度评估: {exporter._assess_complexity(stats)}")
+            # 显示简要统计（复用生成报告时计算的统计信息）
+            stats = exporter.last_statistics
+            _banner([
+                f"✓ 摘要报告已保存到: {output}",
+                "\n快速统计:",
+                f"  函数数量: {stats['total_functions']}",
+                f"  调用关系: {stats['total_calls']}",
+                f"  复杂度评估: {exporter._assess_complexity(stats)}",
+            ])
         else:
             click.echo("✗ 生成摘要报告失败", err=True)
             sys.exit(1)
@@ -338,10 +673,11 @@ def stack(elf_file: str, function_name: str, output: Optional[str]):
         elfscope stack /path/to/binary main
         elfscope stack /path/to/binary fibonacci_recursive -o stack_info.json
     """
+    from .core.stack_analyzer import StackAnalyzer
+    
     try:
         # 初始化分析器
-        elf_parser = ElfParser(elf_file)
-        call_analyzer = CallAnalyzer(elf_parser)
+        elf_parser, call_analyzer = _get_analyzer(elf_file)
         stack_analyzer = StackAnalyzer(call_analyzer)
         
         click.echo(f"正在分析函数 '{function_name}' 的栈使用情况...")
@@ -354,39 +690,43 @@ def stack(elf_file: str, function_name: str, output: Optional[str]):
             sys.exit(1)
         
         # 显示结果
-        click.echo(f"\n函数栈分析: {function_name}")
-        click.echo("=" * 50)
-        click.echo(f"架构:           {stack_info['architecture']}")
-        click.echo(f"本地栈帧:       {stack_info['local_stack_frame']} 字节")
-        click.echo(f"最大总栈消耗:   {stack_info['max_total_stack']} 字节")
-        click.echo(f"调用栈消耗:     {stack_info['stack_consumed_by_calls']} 字节")
+        lines = [
+            f"\n函数栈分析: {function_name}",
+            "=" * 50,
+            f"架构:           {stack_info['architecture']}",
+            f"本地栈帧:       {stack_info['local_stack_frame']} 字节",
+            f"最大总栈消耗:   {stack_info['max_total_stack']} 字节",
+            f"调用栈消耗:     {stack_info['stack_consumed_by_calls']} 字节",
+        ]
         
         # 显示最大栈消耗的调用路径
         if stack_info.get('max_stack_call_path'):
-            click.echo(f"\n最大栈消耗调用路径:")
+            lines.append("\n最大栈消耗调用路径:")
             path = stack_info['max_stack_call_path']
             for i, func in enumerate(path):
                 indent = "  " * i
-                click.echo(f"{indent}└─ {func}")
+                lines.append(f"{indent}└─ {func}")
         
         # 显示路径详情（如果有的话）
         if stack_info.get('max_stack_path_details'):
-            click.echo(f"\n路径栈消耗详情:")
+            lines.append("\n路径栈消耗详情:")
             for detail in stack_info['max_stack_path_details']:
                 recursive_mark = " (递归)" if detail.get('is_recursive') else ""
                 external_mark = " (外部)" if detail.get('is_external') else ""
-                click.echo(f"  {detail['function']}: {detail['local_stack']}B → "
-                          f"累计: {detail['cumulative_stack']}B{recursive_mark}{external_mark}")
+                lines.append(f"  {detail['function']}: {detail['local_stack']}B → "
+                             f"累计: {detail['cumulative_stack']}B{recursive_mark}{external_mark}")
         
         if stack_info['called_functions']:
-            click.echo(f"\n直接调用的函数 ({len(stack_info['called_functions'])}):")
+            lines.append(f"\n直接调用的函数 ({len(stack_info['called_functions'])}):")
             for callee in stack_info['called_functions']:
                 external_mark = " (外部)" if callee['external'] else ""
-                click.echo(f"  {callee['function']}: {callee['stack_frame']} 字节{external_mark}")
+                lines.append(f"  {callee['function']}: {callee['stack_frame']} 字节{external_mark}")
+        
+        _banner(lines)
         
         # 输出到文件（如果指定）
         if output:
-            exporter = JsonExporter()
+            exporter = _get_exporter()
             success = exporter.export_data(stack_info, output)
             if success:
                 click.echo(f"\n✓ 栈分析结果已保存到: {output}")
@@ -413,10 +753,11 @@ def stack_summary(elf_file: str, output: Optional[str], top: int):
         elfscope stack-summary /path/to/binary
         elfscope stack-summary /path/to/binary -o stack_summary.json -t 20
     """
+    from .core.stack_analyzer import StackAnalyzer
+    
     try:
         # 初始化分析器
-        elf_parser = ElfParser(elf_file)
-        call_analyzer = CallAnalyzer(elf_parser)
+        elf_parser, call_analyzer = _get_analyzer(elf_file)
         stack_analyzer = StackAnalyzer(call_analyzer)
         
         click.echo("正在分析程序的栈使用情况...")
@@ -426,54 +767,61 @@ def stack_summary(elf_file: str, output: Optional[str], top: int):
         heavy_functions = stack_analyzer.find_stack_heavy_functions(limit=top)
         
         # 显示摘要
-        click.echo(f"\n栈使用摘要: {elf_file}")
-        click.echo("=" * 50)
-        click.echo(f"架构:               {summary['architecture']}")
-        click.echo(f"分析函数总数:       {summary['total_functions_analyzed']}")
-        click.echo(f"有栈消耗函数:       {summary['functions_with_stack']}")
-        click.echo(f"最大本地栈帧:       {summary['max_local_stack_frame']} 字节")
-        click.echo(f"最大总栈消耗:       {summary['max_total_stack_consumption']} 字节")
+        lines = [
+            f"\n栈使用摘要: {elf_file}",
+            "=" * 50,
+            f"架构:               {summary['architecture']}",
+            f"分析函数总数:       {summary['total_functions_analyzed']}",
+            f"有栈消耗函数:       {summary['functions_with_stack']}",
+            f"最大本地栈帧:       {summary['max_local_stack_frame']} 字节",
+            f"最大总栈消耗:       {summary['max_total_stack_consumption']} 字节",
+        ]
         
         if summary['function_with_max_local_stack']:
-            click.echo(f"最大本地栈函数:     {summary['function_with_max_local_stack']}")
+            lines.append(f"最大本地栈函数:     {summary['function_with_max_local_stack']}")
         if summary['function_with_max_total_stack']:
-            click.echo(f"最大总栈函数:       {summary['function_with_max_total_stack']}")
+            lines.append(f"最大总栈函数:       {summary['function_with_max_total_stack']}")
         
         # 显示最大栈消耗的调用路径
         if summary.get('max_total_stack_call_path'):
-            click.echo(f"\n最大栈消耗调用路径:")
+            lines.append("\n最大栈消耗调用路径:")
             path = summary['max_total_stack_call_path']
             for i, func in enumerate(path):
                 indent = "  " * i
-                click.echo(f"{indent}└─ {func}")
+                lines.append(f"{indent}└─ {func}")
         
-        click.echo(f"\n栈指针寄存器:       {summary['stack_pointer_register']}")
-        click.echo(f"栈对齐要求:         {summary['stack_alignment']} 字节")
+        lines.append(f"\n栈指针寄存器:       {summary['stack_pointer_register']}")
+        lines.append(f"栈对齐要求:         {summary['stack_alignment']} 字节")
         
         # 栈使用分布
         dist = summary['stack_distribution']
-        click.echo(f"\n栈使用分布:")
-        click.echo(f"  小栈消耗 (<64B):     {dist['small']} 函数")
-        click.echo(f"  中等栈消耗 (64-256B): {dist['medium']} 函数") 
-        click.echo(f"  大栈消耗 (256-1KB):   {dist['large']} 函数")
-        click.echo(f"  巨大栈消耗 (>1KB):    {dist['huge']} 函数")
+        lines.extend([
+            "\n栈使用分布:",
+            f"  小栈消耗 (<64B):     {dist['small']} 函数",
+            f"  中等栈消耗 (64-256B): {dist['medium']} 函数",
+            f"  大栈消耗 (256-1KB):   {dist['large']} 函数",
+            f"  巨大栈消耗 (>1KB):    {dist['huge']} 函数",
+        ])
         
         # 栈消耗最大的函数
         if heavy_functions:
-            click.echo(f"\n栈消耗最大的 {min(top, len(heavy_functions))} 个函数:")
-            for i, func in enumerate(heavy_functions):
-                ratio_text = f" (比例: {func['stack_ratio']:.1f}x)" if func['stack_ratio'] > 0 else ""
-                click.echo(f"  {i+1:2d}. {func['function']: <25} "
-                          f"总计: {func['max_total_stack']:4d}B "
-                          f"本地: {func['local_stack_frame']:4d}B{ratio_text}")
+            lines.append(f"\n栈消耗最大的 {min(top, len(heavy_functions))} 个函数:")
+            for i, func in enumerate(heavy_functions, 1):
+                ratio = func['stack_ratio']
+                ratio_text = f" (比例: {ratio:.1f}x)" if ratio > 0 else ""
+                lines.append(f"  {i:2d}. {func['function']: <25} "
+                             f"总计: {func['max_total_stack']:4d}B "
+                             f"本地: {func['local_stack_frame']:4d}B{ratio_text}")
                 
                 # 显示调用路径（简化版本，只显示前5个函数）
-                if func.get('max_stack_call_path') and len(func['max_stack_call_path']) > 1:
-                    path = func['max_stack_call_path'][:5]  # 限制显示长度
-                    path_str = " → ".join(path)
-                    if len(func['max_stack_call_path']) > 5:
+                call_path = func.get('max_stack_call_path')
+                if call_path and len(call_path) > 1:
+                    path_str = " → ".join(call_path[:5])  # 限制显示长度
+                    if len(call_path) > 5:
                         path_str += " → ..."
-                    click.echo(f"      路径: {path_str}")
+                    lines.append(f"      路径: {path_str}")
+        
+        _banner(lines)
         
         # 输出到文件（如果指定）
         if output:
@@ -481,7 +829,7 @@ def stack_summary(elf_file: str, output: Optional[str], top: int):
                 'summary': summary,
                 'heavy_functions': heavy_functions
             }
-            exporter = JsonExporter()
+            exporter = _get_exporter()
             success = exporter.export_data(full_data, output)
             if success:
                 click.echo(f"\n✓ 栈摘要已保存到: {output}")
@@ -504,40 +852,94 @@ def info(elf_file: str):
         elfscope info /path/to/binary
     """
     try:
+        # 文件未修改时直接输出缓存的信息，不解析 ELF 文件
+        if _disk_cache_enabled:
+            from .utils.info_cache import load_info_text
+            cached = load_info_text(elf_file)
+            if cached is not None:
+                click.echo(f"\nELF 文件信息: {elf_file}\n{cached}", nl=False)
+                return
+        
+        from .core.elf_parser import ElfParser
+        
+        # 只解析 ELF 头和节区头，先输出这部分信息，之后才解析符号表
         elf_parser = ElfParser(elf_file)
-        file_info = elf_parser.get_file_info()
         
-        click.echo(f"\nELF 文件信息: {elf_file}")
-        click.echo("=" * 50)
-        click.echo(f"架构:       {file_info['architecture']}")
-        click.echo(f"文件类型:   {file_info['file_type']}")
-        click.echo(f"入口点:     {file_info['entry_point']}")
-        click.echo(f"段数量:     {file_info['num_sections']}")
-        click.echo(f"符号数量:   {file_info['num_symbols']}")
-        click.echo(f"函数数量:   {file_info['num_functions']}")
-        click.echo(f"代码段数量: {file_info['text_sections']}")
+        header = [
+            "=" * 50,
+            f"架构:       {elf_parser.get_architecture()}",
+            f"文件类型:   {elf_parser.file_type}",
+            f"入口点:     {hex(elf_parser.get_entry_point())}",
+            f"段数量:     {len(elf_parser.sections)}",
+        ]
+        _banner([f"\nELF 文件信息: {elf_file}"] + header)
+        
+        file_info = elf_parser.get_file_info()
+        lines = [
+            f"符号数量:   {file_info['num_symbols']}",
+            f"函数数量:   {file_info['num_functions']}",
+            f"代码段数量: {file_info['text_sections']}",
+        ]
         
         # 显示主要函数（如果存在）
         functions = elf_parser.get_functions()
         if functions:
-            click.echo(f"\n主要函数:")
-            main_functions = [f for f in functions if f['name'] in ['main', '_start', '__libc_start_main']]
+            lines.append("\n主要函数:")
+            main_functions = [f for f in functions if f['name'] in _ENTRY_FUNCTION_NAMES]
             if main_functions:
-                for func in main_functions:
-                    click.echo(f"  {func['name']} @ {hex(func['value'])}")
+                lines.extend([f"  {func['name']} @ 0x{func['value']:x}" for func in main_functions])
             else:
                 # 显示前几个函数
-                for func in functions[:5]:
-                    if func['name']:
-                        click.echo(f"  {func['name']} @ {hex(func['value'])}")
+                lines.extend([f"  {func['name']} @ 0x{func['value']:x}"
+                              for func in functions[:5] if func['name']])
                 if len(functions) > 5:
-                    click.echo(f"  ... 还有 {len(functions) - 5} 个函数")
+                    lines.append(f"  ... 还有 {len(functions) - 5} 个函数")
+        
+        _banner(lines)
+        elf_parser.close()
+        
+        # 缓存文件路径行之后的内容，路径行按本次传入的参数输出
+        if _disk_cache_enabled:
+            from .utils.info_cache import store_info_text
+            store_info_text(elf_file, '\n'.join(header + lines) + '\n')
         
     except Exception as e:
         click.echo(f"✗ 获取 ELF 信息失败: {e}", err=True)
         sys.exit(1)
 
 
+def _banner(lines: List[str]) -> None:
+    """
+    将多行文本拼接后一次输出，避免每行一次 write
+    
+    Args:
+        lines: 不含换行符的文本行
+    """
+    click.echo('\n'.join(lines))
+
+
+def _echo_lines(lines: Iterable[str], chunk_size: int = 1 << 20) -> None:
+    """
+    逐行输出文本，累积约 chunk_size 个字符后一次写出
+    
+    Args:
+        lines: 不含换行符的文本行
+        chunk_size: 每次写出的大致字符数
+    """
+    buffer = []
+    buffered = 0
+    for line in lines:
+        buffer.append(line)
+        buffered += len(line) + 1
+        if buffered >= chunk_size:
+            buffer.append('')
+            click.echo('\n'.join(buffer), nl=False)
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        click.echo('\n'.join(buffer))
+
+
 @cli.command()
 @click.argument('elf_file', type=click.Path(exists=True, readable=True))
 @click.option('--disassemble', '-d', is_flag=True, help='反汇编代码段')
@@ -549,13 +951,16 @@ def info(elf_file: str):
 @click.option('--section', help='指定节区名称')
 @click.option('--reloc', '-r', is_flag=True, help='显示重定位信息')
 @click.option('--output', '-o', help='JSON 输出文件路径（可选）')
+@click.option('--stream', is_flag=True, help='流式写出 JSON（每条指令/记录一行），降低大型文件的内存占用')
 @click.option('--start-addr', help='起始地址（十六进制，如 0x401000）')
 @click.option('--stop-addr', help='结束地址（十六进制，如 0x401100）')
+@click.option('--iced', 'use_iced', is_flag=True,
+              help='x86/x86_64 使用解码更快的 iced-x86（需要安装 iced-x86，部分指令写法与 Capstone 不同）')
 def objdump(elf_file: str, disassemble: bool, disassemble_all: bool, 
            function: Optional[str], syms: bool, headers: bool, 
            full_contents: bool, section: Optional[str], reloc: bool,
-           output: Optional[str], start_addr: Optional[str], 
-           stop_addr: Optional[str]):
+           output: Optional[str], stream: bool, start_addr: Optional[str], 
+           stop_addr: Optional[str], use_iced: bool):
     """
     显示 ELF 文件信息（类似 GNU objdump）
     
@@ -581,7 +986,16 @@ def objdump(elf_file: str, disassemble: bool, disassemble_all: bool,
         
         # 反汇编指定地址范围
         elfscope objdump /path/to/binary -d --start-addr 0x401000 --stop-addr 0x401100
+        
+        # 反汇编结果流式写入 JSON
+        elfscope objdump /path/to/binary -d -o disasm.json --stream
+        
+        # 使用 iced-x86 反汇编 x86/x86_64 代码
+        elfscope objdump /path/to/binary -d --iced
     """
+    from .core.elf_parser import ElfParser
+    from .core.objdump import ObjdumpAnalyzer
+    
     try:
         # 如果没有指定任何选项，显示帮助信息
         if not any([disassemble, disassemble_all, function, syms, headers, 
@@ -592,123 +1006,115 @@ def objdump(elf_file: str, disassemble: bool, disassemble_all: bool,
         
         # 初始化解析器和分析器
         elf_parser = ElfParser(elf_file)
-        objdump_analyzer = ObjdumpAnalyzer(elf_parser)
+        objdump_analyzer = ObjdumpAnalyzer(elf_parser, use_iced=use_iced)
         
-        output_data = {}
+        # 收集请求的操作：(结果键, 以 ObjdumpAnalyzer 为参数的计算函数)
+        actions = []
         
-        # 处理反汇编
         if disassemble or disassemble_all or function or start_addr:
             if function:
                 # 反汇编指定函数
                 click.echo(f"正在反汇编函数: {function}")
-                result = objdump_analyzer.disassemble_function(function)
-                output_text = objdump_analyzer.format_disassembly(result, 'text')
-                click.echo(output_text)
-                output_data['disassembly'] = result
+                actions.append(('disassembly',
+                                lambda analyzer: analyzer.disassemble_function(function)))
             elif start_addr:
                 # 反汇编地址范围
                 start = int(start_addr, 16) if isinstance(start_addr, str) else start_addr
                 stop = int(stop_addr, 16) if stop_addr and isinstance(stop_addr, str) else None
                 click.echo(f"正在反汇编地址范围: {start_addr} - {stop_addr or 'end'}")
-                result = objdump_analyzer.disassemble_section(
+                actions.append(('disassembly', lambda analyzer: analyzer.disassemble_section(
                     start_address=start,
                     end_address=stop
-                )
-                output_text = objdump_analyzer.format_disassembly(result, 'text')
-                click.echo(output_text)
-                output_data['disassembly'] = result
+                )))
             else:
                 # 反汇编代码段
                 click.echo("正在反汇编代码段...")
-                result = objdump_analyzer.disassemble_section(
+                actions.append(('disassembly', lambda analyzer: analyzer.disassemble_section(
                     section_name=section if not disassemble_all else None
-                )
-                output_text = objdump_analyzer.format_disassembly(result, 'text')
-                click.echo(output_text)
-                output_data['disassembly'] = result
+                )))
+        if syms:
+            actions.append(('symbols', lambda analyzer: analyzer.show_symbols()))
+        if headers:
+            actions.append(('headers', lambda analyzer: analyzer.show_headers()))
+        if full_contents:
+            actions.append(('full_contents',
+                            lambda analyzer: analyzer.show_full_contents(section_name=section)))
+        if reloc:
+            actions.append(('relocations',
+                            lambda analyzer: analyzer.show_relocations(section_name=section)))
+        
+        # 各项操作依次在同一个分析器上执行，结果按 actions 的顺序排列
+        output_data = {key: action(objdump_analyzer) for key, action in actions}
+        
+        # 处理反汇编（逐行生成、分块写出，不拼接整段文本）
+        if 'disassembly' in output_data:
+            _echo_lines(objdump_analyzer.iter_disassembly_lines(output_data['disassembly']))
         
         # 处理符号表
         if syms:
-            click.echo("\n符号表:")
-            click.echo("=" * 80)
-            result = objdump_analyzer.show_symbols()
+            result = output_data['symbols']
             
             # 格式化输出
-            click.echo(f"{'地址':<18} {'大小':<10} {'类型':<12} {'绑定':<10} {'名称'}")
-            click.echo("-" * 80)
-            
-            for symbol in result['symbols']:
-                addr = symbol['value']
-                size = symbol['size']
-                sym_type = symbol['type']
-                bind = symbol['bind']
-                name = symbol['name']
-                click.echo(f"{addr:<18} {size:<10} {sym_type:<12} {bind:<10} {name}")
-            
+            _banner([
+                "\n符号表:",
+                "=" * 80,
+                f"{'地址':<18} {'大小':<10} {'类型':<12} {'绑定':<10} {'名称'}",
+                "-" * 80,
+            ])
+            _echo_lines(
+                f"{symbol['value']:<18} {symbol['size']:<10} {symbol['type']:<12} "
+                f"{symbol['bind']:<10} {symbol['name']}"
+                for symbol in result['symbols']
+            )
             click.echo(f"\n总计: {result['total_count']} 个符号")
-            output_data['symbols'] = result
         
         # 处理节区头
         if headers:
-            click.echo("\n节区头:")
-            click.echo("=" * 100)
-            result = objdump_analyzer.show_headers()
+            result = output_data['headers']
             
             # 格式化输出
-            click.echo(f"{'节区名称':<20} {'地址':<18} {'偏移':<12} {'大小':<12} {'标志':<8} {'对齐'}")
-            click.echo("-" * 100)
-            
+            lines = [
+                "\n节区头:",
+                "=" * 100,
+                f"{'节区名称':<20} {'地址':<18} {'偏移':<12} {'大小':<12} {'标志':<8} {'对齐'}",
+                "-" * 100,
+            ]
             for sec in result['sections']:
                 name = sec['name'][:18]  # 限制名称长度
-                addr = sec['address']
-                offset = sec['offset']
-                size = sec['size']
-                flags = sec['flags']
-                align = sec['alignment']
-                click.echo(f"{name:<20} {addr:<18} {offset:<12} {size:<12} {flags:<8} {align}")
-            
-            click.echo(f"\n总计: {result['total_count']} 个节区")
-            output_data['headers'] = result
+                lines.append(f"{name:<20} {sec['address']:<18} {sec['offset']:<12} "
+                             f"{sec['size']:<12} {sec['flags']:<8} {sec['alignment']}")
+            lines.append(f"\n总计: {result['total_count']} 个节区")
+            _banner(lines)
         
         # 处理完整内容
         if full_contents:
-            click.echo("\n节区完整内容:")
-            click.echo("=" * 100)
-            result = objdump_analyzer.show_full_contents(section_name=section)
-            
-            for sec in result['sections']:
-                click.echo(f"\n节区 {sec['name']} (地址: {sec['address']}, 大小: {sec['size']} 字节):")
-                click.echo("-" * 100)
-                
-                for line in sec['lines']:
-                    click.echo(f" {line['address']}  {line['hex']}  |{line['ascii']}|")
-            
-            output_data['full_contents'] = result
+            _banner(["\n节区完整内容:", "=" * 100])
+            _echo_lines(objdump_analyzer.iter_full_contents_lines(output_data['full_contents']))
         
         # 处理重定位信息
         if reloc:
-            click.echo("\n重定位信息:")
-            click.echo("=" * 80)
-            result = objdump_analyzer.show_relocations(section_name=section)
+            result = output_data['relocations']
             
-            for reloc_sec in result['relocations']:
-                click.echo(f"\n节区 {reloc_sec['section']}:")
-                click.echo(f"{'偏移':<18} {'类型':<15} {'符号':<30} {'符号值'}")
-                click.echo("-" * 80)
-                
-                for reloc in reloc_sec['relocations']:
-                    offset = reloc['offset']
-                    reloc_type = str(reloc['type'])
-                    symbol = reloc.get('symbol', '')
-                    sym_value = reloc.get('symbol_value', '')
-                    click.echo(f"{offset:<18} {reloc_type:<15} {symbol:<30} {sym_value}")
+            def reloc_lines():
+                yield "\n重定位信息:"
+                yield "=" * 80
+                for reloc_sec in result['relocations']:
+                    yield f"\n节区 {reloc_sec['section']}:"
+                    yield f"{'偏移':<18} {'类型':<15} {'符号':<30} {'符号值'}"
+                    yield "-" * 80
+                    for reloc in reloc_sec['relocations']:
+                        offset = reloc['offset']
+                        reloc_type = str(reloc['type'])
+                        symbol = reloc.get('symbol', '')
+                        sym_value = reloc.get('symbol_value', '')
+                        yield f"{offset:<18} {reloc_type:<15} {symbol:<30} {sym_value}"
             
-            output_data['relocations'] = result
+            _echo_lines(reloc_lines())
         
         # 输出JSON（如果指定）
         if output:
-            exporter = JsonExporter()
-            success = exporter.export_data(output_data, output)
+            exporter = _get_exporter()
+            success = exporter.export_data(output_data, output, stream=stream)
             if success:
                 click.echo(f"\n✓ 结果已保存到: {output}")
             else:
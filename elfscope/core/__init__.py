@@ -2,11 +2,29 @@
 核心模块包含ELF解析、反汇编、函数调用关系分析、路径查找和栈分析的核心功能
 """
 
-from .elf_parser import ElfParser
-from .disassembler import Disassembler
-from .call_analyzer import CallAnalyzer
-from .path_finder import PathFinder
-from .stack_analyzer import StackAnalyzer
-from .objdump import ObjdumpAnalyzer
+# 公开名称 -> 所在模块，首次访问时才导入（PEP 562）。导入子模块（如 elfscope.core.elf_parser）
+# 时会先执行本文件，这里不能直接导入各子模块，否则只用到 ElfParser 的 info 命令也会加载 capstone/networkx
+_LAZY_ATTRS = {
+    'ElfParser': '.elf_parser',
+    'Disassembler': '.disassembler',
+    'CallAnalyzer': '.call_analyzer',
+    'PathFinder': '.path_finder',
+    'StackAnalyzer': '.stack_analyzer',
+    'ObjdumpAnalyzer': '.objdump',
+}
 
 __all__ = ['ElfParser', 'Disassembler', 'CallAnalyzer', 'PathFinder', 'StackAnalyzer', 'ObjdumpAnalyzer']
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        import importlib
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
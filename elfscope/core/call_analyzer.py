@@ -7,16 +7,134 @@
 - 生成调用关系数据结构
 """
 
-from typing import Dict, List, Set, Optional, Tuple, Any
+from typing import Callable, Dict, Iterator, List, Set, Optional, Tuple, Any
+import sys
+import bisect
+import difflib
+import itertools
 import logging
 from collections import defaultdict
 import networkx as nx
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures import (ThreadPoolExecutor, ProcessPoolExecutor,
+                                TimeoutError as FutureTimeoutError)
+
+try:
+    from rapidfuzz import process as fuzz_process, fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    fuzz_process = None
+    fuzz = None
 
 from .elf_parser import ElfParser
 from .disassembler import Disassembler, DisassemblerError
 
 
+# 并行分析时每个工作进程持有的分析器，由 _init_analysis_worker 创建
+_worker_analyzer = None
+
+
+def _init_analysis_worker(filepath: str) -> None:
+    """
+    工作进程初始化：打开 ELF 文件并创建反汇编引擎（每个进程只做一次）
+    
+    Args:
+        filepath: ELF 文件路径
+    """
+    global _worker_analyzer
+    _worker_analyzer = CallAnalyzer(ElfParser(filepath))
+
+
+def _analyze_function_chunk(tasks: List[Tuple[str, int, Dict[str, Any]]]
+                            ) -> Tuple[Dict[str, List], Dict[int, Set[str]]]:
+    """
+    在工作进程中分析一批函数
+    
+    Args:
+        tasks: (段名, 段基地址, 函数信息) 列表
+        
+    Returns:
+        (函数 -> 调用列表, 地址 -> 调用者集合)
+    """
+    analyzer = _worker_analyzer
+    analyzer.function_calls = defaultdict(list)
+    analyzer.call_targets = defaultdict(set)
+    
+    views = {}
+    for section_name, section_addr, func in tasks:
+        if section_name not in views:
+            views[section_name] = analyzer.elf_parser.get_section_view(section_name)
+        analyzer._analyze_function(func, views[section_name], section_addr)
+    
+    return dict(analyzer.function_calls), dict(analyzer.call_targets)
+
+
+class CallRecord:
+    """
+    单条调用关系
+    
+    大型二进制可能有上百万条调用，用 __slots__ 代替每条一个字典以节省内存。
+    同时支持 record['key']、record.get() 和 in 等字典式访问，
+    对外输出（get_call_relationships 等）时用 to_dict() 转换为字典。
+    """
+    
+    __slots__ = ('from_function', 'to_function', 'from_address', 'to_address',
+                 'instruction', 'type', 'external')
+    
+    def __init__(self, from_function: str, to_function: str, from_address: int,
+                 to_address: int, instruction: str, type: str, external: bool = False):
+        self.from_function = from_function
+        self.to_function = to_function
+        self.from_address = from_address
+        self.to_address = to_address
+        self.instruction = instruction
+        self.type = type
+        self.external = external
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def __contains__(self, key: object) -> bool:
+        # 与原先的字典一致，只有外部调用才带 external 键
+        return key in self.__slots__ and (key != 'external' or self.external)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self else default
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典，external 键只在外部调用时出现"""
+        record = {
+            'from_function': self.from_function,
+            'to_function': self.to_function,
+            'from_address': self.from_address,
+            'to_address': self.to_address,
+            'instruction': self.instruction,
+            'type': self.type
+        }
+        if self.external:
+            record['external'] = True
+        return record
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CallRecord):
+            return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"CallRecord({self.to_dict()!r})"
+
+
 class CallAnalyzer:
     """
     函数调用关系分析器
@@ -24,6 +142,9 @@ class CallAnalyzer:
     结合 ELF 解析和反汇编功能，分析函数间的调用关系
     """
     
+    # 并行分析时每批至少包含的函数数，避免函数很少时为几个函数启动进程
+    MIN_PARALLEL_CHUNK = 16
+    
     def __init__(self, elf_parser: ElfParser):
         """
         初始化调用关系分析器
@@ -47,6 +168,23 @@ class CallAnalyzer:
         # 函数地址到名称的映射
         self.addr_to_function = {}
         self.name_to_function = {}
+        # 代码段名 -> 位于该段内且大小有效的函数列表，由 _section_functions 首次调用时构建
+        self._functions_by_section = None
+        
+        # 函数名 -> 调用深度的缓存，重新分析或载入分析结果时清空
+        self._depths = {}
+        
+        # find_cycles 的结果，重新分析或载入分析结果时清空
+        self._cycles = None
+        
+        # 函数名及其小写形式，用于相似函数名查找，分析完成或载入分析结果后重建
+        self._names = []
+        self._names_lower = []
+        self._names_by_lower = {}
+        self._names_indexed = False
+        # 小写函数名以换行符拼接成的整串及各名称的起始偏移，用于 C 层子串查找
+        self._names_blob = ''
+        self._names_offsets = []
         
         # 分析结果
         self.analyzed = False
@@ -56,6 +194,7 @@ class CallAnalyzer:
     def _build_function_maps(self) -> None:
         """构建函数地址和名称的映射"""
         functions = self.elf_parser.get_functions()
+        nodes = []
         
         for func in functions:
             addr = func['value']
@@ -65,57 +204,205 @@ class CallAnalyzer:
                 self.addr_to_function[addr] = func
                 if name:
                     self.name_to_function[name] = func
-                    # 添加节点到图中
-                    self.call_graph.add_node(name, **func)
+                    nodes.append((name, func))
+        
+        # 批量添加节点到图中（节点属性为函数信息的副本）
+        self.call_graph.add_nodes_from(nodes)
     
-    def analyze(self) -> None:
+    def analyze(self, jobs: int = 1,
+                progress: Optional[Callable[[int, int], None]] = None) -> None:
         """
         执行完整的调用关系分析
         
         分析所有代码段中的函数调用关系
+        
+        Args:
+            jobs: 并行分析的进程数，大于 1 时各函数分批交给进程池反汇编
+            progress: 进度回调，以 (已完成函数数, 函数总数) 调用；
+                串行时每个函数调用一次，并行时每完成一批调用一次
+        """
+        for done, total in self.iter_analyze(jobs):
+            if progress:
+                progress(done, total)
+    
+    def iter_analyze(self, jobs: int = 1) -> Iterator[Tuple[int, int]]:
+        """
+        逐步执行完整的调用关系分析
+        
+        串行时每分析完一个函数、并行时每完成一批产出一次进度，调用方可以据此
+        显示进度或中途停止。迭代结束后才构建调用图并标记为已分析；中途停止时
+        已收集的调用关系保留，但 analyzed 仍为 False。
+        
+        Args:
+            jobs: 并行分析的进程数，大于 1 时各函数分批交给进程池反汇编
+            
+        Yields:
+            (已完成函数数, 函数总数)
         """
         logging.info(f"开始分析 {self.elf_parser.filepath} 的函数调用关系")
         
         text_sections = self.elf_parser.get_text_sections()
         
-        for section in text_sections:
-            self._analyze_section(section)
+        if jobs > 1:
+            yield from self._iter_analyze_parallel(text_sections, jobs)
+        else:
+            yield from self._iter_analyze_sections(text_sections)
         
         self._build_call_graph()
         self.analyzed = True
+        self._cycles = None
+        self._depths = {}
+        self._names_indexed = False
         
-        logging.info(f"分析完成，发现 {len(self.call_graph.nodes)} 个函数，{len(self.call_graph.edges)} 个调用关系")
+        logging.info(f"分析完成，发现 {len(self.call_graph.nodes)} 个函数，"
+                     f"{len(self.call_graph.edges)} 个调用关系")
     
-    def _analyze_section(self, section: Dict[str, Any]) -> None:
+    def _iter_analyze_sections(self, text_sections: List[Dict[str, Any]]
+                               ) -> Iterator[Tuple[int, int]]:
         """
-        分析单个代码段
+        串行分析各代码段中的函数
+        
+        Args:
+            text_sections: 代码段信息列表
+            
+        Yields:
+            每分析完一个函数产出 (已完成函数数, 函数总数)
+        """
+        work = []
+        for section in text_sections:
+            # 没有函数符号的段（如 .plt、.init）不读取数据
+            functions = self._section_functions(section)
+            if not functions:
+                continue
+            
+            section_data = self.elf_parser.get_section_view(section['name'])
+            
+            if not section_data:
+                logging.warning(f"无法获取段 {section['name']} 的数据")
+                continue
+            
+            work.append((section_data, section['addr'], functions))
+        
+        total = sum(len(functions) for _, _, functions in work)
+        done = 0
+        
+        # 分析每个段中的每个函数
+        for section_data, section_addr, functions in work:
+            for func in functions:
+                self._analyze_function(func, section_data, section_addr)
+                done += 1
+                yield done, total
+    
+    def _section_functions(self, section: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        获取位于代码段内且大小有效的函数
         
         Args:
             section: 代码段信息
+            
+        Returns:
+            函数信息列表
+        """
+        if self._functions_by_section is None:
+            self._functions_by_section = self._bucket_functions_by_section()
+        return self._functions_by_section.get(section['name'], [])
+    
+    def _bucket_functions_by_section(self) -> Dict[str, List[Dict[str, Any]]]:
         """
-        section_name = section['name']
-        section_data = self.elf_parser.get_section_data(section_name)
+        遍历一次函数列表，把大小有效的函数分到其所在的各代码段
         
-        if not section_data:
-            logging.warning(f"无法获取段 {section_name} 的数据")
-            return
+        代码段按起始地址排序后二分查找候选段，各段内保持符号表中的顺序。
+        代码段地址范围重叠（如可重定位文件中各段地址均为 0）时，函数归入每个包含它的段。
         
-        section_addr = section['addr']
-        functions = self.elf_parser.get_functions()
+        Returns:
+            代码段名 -> 函数信息列表
+        """
+        sections = sorted(self.elf_parser.get_text_sections(), key=lambda s: s['addr'])
+        starts = [section['addr'] for section in sections]
+        # max_ends[i] 为前 i + 1 个段的最大结束地址，向前查找候选段时据此提前停止
+        max_ends = list(itertools.accumulate((s['addr'] + s['size'] for s in sections), max))
+        
+        buckets = {section['name']: [] for section in sections}
+        for func in self.elf_parser.get_functions():
+            if func['size'] <= 0:
+                continue
+            addr = func['value']
+            i = bisect.bisect_right(starts, addr) - 1
+            while i >= 0 and max_ends[i] > addr:
+                section = sections[i]
+                if addr < section['addr'] + section['size']:
+                    buckets[section['name']].append(func)
+                i -= 1
+        return buckets
+    
+    def _iter_analyze_parallel(self, text_sections: List[Dict[str, Any]],
+                               jobs: int) -> Iterator[Tuple[int, int]]:
+        """
+        使用进程池并行分析所有代码段中的函数
         
-        # 分析该段中的每个函数
-        for func in functions:
-            func_addr = func['value']
-            func_size = func['size']
+        每个工作进程自行打开并映射 ELF 文件（页面经页缓存共享），
+        只把调用关系传回主进程合并。按提交顺序合并，结果与串行分析一致。
+        
+        Args:
+            text_sections: 代码段信息列表
+            jobs: 进程数
             
-            # 检查函数是否在当前段中
-            if (section_addr <= func_addr < section_addr + section['size'] and
-                func_size > 0):
-                
-                self._analyze_function(func, section_data, section_addr)
+        Yields:
+            每完成一批产出 (已完成函数数, 函数总数)
+        """
+        tasks = []
+        for section in text_sections:
+            functions = self._section_functions(section)
+            if not functions:
+                continue
+            if not self.elf_parser.get_section_view(section['name']):
+                logging.warning(f"无法获取段 {section['name']} 的数据")
+                continue
+            for func in functions:
+                tasks.append((section['name'], section['addr'], func))
+        
+        if not tasks:
+            return
+        
+        # 切成比进程数更多的小块，平衡大小不一的函数
+        chunk_size = max(1, -(-len(tasks) // (jobs * 4)), self.MIN_PARALLEL_CHUNK)
+        chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+        
+        # 每个工作进程都要重新打开 ELF 文件并初始化反汇编引擎，
+        # 函数太少时不启动多余的进程，只有一块时直接串行分析
+        workers = min(jobs, len(chunks))
+        if workers < 2:
+            yield from self._iter_analyze_sections(text_sections)
+            return
+        
+        try:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_init_analysis_worker,
+                                     initargs=(self.elf_parser.filepath,)) as executor:
+                results = []
+                done = 0
+                for chunk, result in zip(chunks, executor.map(_analyze_function_chunk, chunks)):
+                    results.append(result)
+                    done += len(chunk)
+                    yield done, len(tasks)
+        except (OSError, RuntimeError) as e:
+            logging.warning(f"无法启动进程池（{e}），改为串行分析")
+            yield from self._iter_analyze_sections(text_sections)
+            return
+        
+        # 进程间传回的函数名是新的字符串对象，重新驻留后再合并
+        for function_calls, call_targets in results:
+            for caller, calls in function_calls.items():
+                caller = sys.intern(caller)
+                for call in calls:
+                    call.from_function = caller
+                    call.to_function = sys.intern(call.to_function)
+                self.function_calls[caller].extend(calls)
+            for target_addr, callers in call_targets.items():
+                self.call_targets[target_addr].update(map(sys.intern, callers))
     
     def _analyze_function(self, function: Dict[str, Any], 
-                         section_data: bytes, 
+                         section_data: memoryview, 
                          section_base: int) -> None:
         """
         分析单个函数的调用关系
@@ -126,78 +413,214 @@ class CallAnalyzer:
             section_base: 代码段基地址
         """
         func_name = function['name']
-        func_addr = function['value']
         
         try:
-            # 使用反汇编器分析函数调用
-            calls = self.disassembler.analyze_function_calls(
-                function, section_data, section_base
-            )
-            
             # 处理每个调用
-            for call in calls:
-                if 'to_address' in call:
-                    target_addr = call['to_address']
-                    target_func = self.elf_parser.get_function_by_address(target_addr)
-                    
-                    if target_func:
-                        target_name = target_func['name']
-                        
-                        # 对于跳转指令，如果是函数内跳转（目标地址在同一函数内），跳过记录
-                        # 只有跨函数的跳转（真正的尾调用）才应该被记录
-                        if call['type'] == 'jump' and target_name == func_name:
-                            # 这是函数内跳转，不是调用关系
-                            continue
-                        
-                        # 记录调用关系
-                        call_info = {
-                            'from_function': func_name,
-                            'to_function': target_name,
-                            'from_address': call['from_address'],
-                            'to_address': target_addr,
-                            'instruction': call['instruction'],
-                            'type': call['type']
-                        }
-                        
-                        self.function_calls[func_name].append(call_info)
-                        self.call_targets[target_addr].add(func_name)
-                    else:
-                        # 可能是外部函数调用
-                        call_info = {
-                            'from_function': func_name,
-                            'to_function': f'external_{hex(target_addr)}',
-                            'from_address': call['from_address'],
-                            'to_address': target_addr,
-                            'instruction': call['instruction'],
-                            'type': call['type'],
-                            'external': True
-                        }
-                        
-                        self.function_calls[func_name].append(call_info)
+            for call_info in self._resolve_function_calls(function, section_data, section_base):
+                self.function_calls[func_name].append(call_info)
+                if not call_info.external:
+                    self.call_targets[call_info['to_address']].add(func_name)
                 
         except Exception as e:
             logging.warning(f"分析函数 {func_name} 时出错: {e}")
     
+    def _resolve_function_calls(self, function: Dict[str, Any], 
+                                section_data: memoryview, 
+                                section_base: int) -> List[CallRecord]:
+        """
+        反汇编单个函数并将调用目标解析为函数名
+        
+        Args:
+            function: 函数信息
+            section_data: 代码段数据
+            section_base: 代码段基地址
+            
+        Returns:
+            调用关系列表
+        """
+        func_name = function['name']
+        resolved = []
+        
+        # 使用反汇编器分析函数调用
+        calls = self.disassembler.analyze_function_calls(
+            function, section_data, section_base
+        )
+        
+        for call in calls:
+            if 'to_address' in call:
+                target_addr = call['to_address']
+                target_func = self.elf_parser.get_function_by_address(target_addr)
+                
+                if target_func:
+                    target_name = target_func['name']
+                    
+                    # 对于跳转指令，如果是函数内跳转（目标地址在同一函数内），跳过记录
+                    # 只有跨函数的跳转（真正的尾调用）才应该被记录
+                    if call['type'] == 'jump' and target_name == func_name:
+                        # 这是函数内跳转，不是调用关系
+                        continue
+                    
+                    # 记录调用关系
+                    resolved.append(CallRecord(func_name, target_name, call['from_address'],
+                                               target_addr, call['instruction'], call['type']))
+                else:
+                    # 可能是外部函数调用
+                    external_name = sys.intern(f'external_{hex(target_addr)}')
+                    resolved.append(CallRecord(func_name, external_name,
+                                               call['from_address'], target_addr,
+                                               call['instruction'], call['type'], external=True))
+        
+        return resolved
+    
+    def analyze_function(self, function_name: str) -> Optional[Dict[str, Any]]:
+        """
+        只分析单个函数的调用者和被调用函数，不构建完整调用图
+        
+        被调用函数只需反汇编目标函数本身；调用者需要扫描其他函数的调用指令，
+        但只解析落在目标函数地址范围内的调用，也不记录其他调用关系。
+        因此开销仍与全部代码的大小成正比，省去的只是调用图构建和其余调用的解析，
+        有缓存的完整分析结果时应优先使用缓存。已完成完整分析时直接使用调用图。
+        
+        Args:
+            function_name: 函数名
+            
+        Returns:
+            包含 callers、callees、is_recursive、call_details 的字典，函数不存在时返回 None
+        """
+        if self.analyzed:
+            if function_name not in self.call_graph:
+                return None
+            callees = self.get_callees(function_name)
+            details = self.get_call_details_by_callee(function_name)
+            return {
+                'name': function_name,
+                'callers': self.get_callers(function_name),
+                'callees': callees,
+                'is_recursive': self.is_recursive_function(function_name),
+                'call_details': {callee: details.get(callee, []) for callee in callees}
+            }
+        
+        target = self.name_to_function.get(function_name)
+        if target is None:
+            return None
+        
+        target_start = target['value']
+        target_end = target_start + target['size']
+        callers = []
+        call_details = {}
+        
+        for section in self.elf_parser.get_text_sections():
+            functions = self._section_functions(section)
+            if not functions:
+                continue
+            section_data = self.elf_parser.get_section_view(section['name'])
+            if not section_data:
+                continue
+            
+            for func in functions:
+                func_name = func['name']
+                try:
+                    if func_name == function_name:
+                        # 目标函数本身：记录全部被调用函数
+                        for call_info in self._resolve_function_calls(func, section_data,
+                                                                      section['addr']):
+                            call_details.setdefault(call_info.to_function, []).append(
+                                call_info.to_dict())
+                        continue
+                    
+                    calls = self.disassembler.analyze_function_calls(func, section_data,
+                                                                     section['addr'])
+                except Exception as e:
+                    logging.warning(f"分析函数 {func_name} 时出错: {e}")
+                    continue
+                
+                for call in calls:
+                    target_addr = call.get('to_address')
+                    if target_addr is None or not target_start <= target_addr < target_end:
+                        continue
+                    target_func = self.elf_parser.get_function_by_address(target_addr)
+                    if target_func and target_func['name'] == function_name:
+                        if func_name not in callers:
+                            callers.append(func_name)
+                        break
+        
+        if function_name in call_details and function_name not in callers:
+            callers.append(function_name)
+        
+        return {
+            'name': function_name,
+            'callers': callers,
+            'callees': list(call_details),
+            'is_recursive': function_name in call_details,
+            'call_details': call_details
+        }
+    
     def _build_call_graph(self) -> None:
         """构建调用关系图"""
-        # 添加调用边
+        graph = self.call_graph
+        # 图中尚不存在的被调用函数（可能是外部函数），属性取首次出现的调用
+        new_nodes = {}
+        edges = []
+        
         for caller, calls in self.function_calls.items():
             for call in calls:
                 callee = call['to_function']
+                if callee not in new_nodes and callee not in graph:
+                    new_nodes[callee] = {'external': call.get('external', False)}
                 
-                # 确保被调用函数也在图中（可能是外部函数）
-                if callee not in self.call_graph:
-                    self.call_graph.add_node(callee, external=call.get('external', False))
-                
-                # 添加调用边
-                edge_data = {
+                edges.append((caller, callee, {
                     'from_address': call['from_address'],
                     'to_address': call['to_address'],
                     'instruction': call['instruction'],
                     'type': call['type']
-                }
-                
-                self.call_graph.add_edge(caller, callee, **edge_data)
+                }))
+        
+        # 一次性批量添加节点和边，同一对函数间的多次调用以最后一次的属性为准
+        graph.add_nodes_from(new_nodes.items())
+        graph.add_edges_from(edges)
+    
+    def get_predecessor_map(self) -> Dict[str, List[str]]:
+        """
+        获取反向邻接表（被调用函数 -> 调用者列表）
+        
+        直接取自调用图维护的反向邻接（DiGraph.pred），不遍历调用边，也不另行缓存，
+        因此载入其他分析结果或直接修改调用图后结果仍是最新的。
+        
+        Returns:
+            函数名到调用者列表的字典，包含图中所有函数
+        """
+        return {node: list(callers) for node, callers in self.call_graph.pred.items()}
+    
+    def get_analysis_state(self) -> Dict[str, Any]:
+        """
+        获取可序列化的分析结果（用于磁盘缓存）
+        
+        Returns:
+            包含调用图和调用关系数据的字典
+        """
+        if not self.analyzed:
+            self.analyze()
+        
+        return {
+            'call_graph': self.call_graph,
+            'function_calls': dict(self.function_calls),
+            'call_targets': dict(self.call_targets)
+        }
+    
+    def load_analysis_state(self, state: Dict[str, Any]) -> None:
+        """
+        从缓存的分析结果恢复状态，跳过反汇编
+        
+        Args:
+            state: get_analysis_state() 返回的字典
+        """
+        self.call_graph = state['call_graph']
+        self.function_calls = defaultdict(list, state['function_calls'])
+        self.call_targets = defaultdict(set, state['call_targets'])
+        self.analyzed = True
+        self._cycles = None
+        self._depths = {}
+        self._names_indexed = False
     
     def get_call_relationships(self) -> Dict[str, Any]:
         """
@@ -227,12 +650,103 @@ class CallAnalyzer:
         # 调用关系
         for caller, calls in self.function_calls.items():
             for call in calls:
-                relationships['calls'].append(call)
+                relationships['calls'].append(
+                    call.to_dict() if isinstance(call, CallRecord) else call)
                 if call.get('external', False):
                     relationships['statistics']['external_calls'] += 1
         
         return relationships
     
+    def has_function(self, function_name: str) -> bool:
+        """
+        检查函数是否在调用图中
+        
+        Args:
+            function_name: 函数名
+            
+        Returns:
+            是否存在
+        """
+        if not self.analyzed:
+            self.analyze()
+        
+        return self.call_graph.has_node(function_name)
+    
+    def _build_name_index(self) -> None:
+        """建立相似函数名查找使用的名称索引"""
+        self._names = [str(name) for name in self.call_graph.nodes]
+        self._names_lower = [name.lower() for name in self._names]
+        self._names_by_lower = {}
+        for name, name_lower in zip(self._names, self._names_lower):
+            self._names_by_lower.setdefault(name_lower, name)
+        self._names_blob = '\n'.join(self._names_lower)
+        self._names_offsets = []
+        offset = 0
+        for name_lower in self._names_lower:
+            self._names_offsets.append(offset)
+            offset += len(name_lower) + 1
+        self._names_indexed = True
+    
+    def find_similar_functions(self, function_name: str, limit: int = 5) -> List[str]:
+        """
+        查找与给定名称相似的函数名
+        
+        先返回包含该名称的函数（不区分大小写）；不足 limit 个时再按模糊匹配补充，
+        以便找到拼写错误的名称（安装了 rapidfuzz 时使用它，否则使用标准库 difflib）。
+        尚未完成分析时只在符号表中的函数里查找。
+        
+        Args:
+            function_name: 要查找的函数名
+            limit: 返回的最大数量
+            
+        Returns:
+            相似函数名列表
+        """
+        query = function_name.lower()
+        
+        if not self._names_indexed:
+            # 名称索引未建立或已过期：先直接遍历节点视图，找够 limit 个即返回，不必建立索引
+            similar = list(itertools.islice(
+                (name for name in map(str, self.call_graph.nodes) if query in name.lower()), limit))
+            if len(similar) >= limit:
+                return similar
+            # 子串匹配已遍历全部名称，建立索引供模糊匹配和之后的查找使用
+            self._build_name_index()
+        else:
+            similar = []
+            if self._names and '\n' not in query:
+                # 在拼接串上用 str.find 跳跃查找，命中后定位所属名称并跳到下一个名称
+                pos = self._names_blob.find(query)
+                while pos >= 0:
+                    idx = bisect.bisect_right(self._names_offsets, pos) - 1
+                    similar.append(self._names[idx])
+                    if len(similar) >= limit:
+                        return similar
+                    if idx + 1 >= len(self._names_offsets):
+                        break
+                    pos = self._names_blob.find(query, self._names_offsets[idx + 1])
+        
+        if RAPIDFUZZ_AVAILABLE and query:
+            matches = fuzz_process.extract(query, self._names_lower, scorer=fuzz.WRatio,
+                                           limit=limit * 2, score_cutoff=60)
+            candidates = [self._names[idx] for _, _, idx in matches]
+        elif query:
+            close_matches = difflib.get_close_matches(query, self._names_lower,
+                                                      n=limit * 2, cutoff=0.6)
+            candidates = [self._names_by_lower[name_lower] for name_lower in close_matches]
+        else:
+            candidates = []
+        
+        seen = set(similar)
+        for name in candidates:
+            if name not in seen:
+                seen.add(name)
+                similar.append(name)
+                if len(similar) >= limit:
+                    break
+        
+        return similar
+    
     def get_callers(self, function_name: str) -> List[str]:
         """
         获取调用指定函数的所有函数
@@ -246,7 +760,8 @@ class CallAnalyzer:
         if not self.analyzed:
             self.analyze()
         
-        return list(self.call_graph.predecessors(function_name))
+        # 调用图本身维护反向邻接，按函数名查找即可，不必遍历调用边
+        return list(self.call_graph.pred.get(function_name, ()))
     
     def get_callees(self, function_name: str) -> List[str]:
         """
@@ -281,7 +796,30 @@ class CallAnalyzer:
         
         for call in self.function_calls.get(from_function, []):
             if call['to_function'] == to_function:
-                details.append(call)
+                details.append(call.to_dict() if isinstance(call, CallRecord) else call)
+        
+        return details
+    
+    def get_call_details_by_callee(self, from_function: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        获取函数对各被调用函数的详细调用信息
+        
+        只遍历一次调用方的调用列表，结果与对每个被调用函数调用 get_call_details 相同。
+        
+        Args:
+            from_function: 调用方函数名
+            
+        Returns:
+            被调用函数名 -> 调用详情列表
+        """
+        if not self.analyzed:
+            self.analyze()
+        
+        details = {}
+        
+        for call in self.function_calls.get(from_function, []):
+            details.setdefault(call['to_function'], []).append(
+                call.to_dict() if isinstance(call, CallRecord) else call)
         
         return details
     
@@ -304,6 +842,9 @@ class CallAnalyzer:
         """
         查找调用图中的环（相互递归调用）
         
+        结果会被缓存，直到重新分析或载入分析结果，get_statistics、摘要报告等多处调用
+        只查找一次。分析完成后不会修改调用图；直接修改 call_graph 后缓存不会自动失效。
+        
         Args:
             timeout: 超时时间（秒），默认10秒。对于大型图，如果超时将返回空列表
         
@@ -313,6 +854,12 @@ class CallAnalyzer:
         if not self.analyzed:
             self.analyze()
         
+        if self._cycles is None:
+            self._cycles = self._find_cycles_uncached(timeout)
+        return list(self._cycles)
+    
+    def _find_cycles_uncached(self, timeout: int) -> List[List[str]]:
+        """查找调用图中的环，不使用缓存"""
         # 对于非常大的图，直接跳过循环查找以避免阻塞
         num_nodes = len(self.call_graph.nodes)
         num_edges = len(self.call_graph.edges)
@@ -349,6 +896,8 @@ class CallAnalyzer:
         """
         计算函数的调用深度（最长调用链长度）
         
+        结果缓存到重新分析或载入分析结果为止；直接修改 call_graph 后缓存不会自动失效。
+        
         Args:
             function_name: 函数名
             
@@ -361,15 +910,42 @@ class CallAnalyzer:
         if function_name not in self.call_graph:
             return 0
         
+        depths = self._depths
+        if function_name in depths:
+            return depths[function_name]
+        
         try:
             # 计算从该函数出发的最长路径
             lengths = nx.single_source_shortest_path_length(
                 self.call_graph, function_name
             )
-            return max(lengths.values()) if lengths else 0
+            depth = max(lengths.values()) if lengths else 0
         except Exception as e:
             logging.warning(f"计算函数深度时出错: {e}")
             return 0
+        
+        depths[function_name] = depth
+        return depth
+    
+    def get_all_depths(self) -> Dict[str, int]:
+        """
+        计算所有函数的调用深度
+        
+        需要多数函数的深度时（如生成报告）一次性计算并缓存，
+        之后的 get_function_depth 直接读取缓存。
+        
+        Returns:
+            函数名 -> 调用深度
+        """
+        if not self.analyzed:
+            self.analyze()
+        
+        depths = self._depths
+        for source in self.call_graph:
+            if source not in depths:
+                lengths = nx.single_source_shortest_path_length(self.call_graph, source)
+                depths[source] = max(lengths.values()) if lengths else 0
+        return dict(depths)
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -403,19 +979,15 @@ class CallAnalyzer:
         if stats['total_functions'] > 0:
             stats['average_calls_per_function'] = stats['total_calls'] / stats['total_functions']
         
-        # 计算每个函数的调用统计
-        for node in self.call_graph.nodes:
-            out_degree = self.call_graph.out_degree(node)
-            in_degree = self.call_graph.in_degree(node)
-            
-            stats['max_calls_from_function'] = max(stats['max_calls_from_function'], out_degree)
-            stats['max_calls_to_function'] = max(stats['max_calls_to_function'], in_degree)
-            
-            if self.is_recursive_function(node):
-                stats['recursive_functions'] += 1
-            
-            node_data = self.call_graph.nodes[node]
-            if node_data.get('external', False):
-                stats['external_functions'] += 1
+        # 批量获取出入度和节点属性，不逐个节点查询
+        call_graph = self.call_graph
+        stats['max_calls_from_function'] = max((degree for _, degree in call_graph.out_degree()),
+                                               default=0)
+        stats['max_calls_to_function'] = max((degree for _, degree in call_graph.in_degree()),
+                                             default=0)
+        stats['recursive_functions'] = nx.number_of_selfloops(call_graph)
+        stats['external_functions'] = sum(
+            1 for _, external in call_graph.nodes(data='external', default=False) if external
+        )
         
         return stats
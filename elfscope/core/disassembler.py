@@ -9,10 +9,15 @@
 """
 
 from typing import Dict, List, Optional, Tuple, Generator, Any
+import re
 import capstone
 from elftools.elf.elffile import ELFFile
 
 
+# disassemble_lite_targets 产生的元组：(地址, 大小, 助记符, 操作数字符串, 分支目标或 None)
+LiteInstruction = Tuple[int, int, str, str, Optional[int]]
+
+
 class DisassemblerError(Exception):
     """反汇编相关异常"""
     pass
@@ -36,34 +41,47 @@ class Disassembler:
         'ppc64': (capstone.CS_ARCH_PPC, capstone.CS_MODE_64),
     }
     
-    # 调用指令助记符（按架构分类）
+    # 调用指令助记符（按架构分类），各实例直接共享这些不可变集合
     CALL_INSTRUCTIONS = {
-        'x86_64': {'call', 'callq'},
-        'x86': {'call'},
-        'arm': {'bl', 'blx'},
-        'aarch64': {'bl', 'blr'},
-        'mips': {'jal', 'jalr'},
-        'ppc': {'bl', 'bla'},
-        'ppc64': {'bl', 'bla'},
+        'x86_64': frozenset({'call', 'callq'}),
+        'x86': frozenset({'call'}),
+        'arm': frozenset({'bl', 'blx'}),
+        'aarch64': frozenset({'bl', 'blr'}),
+        'mips': frozenset({'jal', 'jalr'}),
+        'ppc': frozenset({'bl', 'bla'}),
+        'ppc64': frozenset({'bl', 'bla'}),
     }
     
     # 跳转指令助记符（可能是尾调用）
     JUMP_INSTRUCTIONS = {
-        'x86_64': {'jmp', 'jmpq'},
-        'x86': {'jmp'},
-        'arm': {'b', 'bx'},
-        'aarch64': {'b', 'br'},
-        'mips': {'j', 'jr'},
-        'ppc': {'b', 'ba'},
-        'ppc64': {'b', 'ba'},
+        'x86_64': frozenset({'jmp', 'jmpq'}),
+        'x86': frozenset({'jmp'}),
+        'arm': frozenset({'b', 'bx'}),
+        'aarch64': frozenset({'b', 'br'}),
+        'mips': frozenset({'j', 'jr'}),
+        'ppc': frozenset({'b', 'ba'}),
+        'ppc64': frozenset({'b', 'ba'}),
     }
     
-    def __init__(self, architecture: str):
+    _HEX_PATTERN = re.compile(r'0x([0-9a-fA-F]+)')
+    _DEC_PATTERN = re.compile(r'\b(\d{4,})\b')
+    _HEX_PREFIXES = ('0x', '#0x')
+    
+    # 轻量反汇编每次最多解码的指令数。Capstone 会一次性为整段代码分配所有指令，
+    # 分块解码使超大函数的内存占用有上限
+    LITE_CHUNK_INSNS = 8192
+    
+    # 各支持架构的单条指令最长字节数上限（x86 为 15）
+    MAX_INSN_BYTES = 16
+    
+    def __init__(self, architecture: str, skipdata: bool = False):
         """
         初始化反汇编器
         
         Args:
             architecture: 目标架构
+            skipdata: 遇到无法解码的字节时输出 .byte 并继续，而不是停止解码。
+                调用分析保持关闭，避免把数据当作指令解码出虚假的调用关系
             
         Raises:
             DisassemblerError: 不支持的架构
@@ -77,19 +95,25 @@ class Disassembler:
         
         try:
             self.cs = capstone.Cs(arch, mode)
-            self.cs.detail = True  # 开启详细信息
+            # 调用目标从操作数字符串解析，不需要详细信息
+            self.cs.detail = False
+            self.cs.skipdata = skipdata
         except capstone.CsError as e:
             raise DisassemblerError(f"初始化反汇编引擎失败: {e}")
         
-        self.call_instructions = self.CALL_INSTRUCTIONS.get(architecture, set())
-        self.jump_instructions = self.JUMP_INSTRUCTIONS.get(architecture, set())
+        self.call_instructions = self.CALL_INSTRUCTIONS.get(architecture, frozenset())
+        self.jump_instructions = self.JUMP_INSTRUCTIONS.get(architecture, frozenset())
+        
+        # 助记符 -> 'call'/'jump'，一次字典查找完成分类（调用指令优先）
+        self.branch_types = {mnemonic: 'jump' for mnemonic in self.jump_instructions}
+        self.branch_types.update((mnemonic, 'call') for mnemonic in self.call_instructions)
     
     def disassemble(self, data: bytes, base_address: int = 0) -> Generator[Any, None, None]:
         """
         反汇编字节码
         
         Args:
-            data: 要反汇编的字节码
+            data: 要反汇编的字节码（bytes 或 memoryview）
             base_address: 基地址
             
         Yields:
@@ -98,12 +122,78 @@ class Disassembler:
         Raises:
             DisassemblerError: 反汇编失败
         """
+        # Capstone 的 Python 绑定只接受 bytes，视图在这里才复制（仅函数大小的数据）
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        
         try:
             for instruction in self.cs.disasm(data, base_address):
                 yield instruction
         except capstone.CsError as e:
             raise DisassemblerError(f"反汇编失败: {e}")
     
+    def disassemble_lite(self, data: bytes, base_address: int = 0
+                         ) -> Generator[Tuple[int, int, str, str], None, None]:
+        """
+        轻量反汇编字节码，不创建指令对象
+        
+        每次最多解码 LITE_CHUNK_INSNS 条指令，从上一块结束处继续，结果与一次解码相同。
+        每块只切出足够容纳这些指令的字节，不再每块复制剩余的全部数据；
+        传入 memoryview 时也只复制每块的窗口，不复制整段数据。
+        
+        Args:
+            data: 要反汇编的字节码（bytes 或 memoryview）
+            base_address: 基地址
+            
+        Yields:
+            (地址, 大小, 助记符, 操作数字符串) 元组
+            
+        Raises:
+            DisassemblerError: 反汇编失败
+        """
+        chunk = self.LITE_CHUNK_INSNS
+        window = chunk * self.MAX_INSN_BYTES
+        offset = 0
+        
+        try:
+            while True:
+                count = 0
+                # 窗口足够解码满一块；未满一块说明遇到无法解码的字节或数据结束，与一次解码的结果相同
+                window_data = data[offset:offset + window]
+                for insn in self.cs.disasm_lite(window_data, base_address + offset, chunk):
+                    count += 1
+                    yield insn
+                if count < chunk:
+                    break
+                # 本块解码满额，从最后一条指令之后继续
+                offset = insn[0] + insn[1] - base_address
+                if offset >= len(data):
+                    break
+        except capstone.CsError as e:
+            raise DisassemblerError(f"反汇编失败: {e}")
+    
+    def disassemble_lite_targets(self, data: bytes, base_address: int = 0
+                                 ) -> Generator[LiteInstruction, None, None]:
+        """
+        轻量反汇编字节码，并给出调用/跳转指令的目标地址
+        
+        Capstone 轻量模式没有操作数信息，目标地址从操作数字符串解析；
+        能直接给出解码目标的反汇编器（如 IcedDisassembler）重写此方法。
+        
+        Args:
+            data: 要反汇编的字节码（bytes 或 memoryview）
+            base_address: 基地址
+            
+        Yields:
+            (地址, 大小, 助记符, 操作数字符串, 分支目标) 元组，非分支或无法确定时目标为 None
+        """
+        branch_types = self.branch_types
+        parse_target = self._parse_target_address
+        
+        for address, size, mnemonic, op_str in self.disassemble_lite(data, base_address):
+            target = parse_target(op_str) if mnemonic in branch_types else None
+            yield address, size, mnemonic, op_str, target
+    
     def disassemble_function(self, data: bytes, base_address: int, size: int) -> List[Dict[str, Any]]:
         """
         反汇编单个函数
@@ -117,26 +207,26 @@ class Disassembler:
             指令信息列表
         """
         instructions = []
-        function_data = data[:size]
+        function_data = bytes(data[:size])
+        branch_types = self.branch_types
         
-        for insn in self.disassemble(function_data, base_address):
+        # 轻量反汇编不创建指令对象，指令字节直接从函数数据中切出
+        for address, insn_size, mnemonic, op_str in self.disassemble_lite(function_data,
+                                                                         base_address):
+            offset = address - base_address
             instruction_info = {
-                'address': insn.address,
-                'mnemonic': insn.mnemonic,
-                'op_str': insn.op_str,
-                'bytes': insn.bytes,
-                'size': insn.size
+                'address': address,
+                'mnemonic': mnemonic,
+                'op_str': op_str,
+                'bytes': function_data[offset:offset + insn_size],
+                'size': insn_size
             }
             
             # 检查是否是调用或跳转指令
-            if self.is_call_instruction(insn):
-                instruction_info['type'] = 'call'
-                target = self.extract_call_target(insn)
-                if target:
-                    instruction_info['target'] = target
-            elif self.is_jump_instruction(insn):
-                instruction_info['type'] = 'jump'
-                target = self.extract_jump_target(insn)
+            branch_type = branch_types.get(mnemonic)
+            if branch_type is not None:
+                instruction_info['type'] = branch_type
+                target = self._parse_target_address(op_str)
                 if target:
                     instruction_info['target'] = target
             else:
@@ -194,6 +284,18 @@ class Disassembler:
         """
         return self._extract_target_address(instruction)
     
+    def extract_target_from_op_str(self, op_str: str) -> Optional[int]:
+        """
+        从操作数字符串中提取目标地址（用于轻量反汇编得到的元组）
+        
+        Args:
+            op_str: 操作数字符串
+            
+        Returns:
+            目标地址，如果无法确定则返回 None
+        """
+        return self._parse_target_address(op_str)
+    
     def _extract_target_address(self, instruction) -> Optional[int]:
         """
         从指令中提取目标地址
@@ -204,38 +306,53 @@ class Disassembler:
         Returns:
             目标地址，如果无法确定则返回 None
         """
-        # 检查操作数
-        if hasattr(instruction, 'operands') and instruction.operands:
-            for operand in instruction.operands:
-                # 直接地址
-                if hasattr(operand, 'type'):
-                    if operand.type == capstone.CS_OP_IMM:
-                        return operand.imm
-                    elif operand.type == capstone.CS_OP_MEM:
-                        if hasattr(operand, 'mem') and hasattr(operand.mem, 'disp'):
-                            return operand.mem.disp
-        
-        # 尝试从操作数字符串中解析地址
-        if instruction.op_str:
-            # 查找十六进制地址
-            import re
-            hex_match = re.search(r'0x([0-9a-fA-F]+)', instruction.op_str)
-            if hex_match:
-                try:
-                    return int(hex_match.group(1), 16)
-                except ValueError:
-                    pass
+        return self._parse_target_address(instruction.op_str)
+    
+    def _parse_target_address(self, op_str: str) -> Optional[int]:
+        """
+        从操作数字符串中解析目标地址
+        
+        立即数返回其值。内存操作数（如 [rip + 0x2fe2]）是间接调用，
+        位移不是目标地址，返回 None；其余情况在字符串中查找十六进制或较长的十进制地址。
+        
+        Args:
+            op_str: 操作数字符串
             
-            # 查找十进制地址（某些情况下）
-            dec_match = re.search(r'\b(\d{4,})\b', instruction.op_str)
-            if dec_match:
-                try:
-                    addr = int(dec_match.group(1))
-                    # 合理的地址范围检查
-                    if 0x400000 <= addr <= 0x7fffffffffff:
-                        return addr
-                except ValueError:
-                    pass
+        Returns:
+            目标地址，如果无法确定则返回 None
+        """
+        if not op_str:
+            return None
+        
+        # 直接调用/跳转最常见，操作数就是十六进制地址（ARM 等带 # 前缀），直接转换
+        if op_str.startswith(self._HEX_PREFIXES):
+            try:
+                return int(op_str.lstrip('#'), 16)
+            except ValueError:
+                pass
+        
+        # 内存操作数：间接调用/跳转，目标在运行时从内存读取
+        if '[' in op_str:
+            return None
+        
+        # 立即数（ARM 等架构带 # 前缀）
+        try:
+            return int(op_str.strip().lstrip('#'), 0)
+        except ValueError:
+            pass
+        
+        # 查找十六进制地址
+        hex_match = self._HEX_PATTERN.search(op_str)
+        if hex_match:
+            return int(hex_match.group(1), 16)
+        
+        # 查找十进制地址（某些情况下）
+        dec_match = self._DEC_PATTERN.search(op_str)
+        if dec_match:
+            addr = int(dec_match.group(1))
+            # 合理的地址范围检查
+            if 0x400000 <= addr <= 0x7fffffffffff:
+                return addr
         
         return None
     
@@ -252,20 +369,25 @@ class Disassembler:
             调用信息列表
         """
         calls = []
-        instructions = self.disassemble_function(data, base_address, size)
-        
-        for insn in instructions:
-            if insn['type'] in ['call', 'jump']:
-                call_info = {
-                    'from_address': insn['address'],
-                    'instruction': f"{insn['mnemonic']} {insn['op_str']}",
-                    'type': insn['type']
-                }
-                
-                if 'target' in insn:
-                    call_info['to_address'] = insn['target']
-                
-                calls.append(call_info)
+        branch_types = self.branch_types
+        
+        # 只需要地址、助记符和操作数，用轻量反汇编避免为每条指令创建对象
+        for address, _, mnemonic, op_str in self.disassemble_lite(data[:size], base_address):
+            call_type = branch_types.get(mnemonic)
+            if call_type is None:
+                continue
+            
+            call_info = {
+                'from_address': address,
+                'instruction': f"{mnemonic} {op_str}",
+                'type': call_type
+            }
+            
+            target = self._parse_target_address(op_str)
+            if target:
+                call_info['to_address'] = target
+            
+            calls.append(call_info)
         
         return calls
     
@@ -302,8 +424,12 @@ class Disassembler:
         
         return calls
     
-    def __del__(self):
-        """清理资源"""
-        if hasattr(self, 'cs'):
-            # Capstone 对象不需要显式关闭
-            pass
+    def close(self) -> None:
+        """释放反汇编引擎（Capstone 句柄在引用释放时自动关闭）"""
+        self.cs = None
+    
+    def __enter__(self) -> 'Disassembler':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
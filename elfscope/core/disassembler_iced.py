@@ -0,0 +1,276 @@
+"""
+基于 iced-x86 的 x86/x86_64 反汇编模块
+
+iced-x86 的解码速度明显快于 Capstone，objdump 反汇编 x86/x86_64 代码时可以选用（默认仍是
+Capstone）。未安装时 ICED_AVAILABLE 为 False，调用方继续使用 Capstone 的 Disassembler。
+格式化选项尽量与 Capstone 的 Intel 语法输出保持一致；常见写法（nop、段前缀、movabs、
+三操作数 imul、符号扩展的立即数）已对齐，x87 浮点指令和串操作指令的操作数写法仍与 Capstone 不同。
+"""
+
+import functools
+from typing import FrozenSet, Generator, Optional, Tuple
+
+from .disassembler import Disassembler, DisassemblerError, LiteInstruction
+
+try:
+    from iced_x86 import (Code, Decoder, FlowControl, Formatter, FormatterSyntax, Instruction,
+                          MemorySizeOptions, Mnemonic, OpCodeInfo, OpCodeOperandKind, OpKind)
+    ICED_AVAILABLE = True
+except ImportError:
+    ICED_AVAILABLE = False
+
+
+@functools.lru_cache(maxsize=1)
+def _signed_immediate_codes() -> FrozenSet[int]:
+    """
+    Capstone 以有符号数显示立即数的指令编码
+    
+    Capstone 把符号扩展的立即数（8 位扩展到 16/32/64 位、32 位扩展到 64 位）显示为有符号数，
+    如 cmp eax, -1；and/or/xor/mov 除外。其余立即数都按无符号数显示。
+    
+    Returns:
+        指令编码集合
+    """
+    sign_extended = (OpCodeOperandKind.IMM8SEX16, OpCodeOperandKind.IMM8SEX32,
+                     OpCodeOperandKind.IMM8SEX64, OpCodeOperandKind.IMM32SEX64)
+    unsigned_mnemonics = (Mnemonic.AND, Mnemonic.OR, Mnemonic.XOR, Mnemonic.MOV)
+    codes = set()
+    for name, code in vars(Code).items():
+        if name.startswith('_') or not isinstance(code, int):
+            continue
+        info = OpCodeInfo(code)
+        if info.mnemonic in unsigned_mnemonics:
+            continue
+        if any(info.op_kind(i) in sign_extended for i in range(info.op_count)):
+            codes.add(code)
+    return frozenset(codes)
+
+
+def _create_formatter(signed_immediates: bool) -> 'Formatter':
+    """
+    创建与 Capstone Intel 语法输出一致的格式化器
+    
+    0x 前缀的小写十六进制、操作数和内存地址运算符两侧带空格、总是显示内存大小和段前缀、
+    RIP 相对寻址显示为 [rip + 位移]。
+    
+    Args:
+        signed_immediates: 是否以有符号数显示立即数
+    
+    Returns:
+        格式化器
+    """
+    formatter = Formatter(FormatterSyntax.INTEL)
+    formatter.hex_prefix = '0x'
+    formatter.hex_suffix = ''
+    formatter.uppercase_hex = False
+    formatter.branch_leading_zeros = False
+    formatter.show_branch_size = False
+    formatter.space_after_operand_separator = True
+    formatter.space_between_memory_add_operators = True
+    formatter.memory_size_options = MemorySizeOptions.ALWAYS
+    formatter.rip_relative_addresses = True
+    formatter.show_useless_prefixes = True
+    formatter.signed_immediate_operands = signed_immediates
+    return formatter
+
+
+class IcedInstruction:
+    """
+    iced-x86 解码出的指令
+    
+    提供与 Capstone 指令对象相同的 address、size、mnemonic、op_str、bytes 属性，
+    另外记录直接调用/跳转的目标地址（非直接分支时为 None）。
+    """
+    
+    __slots__ = ('address', 'size', 'mnemonic', 'op_str', 'bytes', 'branch_target')
+    
+    def __init__(self, address: int, size: int, mnemonic: str, op_str: str,
+                 raw: bytes, branch_target: Optional[int]):
+        self.address = address
+        self.size = size
+        self.mnemonic = mnemonic
+        self.op_str = op_str
+        self.bytes = raw
+        self.branch_target = branch_target
+
+
+class IcedDisassembler(Disassembler):
+    """
+    使用 iced-x86 解码的 x86/x86_64 反汇编器
+    
+    接口与 Disassembler 相同，可以直接替换；调用指令识别沿用助记符集合，
+    直接调用的目标地址取自解码结果，不再解析操作数字符串。
+    
+    不创建 Capstone 句柄（cs 为 None）。基类中直接使用 cs 的只有 disassemble 和
+    disassemble_lite，两者都已重写；其余继承的方法都通过这两个方法解码。
+    """
+    
+    # 架构 -> 解码位数
+    BITNESS = {
+        'x86_64': 64,
+        'x86': 32,
+    }
+    
+    # 格式化结果中可能出现在助记符之前的前缀，与 Capstone 一样归入助记符
+    _PREFIX_MNEMONICS = frozenset(('lock', 'rep', 'repe', 'repne', 'xacquire', 'xrelease',
+                                   'bnd', 'notrack'))
+    
+    def __init__(self, architecture: str):
+        """
+        初始化反汇编器
+        
+        Args:
+            architecture: 目标架构（x86 或 x86_64）
+        
+        Raises:
+            DisassemblerError: 未安装 iced-x86 或不支持的架构
+        """
+        if not ICED_AVAILABLE:
+            raise DisassemblerError("未安装 iced-x86")
+        if architecture not in self.BITNESS:
+            raise DisassemblerError(f"iced-x86 不支持的架构: {architecture}")
+        
+        self.architecture = architecture
+        self.bitness = self.BITNESS[architecture]
+        self.cs = None
+        
+        self.call_instructions = self.CALL_INSTRUCTIONS[architecture]
+        self.jump_instructions = self.JUMP_INSTRUCTIONS[architecture]
+        self.branch_types = {mnemonic: 'jump' for mnemonic in self.jump_instructions}
+        self.branch_types.update((mnemonic, 'call') for mnemonic in self.call_instructions)
+        
+        self.formatter = _create_formatter(signed_immediates=False)
+        self._signed_formatter = _create_formatter(signed_immediates=True)
+        self._signed_codes = _signed_immediate_codes()
+        
+        self._direct_branches = frozenset((FlowControl.CALL, FlowControl.UNCONDITIONAL_BRANCH,
+                                           FlowControl.CONDITIONAL_BRANCH))
+        
+        # Capstone 写作 movabs 的 64 位立即数和绝对地址 mov（仅 64 位模式下存在）
+        self._movabs_codes = frozenset((
+            Code.MOV_R64_IMM64, Code.MOV_AL_MOFFS8, Code.MOV_AX_MOFFS16, Code.MOV_EAX_MOFFS32,
+            Code.MOV_RAX_MOFFS64, Code.MOV_MOFFS8_AL, Code.MOV_MOFFS16_AX,
+            Code.MOV_MOFFS32_EAX, Code.MOV_MOFFS64_RAX
+        )) if self.bitness == 64 else frozenset()
+        # 目的和源寄存器相同时 iced-x86 省略源操作数，Capstone 总是显示三个操作数
+        self._imul_imm_codes = frozenset((
+            Code.IMUL_R16_RM16_IMM16, Code.IMUL_R16_RM16_IMM8, Code.IMUL_R32_RM32_IMM32,
+            Code.IMUL_R32_RM32_IMM8, Code.IMUL_R64_RM64_IMM32, Code.IMUL_R64_RM64_IMM8
+        ))
+        # 66 90、48 90 在 iced-x86 中格式化为 xchg ax, ax 等，Capstone 显示为 nop
+        self._nop_codes = frozenset((Code.NOPW, Code.NOPQ))
+    
+    def disassemble(self, data: bytes, base_address: int = 0
+                    ) -> Generator[IcedInstruction, None, None]:
+        """
+        反汇编字节码
+        
+        无法解码的字节与 Capstone 的 skipdata 模式一样输出为 .byte。
+        
+        Args:
+            data: 要反汇编的字节码（bytes 或 memoryview）
+            base_address: 基地址
+        
+        Yields:
+            指令对象
+        """
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        
+        for address, size, mnemonic, op_str, target in self.disassemble_lite_targets(
+                data, base_address):
+            offset = address - base_address
+            yield IcedInstruction(address, size, mnemonic, op_str,
+                                  data[offset:offset + size], target)
+    
+    def disassemble_lite(self, data: bytes, base_address: int = 0
+                         ) -> Generator[Tuple[int, int, str, str], None, None]:
+        """
+        轻量反汇编字节码
+        
+        Args:
+            data: 要反汇编的字节码（bytes 或 memoryview）
+            base_address: 基地址
+        
+        Yields:
+            (地址, 大小, 助记符, 操作数字符串) 元组
+        """
+        for address, size, mnemonic, op_str, _ in self.disassemble_lite_targets(data, base_address):
+            yield address, size, mnemonic, op_str
+    
+    def disassemble_lite_targets(self, data: bytes, base_address: int = 0
+                                 ) -> Generator[LiteInstruction, None, None]:
+        """
+        轻量反汇编字节码，分支目标直接取自解码结果
+        
+        复用同一个 Instruction 接收解码结果，不为每条指令创建对象；每条指令只格式化一次，
+        再按第一个空格拆分助记符和操作数（仅带 rep 等前缀时单独格式化助记符）。
+        与 Capstone 写法不同的几种指令按指令编码查表后修正。
+        
+        Args:
+            data: 要反汇编的字节码（bytes 或 memoryview）
+            base_address: 基地址
+        
+        Yields:
+            (地址, 大小, 助记符, 操作数字符串, 直接分支目标或 None) 元组
+        """
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        
+        format_instr = self.formatter.format
+        format_signed = self._signed_formatter.format
+        format_mnemonic = self.formatter.format_mnemonic
+        prefixes = self._PREFIX_MNEMONICS
+        direct_branches = self._direct_branches
+        signed_codes = self._signed_codes
+        movabs_codes = self._movabs_codes
+        imul_imm_codes = self._imul_imm_codes
+        nop_codes = self._nop_codes
+        invalid = Code.INVALID
+        register = OpKind.REGISTER
+        
+        decoder = Decoder(self.bitness, data, ip=base_address)
+        instr = Instruction()
+        while decoder.can_decode:
+            decoder.decode_out(instr)
+            address = instr.ip
+            size = instr.len
+            
+            if instr.code == invalid:
+                # 与 Capstone 的 skipdata 一样每次只跳过一个字节，之后的前缀等字节重新解码
+                offset = address - base_address
+                decoder.position = offset + 1
+                decoder.ip = address + 1
+                yield address, 1, '.byte', f'0x{data[offset]:02x}', None
+                continue
+            
+            code = instr.code
+            text = format_signed(instr) if code in signed_codes else format_instr(instr)
+            mnemonic, _, op_str = text.partition(' ')
+            if mnemonic in prefixes:
+                mnemonic = format_mnemonic(instr)
+                op_str = text[len(mnemonic) + 1:]
+            elif code in movabs_codes:
+                mnemonic = 'movabs'
+            elif code in imul_imm_codes:
+                if instr.op1_kind == register and instr.op1_register == instr.op0_register:
+                    op_str = f"{op_str.partition(',')[0]}, {op_str}"
+            elif code in nop_codes:
+                mnemonic, op_str = 'nop', ''
+            target = instr.near_branch_target if instr.flow_control in direct_branches else None
+            yield address, size, mnemonic, op_str, target or None
+    
+    def _extract_target_address(self, instruction) -> Optional[int]:
+        """
+        从指令中提取目标地址，直接分支使用解码出的目标地址
+        
+        Args:
+            instruction: 指令对象
+        
+        Returns:
+            目标地址，如果无法确定则返回 None
+        """
+        target = getattr(instruction, 'branch_target', None)
+        if target is not None:
+            return target
+        return self._parse_target_address(instruction.op_str)
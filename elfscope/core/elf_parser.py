@@ -9,7 +9,12 @@ ELF 文件解析器模块
 """
 
 import os
-from typing import Dict, List, Optional, Tuple, Any
+import sys
+import mmap
+import heapq
+import bisect
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from elftools.elf.elffile import ELFFile
 from elftools.elf.sections import SymbolTableSection
 from elftools.elf.constants import SH_FLAGS
@@ -35,12 +40,14 @@ class ElfParser:
         'EM_RISCV': 'riscv'
     }
     
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, lazy: bool = True):
         """
         初始化 ELF 解析器
         
         Args:
             filepath: ELF 文件路径
+            lazy: 为 True（默认）时只解析 ELF 头和节区头，符号表在首次用到时才解析；
+                为 False 时在初始化时立即解析符号表
             
         Raises:
             FileNotFoundError: 文件不存在
@@ -49,10 +56,39 @@ class ElfParser:
         self.filepath = filepath
         self._validate_file()
         
-        # 保持文件句柄打开
+        # 保持文件句柄打开，并尽量通过内存映射读取（只有实际访问的页才会被读入）
         self._file_handle = open(filepath, 'rb')
-        self.elffile = ELFFile(self._file_handle)
+        self._mmap = self._map_file(self._file_handle)
+        self.elffile = ELFFile(self._mmap if self._mmap is not None else self._file_handle)
+        self._symbols = None
+        self._function_symbols = None
+        self._num_symbols = None
+        # 函数地址区间的分界点及每个区间对应的函数、函数名索引，由 _parse_symbols 构建
+        self._function_bounds = array('Q')
+        self._function_by_segment = []
+        self._function_by_name = {}
+        # 节区名 -> pyelftools 读出（必要时解压）的节区数据，由 release_section_cache 释放
+        self._section_data_cache = {}
         self._parse_basic_info()
+        
+        if not lazy:
+            self._parse_symbols()
+    
+    @staticmethod
+    def _map_file(file_handle) -> Optional[mmap.mmap]:
+        """
+        只读映射整个文件
+        
+        Args:
+            file_handle: 已打开的文件对象
+            
+        Returns:
+            内存映射对象，无法映射（如空文件、非真实文件）时返回 None
+        """
+        try:
+            return mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, TypeError, AttributeError):
+            return None
     
     def _validate_file(self) -> None:
         """验证文件是否存在且可读"""
@@ -85,9 +121,6 @@ class ElfParser:
         
         # 解析节区信息
         self._parse_sections()
-        
-        # 解析符号表
-        self._parse_symbols()
     
     def _parse_sections(self) -> None:
         """解析所有节区信息"""
@@ -112,31 +145,135 @@ class ElfParser:
             if (section['sh_flags'] & SH_FLAGS.SHF_EXECINSTR and 
                 section['sh_size'] > 0):
                 self.text_sections.append(section_info)
+        
+        # 按起始地址排序的代码段，地址范围互不重叠时按地址二分查找所在代码段
+        self._text_by_addr = sorted(self.text_sections, key=lambda s: s['addr'])
+        self._text_starts = [s['addr'] for s in self._text_by_addr]
+        self._text_overlap = any(
+            cur['addr'] < prev['addr'] + prev['size']
+            for prev, cur in zip(self._text_by_addr, self._text_by_addr[1:])
+        )
+    
+    @property
+    def symbols(self) -> List[Dict[str, Any]]:
+        """所有符号信息（首次访问时才遍历全部符号表）"""
+        if self._symbols is None:
+            self._symbols = list(self.iter_all_symbols())
+        return self._symbols
+    
+    @property
+    def num_symbols(self) -> int:
+        """所有符号表中的符号总数（解析函数符号时顺带统计，不构建完整符号列表）"""
+        if self._num_symbols is None:
+            self._parse_symbols()
+        return self._num_symbols
+    
+    def iter_all_symbols(self) -> Iterator[Dict[str, Any]]:
+        """
+        逐个生成所有符号表中的符号信息，不保留列表
+        
+        Yields:
+            符号信息字典
+        """
+        for section in self.elffile.iter_sections():
+            if isinstance(section, SymbolTableSection):
+                for symbol in section.iter_symbols():
+                    yield self._symbol_info(symbol)
+    
+    @property
+    def function_symbols(self) -> List[Dict[str, Any]]:
+        """函数符号信息（延迟解析时首次访问才解析符号表）"""
+        if self._function_symbols is None:
+            self._parse_symbols()
+        return self._function_symbols
+    
+    @staticmethod
+    def _symbol_info(symbol) -> Dict[str, Any]:
+        """
+        将 pyelftools 符号转换为符号信息字典
+        
+        Args:
+            symbol: pyelftools 符号对象
+            
+        Returns:
+            符号信息字典
+        """
+        st_info = symbol['st_info']
+        return {
+            # 驻留符号名，调用图、调用关系等各处共享同一字符串对象
+            'name': sys.intern(symbol.name),
+            'value': symbol['st_value'],
+            'size': symbol['st_size'],
+            'type': st_info['type'],
+            'bind': st_info['bind'],
+            'visibility': symbol['st_other']['visibility'],
+            'shndx': symbol['st_shndx']
+        }
     
     def _parse_symbols(self) -> None:
-        """解析符号表"""
-        self.symbols = []
-        self.function_symbols = []
+        """
+        解析符号表中的函数符号
+        
+        只为大小有效的函数符号构建信息字典，其余符号直接跳过。
+        同一函数同时出现在 .dynsym 和 .symtab 中时（名称和地址相同）只保留先出现的一个。
+        """
+        function_symbols = []
+        seen = set()
+        num_symbols = 0
         
         for section in self.elffile.iter_sections():
             if isinstance(section, SymbolTableSection):
                 for symbol in section.iter_symbols():
-                    symbol_info = {
-                        'name': symbol.name,
-                        'value': symbol['st_value'],
-                        'size': symbol['st_size'],
-                        'type': symbol['st_info']['type'],
-                        'bind': symbol['st_info']['bind'],
-                        'visibility': symbol['st_other']['visibility'],
-                        'shndx': symbol['st_shndx']
-                    }
+                    num_symbols += 1
+                    if symbol['st_info']['type'] != 'STT_FUNC' or symbol['st_size'] <= 0:
+                        continue
                     
-                    self.symbols.append(symbol_info)
+                    key = (symbol.name, symbol['st_value'])
+                    if key in seen:
+                        continue
+                    seen.add(key)
                     
-                    # 收集函数符号
-                    if (symbol_info['type'] == 'STT_FUNC' and 
-                        symbol_info['size'] > 0):
-                        self.function_symbols.append(symbol_info)
+                    function_symbols.append(self._symbol_info(symbol))
+        
+        self._function_symbols = function_symbols
+        self._num_symbols = num_symbols
+        self._build_function_index(function_symbols)
+    
+    def _build_function_index(self, function_symbols: List[Dict[str, Any]]) -> None:
+        """
+        构建按地址和名称查找函数的索引
+        
+        把所有函数的起止地址作为分界点，将地址空间切成若干区间，每个区间记录
+        覆盖它的函数中在符号表里最靠前的一个（重叠或别名函数时与顺序查找结果一致），
+        查找时二分定位区间即可。同名函数保留第一个。
+        
+        Args:
+            function_symbols: 函数符号信息列表（大小均大于 0）
+        """
+        bounds = sorted({func['value'] for func in function_symbols} |
+                        {func['value'] + func['size'] for func in function_symbols})
+        order = sorted(range(len(function_symbols)), key=lambda i: function_symbols[i]['value'])
+        
+        segments = []
+        active = []  # (符号表中的序号, 结束地址)，已结束的项在到达堆顶时才移除
+        next_func = 0
+        for bound in bounds:
+            while next_func < len(order) and function_symbols[order[next_func]]['value'] <= bound:
+                index = order[next_func]
+                func = function_symbols[index]
+                heapq.heappush(active, (index, func['value'] + func['size']))
+                next_func += 1
+            while active and active[0][1] <= bound:
+                heapq.heappop(active)
+            segments.append(function_symbols[active[0][0]] if active else None)
+        
+        by_name = {}
+        for func in function_symbols:
+            by_name.setdefault(func['name'], func)
+        
+        self._function_bounds = array('Q', bounds)
+        self._function_by_segment = segments
+        self._function_by_name = by_name
     
     def get_architecture(self) -> str:
         """
@@ -165,6 +302,29 @@ class ElfParser:
         """
         return self.text_sections.copy()
     
+    def get_text_section_by_address(self, address: int) -> Optional[Dict[str, Any]]:
+        """
+        查找包含指定地址的代码段
+        
+        代码段地址范围重叠时（如可重定位文件中各段地址均为 0）按节区头顺序返回第一个。
+        
+        Args:
+            address: 目标地址
+            
+        Returns:
+            代码段信息，如果没找到则返回 None
+        """
+        if self._text_overlap:
+            return next((s for s in self.text_sections
+                         if s['addr'] <= address < s['addr'] + s['size']), None)
+        
+        index = bisect.bisect_right(self._text_starts, address) - 1
+        if index >= 0:
+            section = self._text_by_addr[index]
+            if address < section['addr'] + section['size']:
+                return section
+        return None
+    
     def get_functions(self) -> List[Dict[str, Any]]:
         """
         获取所有函数符号
@@ -184,14 +344,11 @@ class ElfParser:
         Returns:
             函数信息字典，如果没找到则返回 None
         """
-        for func in self.function_symbols:
-            start_addr = func['value']
-            end_addr = start_addr + func['size']
-            
-            if start_addr <= address < end_addr:
-                return func
+        if self._function_symbols is None:
+            self._parse_symbols()
         
-        return None
+        index = bisect.bisect_right(self._function_bounds, address) - 1
+        return self._function_by_segment[index] if index >= 0 else None
     
     def get_function_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """
@@ -203,27 +360,115 @@ class ElfParser:
         Returns:
             函数信息字典，如果没找到则返回 None
         """
-        for func in self.function_symbols:
-            if func['name'] == name:
-                return func
+        if self._function_symbols is None:
+            self._parse_symbols()
         
-        return None
+        return self._function_by_name.get(name)
     
     def get_section_data(self, section_name: str) -> Optional[bytes]:
         """
         获取指定节区的数据
         
+        pyelftools 每次读取都会重新读文件（压缩节区还要重新解压），结果按节区名缓存。
+        
         Args:
             section_name: 节区名称
             
         Returns:
             节区数据，如果不存在则返回 None
         """
+        data = self._section_data_cache.get(section_name)
+        if data is not None:
+            return data
+        
         section = self.elffile.get_section_by_name(section_name)
         if section:
-            return section.data()
+            data = section.data()
+            self._section_data_cache[section_name] = data
+            return data
         return None
     
+    def release_section_cache(self) -> None:
+        """释放 get_section_data 缓存的节区数据"""
+        self._section_data_cache = {}
+    
+    def get_section_view(self, section_name: str) -> Optional[memoryview]:
+        """
+        获取指定节区数据的只读视图
+        
+        文件已内存映射且节区内容按原样存储在文件中时，直接返回映射的切片而不复制数据；
+        否则（如压缩节区、未映射的文件）退回到 get_section_data。
+        
+        Args:
+            section_name: 节区名称
+            
+        Returns:
+            节区数据视图，如果不存在则返回 None
+        """
+        section_info = self.sections.get(section_name)
+        file_map = getattr(self, '_mmap', None)
+        
+        if (section_info is not None and file_map is not None and
+            section_info['type'] != 'SHT_NOBITS' and
+            not section_info['flags'] & SH_FLAGS.SHF_COMPRESSED):
+            start = section_info['offset']
+            end = start + section_info['size']
+            if end <= len(file_map):
+                return memoryview(file_map)[start:end]
+        
+        data = self.get_section_data(section_name)
+        return memoryview(data) if data is not None else None
+    
+    def read_range(self, offset: int, size: int) -> bytes:
+        """
+        读取文件中指定范围的字节
+        
+        文件已内存映射时直接切片映射，否则使用 os.pread，不移动文件指针。
+        
+        Args:
+            offset: 文件偏移
+            size: 字节数
+            
+        Returns:
+            读取的字节（超出文件末尾的部分被截断）
+        """
+        file_map = getattr(self, '_mmap', None)
+        if file_map is not None:
+            return file_map[offset:offset + size]
+        if hasattr(os, 'pread'):
+            return os.pread(self._file_handle.fileno(), size, offset)
+        self._file_handle.seek(offset)
+        return self._file_handle.read(size)
+    
+    def read_section_range(self, section_name: str, start: int, size: int) -> Optional[bytes]:
+        """
+        读取节区内指定范围的字节，不读取整个节区
+        
+        节区内容按原样存储在文件中时只读取所需范围；
+        压缩节区等情况退回到 get_section_data 后切片。
+        
+        Args:
+            section_name: 节区名称
+            start: 节区内的起始偏移
+            size: 字节数
+            
+        Returns:
+            读取的字节（不超过节区末尾），节区不存在时返回 None
+        """
+        section_info = self.sections.get(section_name)
+        if section_info is None:
+            return None
+        
+        start = max(start, 0)
+        size = max(min(size, section_info['size'] - start), 0)
+        
+        if (section_info['type'] != 'SHT_NOBITS' and
+            not section_info['flags'] & SH_FLAGS.SHF_COMPRESSED):
+            return self.read_range(section_info['offset'] + start, size)
+        
+        data = self.get_section_data(section_name)
+        return data[start:start + size] if data is not None else None
+    
     def is_executable(self) -> bool:
         """
         检查文件是否为可执行文件
@@ -258,17 +503,34 @@ class ElfParser:
             'file_type': self.file_type,
             'entry_point': hex(self.entry_point),
             'num_sections': len(self.sections),
-            'num_symbols': len(self.symbols),
+            'num_symbols': self.num_symbols,
             'num_functions': len(self.function_symbols),
             'text_sections': len(self.text_sections)
         }
     
     def close(self):
-        """关闭文件句柄"""
+        """关闭内存映射和文件句柄"""
+        self._section_data_cache = {}
+        if getattr(self, '_mmap', None) is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # 仍有外部引用的视图，映射在其释放后由垃圾回收关闭
+                pass
+            self._mmap = None
         if hasattr(self, '_file_handle') and self._file_handle:
             self._file_handle.close()
             self._file_handle = None
     
-    def __del__(self):
-        """析构时清理资源"""
+    def __enter__(self) -> 'ElfParser':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
         self.close()
+    
+    def __del__(self):
+        """析构时兜底清理资源（解释器退出时模块可能已被清理，忽略此时的错误）"""
+        try:
+            self.close()
+        except Exception:
+            pass
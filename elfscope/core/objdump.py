@@ -9,13 +9,40 @@ objdump 功能模块
 - 显示重定位信息
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
+import bisect
+import functools
+import io
 import logging
+from elftools.elf.constants import SH_FLAGS
 from elftools.elf.sections import SymbolTableSection
 from elftools.elf.relocation import Relocation, RelocationSection
 
 from .elf_parser import ElfParser
 from .disassembler import Disassembler, DisassemblerError
+from .disassembler_iced import IcedDisassembler
+
+
+# 节区标志位及其显示字母，顺序与 objdump 输出一致
+_SECTION_FLAG_LETTERS = (
+    (SH_FLAGS.SHF_WRITE, 'W'),
+    (SH_FLAGS.SHF_ALLOC, 'A'),
+    (SH_FLAGS.SHF_EXECINSTR, 'X'),
+    (SH_FLAGS.SHF_MERGE, 'M'),
+    (SH_FLAGS.SHF_STRINGS, 'S'),
+    (SH_FLAGS.SHF_INFO_LINK, 'I'),
+    (SH_FLAGS.SHF_LINK_ORDER, 'L'),
+    (SH_FLAGS.SHF_OS_NONCONFORMING, 'O'),
+    (SH_FLAGS.SHF_GROUP, 'G'),
+    (SH_FLAGS.SHF_TLS, 'T'),
+)
+_SECTION_FLAG_MASK = functools.reduce(lambda mask, item: mask | item[0], _SECTION_FLAG_LETTERS, 0)
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_flags(flags: int) -> str:
+    """按标志位生成显示字母，结果按标志值缓存"""
+    return ''.join(letter for bit, letter in _SECTION_FLAG_LETTERS if flags & bit)
 
 
 class ObjdumpAnalyzer:
@@ -25,24 +52,62 @@ class ObjdumpAnalyzer:
     提供类似 GNU objdump 的功能，用于查看 ELF 文件的各种信息
     """
     
-    def __init__(self, elf_parser: ElfParser):
+    # 字节到可打印 ASCII 的转换表，不可打印字符显示为 '.'
+    _PRINTABLE_TABLE = bytes(b if 32 <= b < 127 else ord('.') for b in range(256))
+    
+    # 符号类型映射
+    _SYMBOL_TYPES = {
+        'STT_FUNC': 'function',
+        'STT_OBJECT': 'object',
+        'STT_FILE': 'file',
+        'STT_SECTION': 'section',
+        'STT_NOTYPE': 'notype'
+    }
+    
+    def __init__(self, elf_parser: ElfParser, use_iced: bool = False):
         """
         初始化 objdump 分析器
         
         Args:
             elf_parser: ELF 解析器实例
+            use_iced: x86/x86_64 代码改用解码更快的 iced-x86（需要安装 iced-x86，
+                部分指令的写法与 Capstone 不同）
         """
         self.elf_parser = elf_parser
         self.architecture = elf_parser.get_architecture()
+        self.use_iced = use_iced
+        
+        # 地址显示宽度只取决于架构，构造时确定一次
+        self._address_format = '016x' if self.architecture in ('x86_64', 'aarch64') else '08x'
         
         try:
-            self.disassembler = Disassembler(self.architecture)
+            self.disassembler = self._create_disassembler()
         except DisassemblerError as e:
             raise ValueError(f"无法初始化反汇编器: {e}")
         
+        # 符号类型 -> show_symbols 结果缓存
+        self._symbols_by_type = {}
+        
         # 构建地址到函数名的映射
         self._build_function_map()
     
+    def _create_disassembler(self) -> Disassembler:
+        """
+        创建当前架构的反汇编器
+        
+        默认使用 Capstone；指定 use_iced 时 x86/x86_64 使用更快的 iced-x86 解码，
+        其余架构仍使用 Capstone。与 objdump 一样，无法解码的字节输出为 .byte 后继续反汇编。
+        
+        Returns:
+            反汇编器实例
+            
+        Raises:
+            DisassemblerError: 指定了 use_iced 但未安装 iced-x86
+        """
+        if self.use_iced and self.architecture in IcedDisassembler.BITNESS:
+            return IcedDisassembler(self.architecture)
+        return Disassembler(self.architecture, skipdata=True)
+    
     def _build_function_map(self) -> None:
         """构建地址到函数名的映射"""
         self.addr_to_func = {}
@@ -53,6 +118,9 @@ class ObjdumpAnalyzer:
             name = func['name']
             if addr > 0 and name:
                 self.addr_to_func[addr] = name
+        
+        # 按地址排序的函数入口，反汇编时顺序推进而不必逐条指令查字典
+        self._func_starts = sorted(self.addr_to_func)
     
     def disassemble_section(self, 
                            section_name: Optional[str] = None,
@@ -88,38 +156,17 @@ class ObjdumpAnalyzer:
         
         for section_info in sections:
             section_name = section_info['name']
-            section_data = self.elf_parser.get_section_data(section_name)
+            # 未压缩节区直接引用内存映射，压缩节区由解析器解压一次后缓存
+            section_data = self.elf_parser.get_section_view(section_name)
             
             if not section_data:
                 continue
             
             section_addr = section_info['addr']
-            instructions = []
             
             try:
                 # 使用反汇编器反汇编整个节区
-                for insn in self.disassembler.disassemble(section_data, section_addr):
-                    instruction_info = {
-                        'address': insn.address,
-                        'mnemonic': insn.mnemonic,
-                        'op_str': insn.op_str,
-                        'bytes': insn.bytes.hex(),
-                        'size': insn.size
-                    }
-                    
-                    # 检查是否是函数入口
-                    if insn.address in self.addr_to_func:
-                        instruction_info['function'] = self.addr_to_func[insn.address]
-                    
-                    # 检查是否是调用指令并解析目标
-                    if self.disassembler.is_call_instruction(insn):
-                        target = self.disassembler.extract_call_target(insn)
-                        if target:
-                            instruction_info['call_target'] = target
-                            if target in self.addr_to_func:
-                                instruction_info['call_target_name'] = self.addr_to_func[target]
-                    
-                    instructions.append(instruction_info)
+                instructions = self._decode_instructions(section_data, section_addr)
                 
                 result['sections'].append({
                     'name': section_name,
@@ -136,6 +183,85 @@ class ObjdumpAnalyzer:
         
         return result
     
+    def _decode_instructions(self,
+                             data: bytes,
+                             base_address: int,
+                             mark_functions: bool = True) -> List[Dict[str, Any]]:
+        """
+        反汇编字节码并生成指令信息列表
+        
+        Args:
+            data: 要反汇编的字节码
+            base_address: 基地址
+            mark_functions: 是否标注函数入口
+            
+        Returns:
+            指令信息列表
+        """
+        return list(self.iter_instructions(data, base_address, mark_functions))
+    
+    def iter_instructions(self,
+                          data: bytes,
+                          base_address: int,
+                          mark_functions: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        逐条反汇编字节码并生成指令信息
+        
+        反汇编、函数入口标注和调用目标解析都在这一个循环里完成，节区、函数和地址范围
+        三种反汇编共用；调用方可以直接消费生成器，不必先把整个节区的指令放进列表。
+        使用轻量反汇编，不为每条指令创建指令对象；分支目标由反汇编器一并给出。
+        节区数据不整段复制或编码，每条指令的字节从内存映射视图中切出后单独编码。
+        
+        Args:
+            data: 要反汇编的字节码（bytes 或 memoryview）
+            base_address: 基地址
+            mark_functions: 是否标注函数入口
+            
+        Yields:
+            指令信息字典
+        """
+        disassembler = self.disassembler
+        
+        addr_to_func = self.addr_to_func
+        get_func_name = addr_to_func.get
+        call_instructions = disassembler.call_instructions
+        
+        # 指令地址单调递增，只需与下一个函数入口比较；不标注时下一个入口视为无穷远
+        func_starts = self._func_starts
+        func_index = bisect.bisect_left(func_starts, base_address)
+        no_func = float('inf')
+        next_func = (func_starts[func_index]
+                     if mark_functions and func_index < len(func_starts) else no_func)
+        
+        # 分支目标由反汇编器给出：iced-x86 取自解码结果，Capstone 从操作数字符串解析
+        for address, size, mnemonic, op_str, target in disassembler.disassemble_lite_targets(
+                data, base_address):
+            offset = address - base_address
+            instruction_info = {
+                'address': address,
+                'mnemonic': mnemonic,
+                'op_str': op_str,
+                'bytes': data[offset:offset + size].hex(),
+                'size': size
+            }
+            
+            # 检查是否是函数入口（落在指令中间的入口直接跳过）
+            if address >= next_func:
+                func_index = bisect.bisect_left(func_starts, address, func_index)
+                if func_index < len(func_starts) and func_starts[func_index] == address:
+                    instruction_info['function'] = addr_to_func[address]
+                    func_index += 1
+                next_func = func_starts[func_index] if func_index < len(func_starts) else no_func
+            
+            # 调用指令记录目标及其函数名
+            if target and mnemonic in call_instructions:
+                instruction_info['call_target'] = target
+                target_name = get_func_name(target)
+                if target_name is not None:
+                    instruction_info['call_target_name'] = target_name
+            
+            yield instruction_info
+    
     def _disassemble_address_range(self, 
                                    start_address: int,
                                    end_address: Optional[int] = None) -> Dict[str, Any]:
@@ -156,25 +282,15 @@ class ObjdumpAnalyzer:
             end_address = int(end_address, 16) if end_address else None
         
         # 找到包含该地址的节区
-        section_data = None
-        section_base = 0
-        section_name = None
-        
-        for section in self.elf_parser.text_sections:
-            section_addr = section['addr']
-            section_end = section_addr + section['size']
-            
-            if section_addr <= start_address < section_end:
-                section_name = section['name']
-                section_base = section_addr
-                section_data = self.elf_parser.get_section_data(section_name)
-                break
+        section = self.elf_parser.get_text_section_by_address(start_address)
         
-        if not section_data:
+        if section is None or not section['size']:
             raise ValueError(f"地址 {hex(start_address)} 不在任何代码段中")
         
+        section_name = section['name']
+        
         # 计算节区内的偏移
-        offset = start_address - section_base
+        offset = start_address - section['addr']
         
         # 确定要反汇编的长度
         if end_address:
@@ -186,38 +302,14 @@ class ObjdumpAnalyzer:
                 length = func['size']
             else:
                 # 默认反汇编 100 字节
-                length = min(100, len(section_data) - offset)
+                length = min(100, section['size'] - offset)
         
-        # 提取要反汇编的数据
-        data_to_disassemble = section_data[offset:offset + length]
+        # 只读取要反汇编的数据，不读取整个节区；数据在结束地址处截断，解码不会越过结束地址
+        data_to_disassemble = self.elf_parser.read_section_range(section_name, offset, length)
+        if data_to_disassemble is None:
+            raise ValueError(f"地址 {hex(start_address)} 不在任何代码段中")
         
-        instructions = []
-        for insn in self.disassembler.disassemble(data_to_disassemble, start_address):
-            instruction_info = {
-                'address': insn.address,
-                'mnemonic': insn.mnemonic,
-                'op_str': insn.op_str,
-                'bytes': insn.bytes.hex(),
-                'size': insn.size
-            }
-            
-            # 检查是否是函数入口
-            if insn.address in self.addr_to_func:
-                instruction_info['function'] = self.addr_to_func[insn.address]
-            
-            # 检查调用目标
-            if self.disassembler.is_call_instruction(insn):
-                target = self.disassembler.extract_call_target(insn)
-                if target:
-                    instruction_info['call_target'] = target
-                    if target in self.addr_to_func:
-                        instruction_info['call_target_name'] = self.addr_to_func[target]
-            
-            instructions.append(instruction_info)
-            
-            # 如果达到结束地址，停止
-            if end_address and insn.address >= end_address:
-                break
+        instructions = self._decode_instructions(data_to_disassemble, start_address)
         
         return {
             'address_range': {
@@ -246,47 +338,18 @@ class ObjdumpAnalyzer:
         func_addr = func['value']
         func_size = func['size']
         
-        # 找到包含该函数的节区
-        section_data = None
-        section_base = 0
-        section_name = None
-        
-        for section in self.elf_parser.text_sections:
-            section_addr = section['addr']
-            section_end = section_addr + section['size']
-            
-            if section_addr <= func_addr < section_end:
-                section_name = section['name']
-                section_base = section_addr
-                section_data = self.elf_parser.get_section_data(section_name)
-                break
+        # 找到包含该函数的节区，只读取函数本身的字节
+        func_bytes = None
+        section = self.elf_parser.get_text_section_by_address(func_addr)
+        if section is not None:
+            func_bytes = self.elf_parser.read_section_range(
+                section['name'], func_addr - section['addr'], func_size
+            )
         
-        if not section_data:
+        if not func_bytes:
             raise ValueError(f"无法找到函数 '{function_name}' 所在的代码段")
         
-        # 计算函数在节区中的偏移
-        offset = func_addr - section_base
-        func_bytes = section_data[offset:offset + func_size]
-        
-        instructions = []
-        for insn in self.disassembler.disassemble(func_bytes, func_addr):
-            instruction_info = {
-                'address': insn.address,
-                'mnemonic': insn.mnemonic,
-                'op_str': insn.op_str,
-                'bytes': insn.bytes.hex(),
-                'size': insn.size
-            }
-            
-            # 检查调用目标
-            if self.disassembler.is_call_instruction(insn):
-                target = self.disassembler.extract_call_target(insn)
-                if target:
-                    instruction_info['call_target'] = target
-                    if target in self.addr_to_func:
-                        instruction_info['call_target_name'] = self.addr_to_func[target]
-            
-            instructions.append(instruction_info)
+        instructions = self._decode_instructions(func_bytes, func_addr, mark_functions=False)
         
         return {
             'function': function_name,
@@ -306,29 +369,36 @@ class ObjdumpAnalyzer:
         Returns:
             包含符号信息的字典
         """
-        result = {
-            'symbols': [],
-            'total_count': 0
-        }
-        
-        symbols = self.elf_parser.symbols
+        # 同一类型的查询只扫描一次符号表，之后直接复用结果
+        symbols = self._symbols_by_type.get(symbol_type)
+        if symbols is None:
+            symbols = self._collect_symbols(symbol_type)
+            self._symbols_by_type[symbol_type] = symbols
         
-        # 符号类型映射
-        type_map = {
-            'STT_FUNC': 'function',
-            'STT_OBJECT': 'object',
-            'STT_FILE': 'file',
-            'STT_SECTION': 'section',
-            'STT_NOTYPE': 'notype'
+        return {
+            'symbols': list(symbols),
+            'total_count': len(symbols)
         }
+    
+    def _collect_symbols(self, symbol_type: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        扫描符号表，生成指定类型的符号信息列表
         
-        for symbol in symbols:
-            if symbol_type:
-                sym_type = type_map.get(symbol['type'], 'unknown')
-                if sym_type != symbol_type:
-                    continue
+        Args:
+            symbol_type: 符号类型过滤，None 表示所有符号
+            
+        Returns:
+            符号信息列表
+        """
+        type_map = self._SYMBOL_TYPES
+        symbols = []
+        
+        # 逐个读取符号，不在解析器中保留完整符号列表
+        for symbol in self.elf_parser.iter_all_symbols():
+            if symbol_type and type_map.get(symbol['type'], 'unknown') != symbol_type:
+                continue
             
-            symbol_info = {
+            symbols.append({
                 'value': hex(symbol['value']),
                 'name': symbol['name'],
                 'type': type_map.get(symbol['type'], symbol['type']),
@@ -336,12 +406,9 @@ class ObjdumpAnalyzer:
                 'bind': symbol['bind'],
                 'visibility': symbol['visibility'],
                 'shndx': symbol['shndx']
-            }
-            
-            result['symbols'].append(symbol_info)
-            result['total_count'] += 1
+            })
         
-        return result
+        return symbols
     
     def show_headers(self) -> Dict[str, Any]:
         """
@@ -381,31 +448,8 @@ class ObjdumpAnalyzer:
         Returns:
             格式化的标志字符串
         """
-        from elftools.elf.constants import SH_FLAGS
-        
-        flag_list = []
-        if flags & SH_FLAGS.SHF_WRITE:
-            flag_list.append('W')
-        if flags & SH_FLAGS.SHF_ALLOC:
-            flag_list.append('A')
-        if flags & SH_FLAGS.SHF_EXECINSTR:
-            flag_list.append('X')
-        if flags & SH_FLAGS.SHF_MERGE:
-            flag_list.append('M')
-        if flags & SH_FLAGS.SHF_STRINGS:
-            flag_list.append('S')
-        if flags & SH_FLAGS.SHF_INFO_LINK:
-            flag_list.append('I')
-        if flags & SH_FLAGS.SHF_LINK_ORDER:
-            flag_list.append('L')
-        if flags & SH_FLAGS.SHF_OS_NONCONFORMING:
-            flag_list.append('O')
-        if flags & SH_FLAGS.SHF_GROUP:
-            flag_list.append('G')
-        if flags & SH_FLAGS.SHF_TLS:
-            flag_list.append('T')
-        
-        return ''.join(flag_list) if flag_list else ''
+        # 只保留会显示的标志位，OS/处理器相关位不影响结果，缓存命中率更高
+        return _format_flags(flags & _SECTION_FLAG_MASK)
     
     def show_full_contents(self, section_name: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -424,7 +468,7 @@ class ObjdumpAnalyzer:
         sections_to_show = [section_name] if section_name else list(self.elf_parser.sections.keys())
         
         for sec_name in sections_to_show:
-            section_data = self.elf_parser.get_section_data(sec_name)
+            section_data = self.elf_parser.get_section_view(sec_name)
             
             if section_data is None:
                 continue
@@ -433,26 +477,27 @@ class ObjdumpAnalyzer:
             section_addr = section_info.get('addr', 0)
             
             # 格式化内容为十六进制和 ASCII
-            lines = []
             bytes_per_line = 16
-            
-            for i in range(0, len(section_data), bytes_per_line):
-                chunk = section_data[i:i + bytes_per_line]
-                address = section_addr + i
-                
-                # 十六进制表示
-                hex_str = ' '.join(f'{b:02x}' for b in chunk)
-                # 填充到固定宽度
-                hex_str = hex_str.ljust(bytes_per_line * 3 - 1)
-                
-                # ASCII 表示
-                ascii_str = ''.join(chr(b) if 32 <= b < 127 else '.' for b in chunk)
-                
-                lines.append({
-                    'address': hex(address),
-                    'hex': hex_str,
-                    'ascii': ascii_str
-                })
+            hex_width = bytes_per_line * 3 - 1
+            
+            # 整个节区一次性转换为十六进制文本和可打印 ASCII（均在 C 层完成），逐行切片即可
+            section_bytes = bytes(section_data)
+            hex_text = section_bytes.hex(' ')
+            ascii_text = section_bytes.translate(self._PRINTABLE_TABLE).decode('ascii')
+            
+            # 行地址由 map(hex, range) 批量生成
+            offsets = range(0, len(section_bytes), bytes_per_line)
+            addresses = map(hex, range(section_addr, section_addr + len(section_bytes),
+                                       bytes_per_line))
+            lines = [{
+                'address': address,
+                'hex': hex_text[i * 3:i * 3 + hex_width],
+                'ascii': ascii_text[i:i + bytes_per_line]
+            } for address, i in zip(addresses, offsets)]
+            
+            # 只有最后一行可能不满，填充到固定宽度
+            if lines:
+                lines[-1]['hex'] = lines[-1]['hex'].ljust(hex_width)
             
             result['sections'].append({
                 'name': sec_name,
@@ -463,6 +508,24 @@ class ObjdumpAnalyzer:
         
         return result
     
+    @staticmethod
+    def iter_full_contents_lines(data: Dict[str, Any]) -> Iterator[str]:
+        """
+        逐行生成完整节区内容的文本输出，不含换行符
+        
+        Args:
+            data: show_full_contents 的返回结果
+            
+        Yields:
+            输出行
+        """
+        for sec in data['sections']:
+            yield f"\n节区 {sec['name']} (地址: {sec['address']}, 大小: {sec['size']} 字节):"
+            yield "-" * 100
+            
+            for line in sec['lines']:
+                yield f" {line['address']}  {line['hex']}  |{line['ascii']}|"
+    
     def show_relocations(self, section_name: Optional[str] = None) -> Dict[str, Any]:
         """
         显示重定位信息
@@ -477,7 +540,10 @@ class ObjdumpAnalyzer:
             'relocations': []
         }
         
-        for section in self.elf_parser.elffile.iter_sections():
+        # 节区头只解析一次，关联符号表按 sh_link 直接索引
+        all_sections = list(self.elf_parser.elffile.iter_sections())
+        
+        for section in all_sections:
             if not isinstance(section, RelocationSection):
                 continue
             
@@ -491,11 +557,16 @@ class ObjdumpAnalyzer:
             
             # 获取关联的符号表
             symtab = None
-            if section['sh_link'] < len(list(self.elf_parser.elffile.iter_sections())):
-                linked_section = list(self.elf_parser.elffile.iter_sections())[section['sh_link']]
+            if section['sh_link'] < len(all_sections):
+                linked_section = all_sections[section['sh_link']]
                 if isinstance(linked_section, SymbolTableSection):
                     symtab = linked_section
             
+            # 符号数量在循环中不变，只取一次
+            num_symbols = symtab.num_symbols() if symtab else 0
+            get_symbol = symtab.get_symbol if symtab else None
+            relocations = reloc_info['relocations']
+            
             for reloc in section.iter_relocations():
                 reloc_entry = {
                     'offset': hex(reloc['r_offset']),
@@ -504,14 +575,13 @@ class ObjdumpAnalyzer:
                 }
                 
                 # 获取符号信息（如果有）
-                if symtab:
-                    sym_index = reloc['r_info_sym']
-                    if sym_index < symtab.num_symbols():
-                        symbol = symtab.get_symbol(sym_index)
-                        reloc_entry['symbol'] = symbol.name
-                        reloc_entry['symbol_value'] = hex(symbol['st_value'])
+                sym_index = reloc['r_info_sym']
+                if sym_index < num_symbols:
+                    symbol = get_symbol(sym_index)
+                    reloc_entry['symbol'] = symbol.name
+                    reloc_entry['symbol_value'] = hex(symbol['st_value'])
                 
-                reloc_info['relocations'].append(reloc_entry)
+                relocations.append(reloc_entry)
             
             if reloc_info['relocations']:
                 result['relocations'].append(reloc_info)
@@ -532,8 +602,14 @@ class ObjdumpAnalyzer:
         if format_type == 'text':
             return self._format_disassembly_text(disassembly_data)
         else:
-            import json
-            return json.dumps(disassembly_data, indent=2, ensure_ascii=False)
+            try:
+                import orjson
+                options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                return orjson.dumps(disassembly_data, option=options).decode('utf-8')
+            except (ImportError, TypeError):
+                # orjson 未安装或无法序列化（如超过 64 位的整数）时回退到标准库
+                import json
+                return json.dumps(disassembly_data, indent=2, ensure_ascii=False)
     
     def _format_address(self, address: Any) -> str:
         """
@@ -546,20 +622,12 @@ class ObjdumpAnalyzer:
             格式化的地址字符串
         """
         if isinstance(address, int):
-            # 根据架构确定地址宽度
-            if self.architecture in ['x86_64', 'aarch64']:
-                return f"{address:016x}"
-            else:
-                return f"{address:08x}"
+            return format(address, self._address_format)
         elif isinstance(address, str):
             # 如果是字符串，尝试解析
             try:
-                addr_int = int(address, 16) if address.startswith('0x') else int(address, 16)
-                if self.architecture in ['x86_64', 'aarch64']:
-                    return f"{addr_int:016x}"
-                else:
-                    return f"{addr_int:08x}"
-            except (ValueError, AttributeError):
+                return format(int(address, 16), self._address_format)
+            except ValueError:
                 return address
         else:
             return str(address)
@@ -574,87 +642,103 @@ class ObjdumpAnalyzer:
         Returns:
             格式化的文本字符串
         """
-        lines = []
+        buffer = io.StringIO()
+        self.write_disassembly(data, buffer.write)
+        return buffer.getvalue()
+    
+    def write_disassembly(self, data: Dict[str, Any], write: Callable[[str], Any]) -> None:
+        """
+        将反汇编文本逐行写出，不先拼接成完整字符串
         
+        Args:
+            data: 反汇编数据
+            write: 写入函数，如 sys.stdout.write 或 io.StringIO().write
+        """
+        lines = self.iter_disassembly_lines(data)
+        first = next(lines, None)
+        if first is None:
+            return
+        
+        # 与 '\n'.join 的结果一致：末行之后不写换行
+        write(first)
+        for line in lines:
+            write('\n')
+            write(line)
+    
+    def iter_disassembly_lines(self, data: Dict[str, Any]) -> Iterator[str]:
+        """
+        逐行生成文本格式的反汇编输出（类似 objdump），不含换行符
+        
+        Args:
+            data: 反汇编数据
+            
+        Yields:
+            输出行
+        """
         # 处理节区反汇编
         if 'sections' in data:
             for section in data['sections']:
-                lines.append(f"\n节区 {section['name']} 的反汇编：")
+                yield f"\n节区 {section['name']} 的反汇编："
                 # 计算结束地址
                 start_addr_str = section['address']
                 try:
-                    start_addr = int(start_addr_str, 16) if isinstance(start_addr_str, str) else start_addr_str
+                    if isinstance(start_addr_str, str):
+                        start_addr = int(start_addr_str, 16)
+                    else:
+                        start_addr = start_addr_str
                     end_addr = start_addr + section['size']
-                    lines.append(f"地址范围: {self._format_address(start_addr)} - {self._format_address(end_addr)}")
+                    yield (f"地址范围: {self._format_address(start_addr)} - "
+                           f"{self._format_address(end_addr)}")
                 except (ValueError, TypeError):
-                    lines.append(f"地址范围: {start_addr_str} - (计算失败)")
-                lines.append("")
+                    yield f"地址范围: {start_addr_str} - (计算失败)"
+                yield ""
                 
                 for insn in section['instructions']:
-                    addr_str = self._format_address(insn['address'])
-                    
                     # 如果有函数标签
                     if 'function' in insn:
-                        lines.append("")
-                        lines.append(f"{addr_str} <{insn['function']}>:")
-                    
-                    # 格式化字节码（每两个字符一组，最多显示16个字节）
-                    bytes_str = insn['bytes']
-                    bytes_formatted = ' '.join([bytes_str[i:i+2] for i in range(0, min(16, len(bytes_str)), 2)])
-                    
-                    # 指令字符串
-                    instruction_str = f"{insn['mnemonic']:8s} {insn['op_str']}"
-                    
-                    # 如果有调用目标名称，在地址后面添加函数名注释
-                    if 'call_target_name' in insn:
-                        # 在指令字符串末尾添加函数名注释
-                        instruction_str = f"{instruction_str} <{insn['call_target_name']}>"
+                        yield ""
+                        yield f"{self._format_address(insn['address'])} <{insn['function']}>:"
                     
-                    line = f"  {addr_str}: {bytes_formatted:24s} {instruction_str}"
-                    lines.append(line)
+                    yield self._format_instruction_line(insn)
         
         # 处理函数反汇编
         elif 'function' in data:
-            lines.append(f"\n函数 {data['function']} 的反汇编：")
-            lines.append(f"地址: {data['address']}, 大小: {data['size']} 字节")
-            lines.append("")
+            yield f"\n函数 {data['function']} 的反汇编："
+            yield f"地址: {data['address']}, 大小: {data['size']} 字节"
+            yield ""
             
             for insn in data['instructions']:
-                addr_str = self._format_address(insn['address'])
-                
-                bytes_str = insn['bytes']
-                bytes_formatted = ' '.join([bytes_str[i:i+2] for i in range(0, min(16, len(bytes_str)), 2)])
-                
-                instruction_str = f"{insn['mnemonic']:8s} {insn['op_str']}"
-                
-                # 如果有调用目标名称，在地址后面添加函数名注释
-                if 'call_target_name' in insn:
-                    instruction_str = f"{instruction_str} <{insn['call_target_name']}>"
-                
-                line = f"  {addr_str}: {bytes_formatted:24s} {instruction_str}"
-                lines.append(line)
+                yield self._format_instruction_line(insn)
         
         # 处理地址范围反汇编
         elif 'address_range' in data:
             addr_range = data['address_range']
-            lines.append(f"\n地址范围反汇编：")
-            lines.append(f"起始: {addr_range['start']}, 结束: {addr_range['end']}")
-            lines.append("")
+            yield f"\n地址范围反汇编："
+            yield f"起始: {addr_range['start']}, 结束: {addr_range['end']}"
+            yield ""
             
             for insn in data['instructions']:
-                addr_str = self._format_address(insn['address'])
-                
-                bytes_str = insn['bytes']
-                bytes_formatted = ' '.join([bytes_str[i:i+2] for i in range(0, min(16, len(bytes_str)), 2)])
-                
-                instruction_str = f"{insn['mnemonic']:8s} {insn['op_str']}"
-                
-                # 如果有调用目标名称，在地址后面添加函数名注释
-                if 'call_target_name' in insn:
-                    instruction_str = f"{instruction_str} <{insn['call_target_name']}>"
-                
-                line = f"  {addr_str}: {bytes_formatted:24s} {instruction_str}"
-                lines.append(line)
+                yield self._format_instruction_line(insn)
+    
+    def _format_instruction_line(self, insn: Dict[str, Any]) -> str:
+        """
+        格式化单条指令
+        
+        Args:
+            insn: 指令信息
+            
+        Returns:
+            格式化的指令行
+        """
+        addr_str = self._format_address(insn['address'])
+        
+        # 格式化字节码（每字节一组，最多显示8个字节）；指令字典里保存的是 JSON 输出用的十六进制串，
+        # 还原成字节后由 bytes.hex 一次插入分隔符
+        bytes_formatted = bytes.fromhex(insn['bytes'][:16]).hex(' ')
+        
+        # 如果有调用目标名称，在指令末尾添加函数名注释；名称在反汇编时已解析好，这里只拼接
+        call_target_name = insn.get('call_target_name')
+        suffix = f" <{call_target_name}>" if call_target_name else ''
         
-        return '\n'.join(lines)
+        return f"  {addr_str}: {bytes_formatted:24s} {insn['mnemonic']:8s} {insn['op_str']}{suffix}"
 
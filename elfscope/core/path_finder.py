@@ -9,7 +9,7 @@
 
 from typing import Dict, List, Set, Optional, Any, Generator
 import logging
-from collections import deque
+from array import array
 import networkx as nx
 
 from .call_analyzer import CallAnalyzer
@@ -36,6 +36,10 @@ class PathFinder:
             call_analyzer.analyze()
         
         self.call_graph = call_analyzer.call_graph
+        
+        # 整数编号的压缩邻接表（CSR），首次搜索简单路径时构建
+        self._adjacency = None
+        self._adjacency_size = None
     
     def find_paths(self, 
                    target_function: str, 
@@ -74,24 +78,13 @@ class PathFinder:
             }
         }
         
-        if source_function:
-            # 查找特定源函数到目标函数的路径
-            paths = self._find_paths_between(source_function, target_function, 
-                                           max_depth, include_cycles)
-        else:
-            # 查找所有可能的路径到目标函数
-            paths = self._find_all_paths_to_target(target_function, 
-                                                 max_depth, include_cycles)
-        
         # 处理和格式化路径
         formatted_paths = []
         depths = []
         
-        for path in paths:
-            if len(path) > 1:  # 至少包含两个函数的路径
-                formatted_path = self._format_path(path)
-                formatted_paths.append(formatted_path)
-                depths.append(len(path) - 1)  # 路径深度
+        for path in self.iter_paths(target_function, source_function, max_depth, include_cycles):
+            formatted_paths.append(self._format_path(path))
+            depths.append(len(path) - 1)  # 路径深度
         
         result['paths'] = formatted_paths
         result['statistics']['total_paths'] = len(formatted_paths)
@@ -103,6 +96,39 @@ class PathFinder:
         
         return result
     
+    def iter_paths(self, 
+                   target_function: str, 
+                   source_function: Optional[str] = None,
+                   max_depth: int = 10,
+                   include_cycles: bool = False) -> Generator[List[str], None, None]:
+        """
+        逐条生成到目标函数的调用路径
+        
+        每找到一条路径立即返回，内存占用只与搜索深度相关，调用方可以随时停止迭代。
+        只生成至少包含两个函数的路径。
+        
+        Args:
+            target_function: 目标函数名
+            source_function: 源函数名，如果为 None 则查找所有可能的源
+            max_depth: 最大搜索深度
+            include_cycles: 是否包含存在环的路径
+            
+        Yields:
+            路径（函数名列表）
+        """
+        if target_function not in self.call_graph:
+            return
+        
+        if source_function:
+            paths = self._iter_paths_between(source_function, target_function, max_depth,
+                                             include_cycles)
+        else:
+            paths = self._iter_all_paths_to_target(target_function, max_depth, include_cycles)
+        
+        for path in paths:
+            if len(path) > 1:  # 至少包含两个函数的路径
+                yield path
+    
     def _find_paths_between(self, 
                            source: str, 
                            target: str, 
@@ -120,30 +146,31 @@ class PathFinder:
         Returns:
             路径列表，每个路径是函数名列表
         """
+        return list(self._iter_paths_between(source, target, max_depth, include_cycles))
+    
+    def _iter_paths_between(self, 
+                           source: str, 
+                           target: str, 
+                           max_depth: int,
+                           include_cycles: bool) -> Generator[List[str], None, None]:
+        """逐条生成两个特定函数之间的路径"""
         if source not in self.call_graph:
             logging.warning(f"源函数 '{source}' 不存在")
-            return []
-        
-        paths = []
+            return
         
         try:
             # 使用NetworkX查找所有简单路径
             if include_cycles:
                 # 允许环的情况下，限制搜索深度
-                for path in self._find_paths_with_cycles(source, target, max_depth):
-                    paths.append(path)
+                yield from self._find_paths_with_cycles(source, target, max_depth)
             else:
                 # 使用简单路径（无环）
-                for path in nx.all_simple_paths(self.call_graph, source, target, 
-                                              cutoff=max_depth):
-                    paths.append(path)
+                yield from self._iter_simple_paths(source, target, max_depth)
         except nx.NetworkXNoPath:
             # 没有路径
             pass
         except Exception as e:
             logging.warning(f"查找路径时出错: {e}")
-        
-        return paths
     
     def _find_all_paths_to_target(self, 
                                  target: str, 
@@ -160,43 +187,109 @@ class PathFinder:
         Returns:
             路径列表
         """
-        all_paths = []
+        return list(self._iter_all_paths_to_target(target, max_depth, include_cycles))
+    
+    def _iter_all_paths_to_target(self, 
+                                 target: str, 
+                                 max_depth: int,
+                                 include_cycles: bool) -> Generator[List[str], None, None]:
+        """
+        逐条生成所有到达目标函数的路径
         
-        # 获取所有可能的源函数（没有调用者的函数，或者用户指定的入口函数）
-        potential_sources = []
+        不同源函数的路径起点不同，单个源函数的搜索也不会重复生成同一路径，
+        因此无需记录已生成的路径来去重。
+        """
+        # 能到达目标的函数即目标的所有祖先，沿调用图维护的反向邻接只遍历可达部分
+        predecessors = self.call_graph.pred
+        potential_sources = set()
+        pending = [target]
+        while pending:
+            for caller in predecessors.get(pending.pop(), ()):
+                if caller not in potential_sources:
+                    potential_sources.add(caller)
+                    pending.append(caller)
+        
+        # 按调用图中的节点顺序从每个潜在源查找路径
+        for source in self.call_graph.nodes:
+            if source != target and source in potential_sources:
+                yield from self._iter_paths_between(source, target, max_depth, include_cycles)
+    
+    def _get_adjacency(self):
+        """
+        获取以整数编号表示的压缩邻接表（CSR）
         
-        for node in self.call_graph.nodes:
-            if node != target:
-                # 检查是否有从该节点到目标的路径
-                try:
-                    if nx.has_path(self.call_graph, node, target):
-                        potential_sources.append(node)
-                except:
-                    pass
-        
-        # 从每个潜在源查找路径
-        for source in potential_sources:
-            paths = self._find_paths_between(source, target, max_depth, include_cycles)
-            all_paths.extend(paths)
-        
-        # 去重（保持路径顺序）
-        unique_paths = []
-        seen_paths = set()
-        
-        for path in all_paths:
-            path_tuple = tuple(path)
-            if path_tuple not in seen_paths:
-                seen_paths.add(path_tuple)
-                unique_paths.append(path)
-        
-        return unique_paths
+        函数 i 的被调用函数编号为 indices[indptr[i]:indptr[i + 1]]，
+        编号存放在连续的 32 位整数数组中，不为每条边创建 Python 对象。
+        
+        Returns:
+            (编号 -> 函数名列表, 函数名 -> 编号字典, indptr 数组, indices 数组)
+        """
+        size = (self.call_graph.number_of_nodes(), self.call_graph.number_of_edges())
+        if self._adjacency is None or self._adjacency_size != size:
+            names = list(self.call_graph.nodes)
+            index = {name: i for i, name in enumerate(names)}
+            indptr = array('l', [0])
+            indices = array('i')
+            for name in names:
+                indices.extend(index[callee] for callee in self.call_graph.successors(name))
+                indptr.append(len(indices))
+            self._adjacency = (names, index, indptr, indices)
+            self._adjacency_size = size
+        return self._adjacency
+    
+    def _iter_simple_paths(self, 
+                          source: str, 
+                          target: str, 
+                          max_depth: int) -> Generator[List[str], None, None]:
+        """
+        使用显式栈的深度优先搜索生成两个函数间的简单路径（无环）
+        
+        结果与 nx.all_simple_paths(cutoff=max_depth) 一致，路径上的函数
+        用 bytearray 标记，判断是否成环为 O(1)。
+        
+        Args:
+            source: 源函数
+            target: 目标函数
+            max_depth: 路径的最大调用次数
+            
+        Yields:
+            路径列表
+        """
+        names, index, indptr, indices = self._get_adjacency()
+        start, goal = index[source], index[target]
+        if start == goal or max_depth < 1:
+            return
+        
+        on_path = bytearray(len(names))
+        on_path[start] = 1
+        path = [start]
+        stack = [iter(indices[indptr[start]:indptr[start + 1]])]
+        
+        while stack:
+            for child in stack[-1]:
+                if on_path[child]:
+                    continue
+                if child == goal:
+                    yield [names[i] for i in path] + [target]
+                elif len(path) < max_depth:
+                    on_path[child] = 1
+                    path.append(child)
+                    stack.append(iter(indices[indptr[child]:indptr[child + 1]]))
+                    break
+            else:
+                stack.pop()
+                on_path[path.pop()] = 0
     
     def _find_paths_with_cycles(self, 
                                source: str, 
                                target: str, 
                                max_depth: int) -> Generator[List[str], None, None]:
         """
-        使用BFS查找包含环的路径
+        使用显式栈的深度优先搜索查找包含环的路径
+        
+        路径中同一函数最多出现两次，路径最多包含 max_depth 个函数。每个分支
+        只记录当前路径上各函数的出现次数，内存占用与搜索深度相关，
+        不像广度优先搜索那样在队列中保存所有未完成的路径。
         
         Args:
             source: 源函数
@@ -206,25 +299,32 @@ class PathFinder:
         Yields:
             路径列表
         """
-        queue = deque([(source, [source])])
-        
-        while queue:
-            current, path = queue.popleft()
-            
-            if len(path) > max_depth:
-                continue
-            
-            if current == target and len(path) > 1:
-                yield path.copy()
-                continue
-            
-            # 探索相邻节点
-            for neighbor in self.call_graph.successors(current):
-                if len(path) < max_depth:
-                    # 允许重复访问，但限制路径中同一函数的出现次数
-                    if path.count(neighbor) < 2:  # 最多允许重复一次
-                        new_path = path + [neighbor]
-                        queue.append((neighbor, new_path))
+        if max_depth < 2:
+            return
+        
+        names, index, indptr, indices = self._get_adjacency()
+        start, goal = index[source], index[target]
+        
+        # 当前路径上各函数的出现次数
+        counts = bytearray(len(names))
+        counts[start] = 1
+        path = [start]
+        stack = [iter(indices[indptr[start]:indptr[start + 1]])]
+        
+        while stack:
+            for child in stack[-1]:
+                if counts[child] >= 2:  # 最多允许重复一次
+                    continue
+                if child == goal:
+                    yield [names[i] for i in path] + [target]
+                elif len(path) + 1 < max_depth:
+                    counts[child] += 1
+                    path.append(child)
+                    stack.append(iter(indices[indptr[child]:indptr[child + 1]]))
+                    break
+            else:
+                stack.pop()
+                counts[path.pop()] -= 1
     
     def _format_path(self, path: List[str]) -> Dict[str, Any]:
         """
@@ -306,14 +406,14 @@ class PathFinder:
         
         all_callers = set()
         caller_paths = {}
+        predecessors = self.call_graph.pred
         
-        def collect_callers(func: str, depth: int, path: List[str]):
-            if depth > max_depth:
-                return
-            
-            direct_callers = list(self.call_graph.predecessors(func))
-            
-            for caller in direct_callers:
+        # 从目标函数开始向上收集调用者（显式栈的深度优先搜索，每层保存剩余的调用者迭代器）
+        stack = [(iter(predecessors.get(target_function, ())), [target_function], 0)]
+        
+        while stack:
+            callers, path, depth = stack[-1]
+            for caller in callers:
                 if caller not in path:  # 避免环
                     new_path = [caller] + path
                     all_callers.add(caller)
@@ -323,19 +423,21 @@ class PathFinder:
                         caller_paths[caller] = []
                     caller_paths[caller].append(new_path)
                     
-                    # 递归查找
-                    collect_callers(caller, depth + 1, new_path)
-        
-        # 从目标函数开始收集调用者
-        collect_callers(target_function, 0, [target_function])
+                    # 继续向上查找
+                    if depth < max_depth:
+                        stack.append((iter(predecessors.get(caller, ())), new_path, depth + 1))
+                        break
+            else:
+                stack.pop()
         
         # 格式化结果
+        direct_callers = set(predecessors.get(target_function, ()))
         callers_info = []
         for caller in sorted(all_callers):
             caller_info = {
                 'function': caller,
                 'paths_to_target': caller_paths[caller],
-                'direct_caller': caller in self.call_graph.predecessors(target_function)
+                'direct_caller': caller in direct_callers
             }
             callers_info.append(caller_info)
         
@@ -8,7 +8,7 @@
 - 估算外部库函数的栈消耗
 """
 
-from typing import Dict, List, Set, Optional, Tuple, Any
+from typing import Dict, List, Set, Optional, Tuple, Any, Generator
 import logging
 import re
 from collections import defaultdict, deque
@@ -17,6 +17,13 @@ from .call_analyzer import CallAnalyzer
 from .disassembler import Disassembler
 
 
+# 跳转指令操作数中的十六进制目标地址
+_HEX_PATTERN = re.compile(r'0x([0-9a-fA-F]+)', re.IGNORECASE)
+
+# 调用链栈计算的生成器：yield (被调用函数, 路径)，接收并最终返回 (栈消耗, 路径)
+_StackPathGenerator = Generator[Tuple[str, List[str]], Tuple[int, List[str]], Tuple[int, List[str]]]
+
+
 class StackAnalysisError(Exception):
     """栈分析相关异常"""
     pass
@@ -112,10 +119,32 @@ class StackAnalyzer:
         else:
             self.arch_info = self.ARCH_STACK_INFO[self.architecture]
         
+        # 逐条指令匹配的正则表达式只编译一次
+        self._alloc_patterns = [re.compile(pattern, re.IGNORECASE)
+                                for pattern in self.arch_info['stack_alloc_patterns']]
+        stack_pointer = re.escape(self.arch_info['stack_pointer'][0])
+        # 查找 lea 指令计算目标地址的模式
+        # 格式1: lea reg, [rsp - 0xoffset]  (Capstone格式)
+        # 格式2: lea -0xoffset(%rsp), reg   (objdump格式)
+        self._lea_pattern = re.compile(
+            rf'lea\s+(\w+),\s*\[.*?{stack_pointer}.*?-\s*0x([0-9a-fA-F]+)\]|' +
+            rf'lea\s+-0x([0-9a-fA-F]+)\(.*?{stack_pointer}.*?\),\s*(\w+)',
+            re.IGNORECASE
+        )
+        # 查找 sub 指令分配栈空间的模式
+        # 格式1: sub rsp, 0xsize  (Capstone格式)
+        # 格式2: sub $0xsize, %rsp (objdump格式)
+        self._sub_pattern = re.compile(
+            rf'sub\s+{stack_pointer},\s*0x([0-9a-fA-F]+)|' +
+            rf'sub\s+\$0x([0-9a-fA-F]+),\s*{stack_pointer}',
+            re.IGNORECASE
+        )
+        
         # 栈分析数据
         self.function_stack_frames = {}  # 函数名 -> 栈帧大小
         self.function_max_stack = {}     # 函数名 -> 最大栈消耗（包含调用链）
         self.function_max_stack_paths = {}  # 函数名 -> 最大栈消耗时的调用路径
+        self._heavy_order = {}  # 排序方式 -> 按栈消耗降序排列的函数名，由 find_stack_heavy_functions 填充
         self.analyzed = False
         
     def analyze(self) -> None:
@@ -132,13 +161,17 @@ class StackAnalyzer:
         # 计算调用链栈消耗
         self._calculate_call_chain_stack()
         
+        self._heavy_order = {}
         self.analyzed = True
         logging.info("栈分析完成")
         
     def _analyze_stack_frames(self) -> None:
         """分析每个函数的本地栈帧大小"""
-        functions = self.call_analyzer.elf_parser.get_functions()
-        code_sections = self.call_analyzer.elf_parser.get_text_sections()
+        elf_parser = self.call_analyzer.elf_parser
+        functions = elf_parser.get_functions()
+        
+        # (地址, 大小) -> 栈帧大小，同一段代码的多个符号别名只反汇编一次
+        frame_sizes = {}
         
         for function in functions:
             func_name = function['name']
@@ -149,19 +182,20 @@ class StackAnalyzer:
                 self.function_stack_frames[func_name] = 0
                 continue
             
+            code_key = (func_addr, func_size)
+            if code_key in frame_sizes:
+                self.function_stack_frames[func_name] = frame_sizes[code_key]
+                continue
+            
             # 找到包含此函数的代码段
             section_data = None
             section_base = 0
             
-            for section in code_sections:
-                section_start = section['addr']
-                section_end = section_start + section['size']
-                
-                if section_start <= func_addr < section_end:
-                    # 从ELF文件中读取段数据
-                    section_data = self.call_analyzer.elf_parser.get_section_data(section['name'])
-                    section_base = section_start
-                    break
+            section = elf_parser.get_text_section_by_address(func_addr)
+            if section is not None:
+                # 从ELF文件中读取段数据
+                section_data = elf_parser.get_section_view(section['name'])
+                section_base = section['addr']
             
             if section_data is None:
                 self.function_stack_frames[func_name] = 0
@@ -172,14 +206,16 @@ class StackAnalyzer:
                 stack_frame_size = self._analyze_function_stack_frame(
                     function, section_data, section_base
                 )
-                self.function_stack_frames[func_name] = stack_frame_size
             except Exception as e:
                 logging.warning(f"分析函数 {func_name} 栈帧时出错: {e}")
-                self.function_stack_frames[func_name] = 0
+                stack_frame_size = 0
+            
+            frame_sizes[code_key] = stack_frame_size
+            self.function_stack_frames[func_name] = stack_frame_size
     
     def _analyze_function_stack_frame(self, 
                                      function: Dict[str, Any], 
-                                     section_data: bytes, 
+                                     section_data: memoryview, 
                                      section_base: int) -> int:
         """
         分析单个函数的栈帧大小（支持循环分配栈）
@@ -249,11 +285,11 @@ class StackAnalyzer:
             
             for insn in instructions[:analysis_limit]:
                 mnemonic = insn['mnemonic'].lower()
-                op_str = insn['op_str'].lower()
+                insn_text = f"{mnemonic} {insn['op_str'].lower()}"
                 
                 # 检查栈分配指令
-                for pattern in self.arch_info['stack_alloc_patterns']:
-                    match = re.search(pattern, f"{mnemonic} {op_str}", re.IGNORECASE)
+                for pattern in self._alloc_patterns:
+                    match = pattern.search(insn_text)
                     if match:
                         try:
                             # 提取分配的字节数
@@ -295,26 +331,8 @@ class StackAnalyzer:
         Returns:
             循环分配的栈空间大小（字节），如果未检测到则返回0
         """
-        stack_pointer = self.arch_info['stack_pointer'][0]
-        frame_pointer = self.arch_info['frame_pointer'][0]
-        
-        # 查找 lea 指令计算目标地址的模式
-        # 格式1: lea reg, [rsp - 0xoffset]  (Capstone格式)
-        # 格式2: lea -0xoffset(%rsp), reg   (objdump格式)
-        lea_pattern = re.compile(
-            rf'lea\s+(\w+),\s*\[.*?{re.escape(stack_pointer)}.*?-\s*0x([0-9a-fA-F]+)\]|' +
-            rf'lea\s+-0x([0-9a-fA-F]+)\(.*?{re.escape(stack_pointer)}.*?\),\s*(\w+)',
-            re.IGNORECASE
-        )
-        
-        # 查找 sub 指令分配栈空间的模式
-        # 格式1: sub rsp, 0xsize  (Capstone格式)
-        # 格式2: sub $0xsize, %rsp (objdump格式)
-        sub_pattern = re.compile(
-            rf'sub\s+{re.escape(stack_pointer)},\s*0x([0-9a-fA-F]+)|' +
-            rf'sub\s+\$0x([0-9a-fA-F]+),\s*{re.escape(stack_pointer)}',
-            re.IGNORECASE
-        )
+        lea_pattern = self._lea_pattern
+        sub_pattern = self._sub_pattern
         
         for i, insn in enumerate(instructions):
             mnemonic = insn['mnemonic'].lower()
@@ -369,7 +387,7 @@ class StackAnalyzer:
                                     jump_target = None
                                     
                                     # 方法1: 从跳转目标地址解析（0x格式）
-                                    jump_target_match = re.search(r'0x([0-9a-fA-F]+)', jump_op_str, re.IGNORECASE)
+                                    jump_target_match = _HEX_PATTERN.search(jump_op_str)
                                     if jump_target_match:
                                         jump_target = int(jump_target_match.group(1), 16)
                                     else:
@@ -426,7 +444,10 @@ class StackAnalyzer:
         visited = set()
         calculating = set()  # 正在计算的函数（用于检测递归）
         
-        def calculate_max_stack_with_path(func_name: str, current_path: List[str] = None) -> Tuple[int, List[str]]:
+        # 每次"递归调用"写作 yield (被调用函数, 路径)，由下方的显式栈驱动执行，
+        # 调用链深度不受 Python 递归深度限制
+        def calculate_max_stack_with_path(func_name: str,
+                                          current_path: List[str] = None) -> _StackPathGenerator:
             if current_path is None:
                 current_path = []
             
@@ -466,7 +487,7 @@ class StackAnalyzer:
                                 callee_path = [callee]
                         else:
                             # 如果还没有计算过，使用空路径来计算（避免循环检测）
-                            callee_stack, callee_path = calculate_max_stack_with_path(
+                            callee_stack, callee_path = yield (
                                 callee, []  # 使用空路径，避免循环检测
                             )
                         
@@ -547,7 +568,7 @@ class StackAnalyzer:
                         if func_name in self.function_max_stack:
                             del self.function_max_stack[func_name]
                         # 重新计算
-                        cached_stack, cached_path = calculate_max_stack_with_path(
+                        cached_stack, cached_path = yield (
                             func_name, []  # 使用空路径重新计算
                         )
                 else:
@@ -555,7 +576,7 @@ class StackAnalyzer:
                     visited.discard(func_name)
                     calculating.discard(func_name)
                     # 重新计算
-                    cached_stack, cached_path = calculate_max_stack_with_path(
+                    cached_stack, cached_path = yield (
                         func_name, []  # 使用空路径重新计算
                     )
                 
@@ -575,11 +596,10 @@ class StackAnalyzer:
             
             # 检查所有被调用的函数
             if func_name in call_graph:
+                # 构建新的路径，包含当前函数（只读，所有被调用函数共用一份）
+                new_path = current_path + [func_name]
                 for callee in call_graph.successors(func_name):
-                    # 构建新的路径，包含当前函数
-                    new_path = current_path + [func_name]
-                    
-                    callee_stack, callee_path = calculate_max_stack_with_path(
+                    callee_stack, callee_path = yield (
                         callee, new_path
                     )
                     
@@ -621,7 +641,46 @@ class StackAnalyzer:
         # 计算所有函数的栈消耗和路径
         for func_name in call_graph.nodes():
             if func_name not in visited:
-                calculate_max_stack_with_path(func_name)
+                stack = [calculate_max_stack_with_path(func_name)]
+                result = None
+                while stack:
+                    try:
+                        callee, path = stack[-1].send(result)
+                    except StopIteration as finished:
+                        stack.pop()
+                        result = finished.value
+                    else:
+                        stack.append(calculate_max_stack_with_path(callee, path))
+                        result = None
+    
+    def get_analysis_state(self) -> Dict[str, Any]:
+        """
+        获取可序列化的栈分析结果（用于磁盘缓存）
+        
+        Returns:
+            包含栈帧大小、最大栈消耗及其路径的字典
+        """
+        if not self.analyzed:
+            self.analyze()
+        
+        return {
+            'function_stack_frames': self.function_stack_frames,
+            'function_max_stack': self.function_max_stack,
+            'function_max_stack_paths': self.function_max_stack_paths
+        }
+    
+    def load_analysis_state(self, state: Dict[str, Any]) -> None:
+        """
+        从缓存的栈分析结果恢复状态
+        
+        Args:
+            state: get_analysis_state() 返回的字典
+        """
+        self.function_stack_frames = state['function_stack_frames']
+        self.function_max_stack = state['function_max_stack']
+        self.function_max_stack_paths = state['function_max_stack_paths']
+        self._heavy_order = {}
+        self.analyzed = True
     
     def get_function_stack_info(self, function_name: str) -> Dict[str, Any]:
         """
@@ -636,7 +695,7 @@ class StackAnalyzer:
         if not self.analyzed:
             self.analyze()
         
-        if function_name not in self.call_analyzer.call_graph:
+        if not self.call_analyzer.has_function(function_name):
             return {
                 'function': function_name,
                 'error': f"函数 '{function_name}' 不存在",
@@ -821,6 +880,10 @@ class StackAnalyzer:
             'stack_alignment': self.arch_info['alignment']
         }
     
+    def _max_stack_of(self, func_name: str) -> int:
+        """按总栈消耗排序的键，未计算的函数视为 0"""
+        return self.function_max_stack.get(func_name, 0)
+    
     def find_stack_heavy_functions(self, limit: int = 10, 
                                   sort_by: str = 'total') -> List[Dict[str, Any]]:
         """
@@ -836,9 +899,21 @@ class StackAnalyzer:
         if not self.analyzed:
             self.analyze()
         
+        # 每种排序方式只完整排序一次，之后不同的 limit 直接截取；只为截取的函数构建结果
+        sort_by = 'local' if sort_by == 'local' else 'total'
+        order = self._heavy_order.get(sort_by)
+        if order is None:
+            if sort_by == 'local':
+                sort_key = self.function_stack_frames.__getitem__
+            else:
+                sort_key = self._max_stack_of
+            order = sorted(self.function_stack_frames, key=sort_key, reverse=True)
+            self._heavy_order[sort_by] = order
+        top_functions = order[:max(limit, 0)]
+        
         functions = []
         
-        for func_name in self.function_stack_frames:
+        for func_name in top_functions:
             local_stack = self.function_stack_frames.get(func_name, 0)
             total_stack = self.function_max_stack.get(func_name, 0)
             call_path = self.function_max_stack_paths.get(func_name, [])
@@ -851,10 +926,4 @@ class StackAnalyzer:
                 'stack_ratio': total_stack / local_stack if local_stack > 0 else 0
             })
         
-        # 排序
-        if sort_by == 'local':
-            functions.sort(key=lambda x: x['local_stack_frame'], reverse=True)
-        else:  # total
-            functions.sort(key=lambda x: x['max_total_stack'], reverse=True)
-        
-        return functions[:limit]
+        return functions
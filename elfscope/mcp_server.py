@@ -300,14 +300,13 @@ def elfscope_function(elf_file: str, function_name: str) -> dict:
         call_analyzer.analyze()
         
         # 检查函数是否存在
-        if function_name not in call_analyzer.call_graph:
+        if not call_analyzer.has_function(function_name):
             # 查找相似函数名
-            all_functions = list(call_analyzer.call_graph.nodes)
-            similar_functions = [f for f in all_functions if function_name.lower() in f.lower()]
+            similar_functions = call_analyzer.find_similar_functions(function_name, limit=5)
             
             error_msg = f"函数 '{function_name}' 不存在"
             if similar_functions:
-                error_msg += f"。可能的函数名: {', '.join(similar_functions[:5])}"
+                error_msg += f"。可能的函数名: {', '.join(similar_functions)}"
             
             raise ValueError(error_msg)
         
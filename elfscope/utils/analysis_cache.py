@@ -0,0 +1,222 @@
+"""
+分析结果磁盘缓存模块
+
+该模块提供调用关系和栈分析结果的持久化缓存，包括：
+- 按文件内容哈希和工具版本生成缓存键
+- 缓存命中时跳过反汇编和调用图构建
+- 原子写入和按数量淘汰旧缓存
+"""
+
+import os
+import gzip
+import mmap
+import pickle
+import hashlib
+import logging
+import tempfile
+from typing import Callable, Dict, Tuple, Any, Optional
+
+from .. import __version__
+from .cache_files import evict_old_entries
+from ..core.elf_parser import ElfParser
+from ..core.call_analyzer import CallAnalyzer
+from ..core.stack_analyzer import StackAnalyzer
+
+
+DEFAULT_CACHE_DIR = "~/.cache/elfscope"
+
+# 超过该大小的缓存内容使用 gzip 压缩
+GZIP_THRESHOLD = 1024 * 1024
+
+# 分析结果缓存文件的后缀，与基本信息缓存（.info.txt）分开淘汰
+CACHE_SUFFIX = ".pkl"
+
+# 缓存目录中保留的最大条目数（按写入时间先进先出淘汰）
+DEFAULT_MAX_ENTRIES = 16
+
+
+def hash_file(filepath: str) -> str:
+    """
+    计算文件内容的 SHA-256 哈希
+    
+    Args:
+        filepath: 文件路径
+    
+    Returns:
+        十六进制哈希字符串
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest.update(mm)
+        except ValueError:
+            # 空文件无法 mmap
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def get_cache_path(filepath: str, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """
+    获取文件对应的缓存路径
+    
+    Args:
+        filepath: ELF 文件路径
+        cache_dir: 缓存目录
+    
+    Returns:
+        缓存文件路径
+    """
+    cache_dir = os.path.expanduser(cache_dir)
+    return os.path.join(cache_dir, f"{hash_file(filepath)}-{__version__}{CACHE_SUFFIX}")
+
+
+def _read_cache(cache_path: str) -> Optional[Dict[str, Any]]:
+    """读取缓存文件，不存在或损坏时返回 None"""
+    if not os.path.exists(cache_path):
+        return None
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            payload = f.read()
+        if payload[:2] == b'\x1f\x8b':
+            payload = gzip.decompress(payload)
+        return pickle.loads(payload)
+    except Exception as e:
+        logging.warning(f"读取缓存 {cache_path} 失败，将重新分析: {e}")
+        return None
+
+
+def _write_cache(cache_path: str, state: Dict[str, Any], max_entries: int) -> None:
+    """原子写入缓存文件并淘汰多余的旧缓存"""
+    cache_dir = os.path.dirname(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(payload) > GZIP_THRESHOLD:
+        payload = gzip.compress(payload)
+    
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    
+    evict_old_entries(cache_dir, CACHE_SUFFIX, max_entries)
+
+
+def load_or_analyze(filepath: str,
+                    cache_dir: str = DEFAULT_CACHE_DIR,
+                    max_entries: int = DEFAULT_MAX_ENTRIES) -> Tuple[CallAnalyzer, StackAnalyzer]:
+    """
+    加载缓存的分析结果，缓存未命中时执行完整分析并写入缓存
+    
+    缓存键为 (文件内容 SHA-256, ElfScope 版本)，文件内容变化后自动失效。
+    
+    Args:
+        filepath: ELF 文件路径
+        cache_dir: 缓存目录
+        max_entries: 缓存目录中保留的最大条目数
+    
+    Returns:
+        (已完成分析的调用关系分析器, 已完成分析的栈分析器)
+    """
+    cache_path = get_cache_path(filepath, cache_dir)
+    
+    elf_parser = ElfParser(filepath)
+    call_analyzer = CallAnalyzer(elf_parser)
+    stack_analyzer = StackAnalyzer(call_analyzer)
+    
+    state = _read_cache(cache_path)
+    if state is not None:
+        logging.info(f"使用缓存的分析结果: {cache_path}")
+        call_analyzer.load_analysis_state(state['call_analysis'])
+        if 'stack_analysis' in state:
+            stack_analyzer.load_analysis_state(state['stack_analysis'])
+            return call_analyzer, stack_analyzer
+    
+    state = {
+        'call_analysis': call_analyzer.get_analysis_state(),
+        'stack_analysis': stack_analyzer.get_analysis_state()
+    }
+    
+    try:
+        _write_cache(cache_path, state, max_entries)
+    except Exception as e:
+        logging.warning(f"写入缓存 {cache_path} 失败: {e}")
+    
+    return call_analyzer, stack_analyzer
+
+
+def _load_cached_calls(filepath: str,
+                       cache_path: str) -> Optional[Tuple[ElfParser, CallAnalyzer]]:
+    """从缓存文件恢复调用关系分析结果，未命中时返回 None"""
+    state = _read_cache(cache_path)
+    if state is None:
+        return None
+    
+    logging.info(f"使用缓存的分析结果: {cache_path}")
+    elf_parser = ElfParser(filepath)
+    call_analyzer = CallAnalyzer(elf_parser)
+    call_analyzer.load_analysis_state(state['call_analysis'])
+    return elf_parser, call_analyzer
+
+
+def load_cached_calls(filepath: str,
+                      cache_dir: str = DEFAULT_CACHE_DIR
+                      ) -> Optional[Tuple[ElfParser, CallAnalyzer]]:
+    """
+    只加载缓存的调用关系分析结果，缓存未命中时不执行分析
+    
+    Args:
+        filepath: ELF 文件路径
+        cache_dir: 缓存目录
+    
+    Returns:
+        (ELF解析器, 已完成分析的调用关系分析器)，缓存未命中时返回 None
+    """
+    return _load_cached_calls(filepath, get_cache_path(filepath, cache_dir))
+
+
+def load_or_analyze_calls(filepath: str,
+                          cache_dir: str = DEFAULT_CACHE_DIR,
+                          max_entries: int = DEFAULT_MAX_ENTRIES,
+                          jobs: int = 1,
+                          progress: Optional[Callable[[int, int], None]] = None
+                          ) -> Tuple[ElfParser, CallAnalyzer]:
+    """
+    加载缓存的调用关系分析结果，缓存未命中时只执行调用关系分析并写入缓存
+    
+    与 load_or_analyze 共用同一缓存文件；仅含调用关系的缓存条目在之后
+    调用 load_or_analyze 时补全栈分析结果。
+    
+    Args:
+        filepath: ELF 文件路径
+        cache_dir: 缓存目录
+        max_entries: 缓存目录中保留的最大条目数
+        jobs: 缓存未命中时并行分析的进程数
+        progress: 缓存未命中时传给 CallAnalyzer.analyze 的进度回调
+    
+    Returns:
+        (ELF解析器, 已完成分析的调用关系分析器)
+    """
+    cache_path = get_cache_path(filepath, cache_dir)
+    
+    cached = _load_cached_calls(filepath, cache_path)
+    if cached is not None:
+        return cached
+    
+    elf_parser = ElfParser(filepath)
+    call_analyzer = CallAnalyzer(elf_parser)
+    call_analyzer.analyze(jobs=jobs, progress=progress)
+    
+    try:
+        _write_cache(cache_path, {'call_analysis': call_analyzer.get_analysis_state()}, max_entries)
+    except Exception as e:
+        logging.warning(f"写入缓存 {cache_path} 失败: {e}")
+    
+    return elf_parser, call_analyzer
@@ -0,0 +1,32 @@
+"""
+缓存目录文件管理模块
+
+分析结果缓存和基本信息缓存共用同一缓存目录，按文件后缀分别淘汰。
+本模块不依赖 capstone/networkx。
+"""
+
+import os
+import logging
+
+
+def evict_old_entries(cache_dir: str, suffix: str, max_entries: int) -> None:
+    """
+    只保留最近写入的 max_entries 个以 suffix 结尾的缓存文件
+    
+    Args:
+        cache_dir: 缓存目录
+        suffix: 参与淘汰的缓存文件后缀
+        max_entries: 保留的最大条目数
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(suffix):
+            path = os.path.join(cache_dir, name)
+            entries.append((os.path.getmtime(path), path))
+    
+    entries.sort(reverse=True)
+    for _, path in entries[max_entries:]:
+        try:
+            os.unlink(path)
+        except OSError as e:
+            logging.debug(f"删除旧缓存 {path} 失败: {e}")
@@ -0,0 +1,95 @@
+"""
+ELF 文件基本信息缓存模块
+
+info 命令的输出只取决于文件本身，按 (文件路径, 修改时间, 大小, ElfScope 版本)
+缓存输出文本，命中时无需打开和解析 ELF 文件。本模块不依赖 capstone/networkx。
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+from typing import Optional
+
+from .. import __version__
+from .cache_files import evict_old_entries
+
+
+DEFAULT_CACHE_DIR = "~/.cache/elfscope"
+
+# 基本信息缓存文件的后缀，与分析结果缓存（.pkl）分开淘汰
+INFO_SUFFIX = ".info.txt"
+
+# 缓存目录中保留的最大基本信息条目数
+DEFAULT_MAX_ENTRIES = 64
+
+
+def get_info_cache_path(filepath: str, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """
+    获取文件基本信息的缓存路径
+    
+    缓存键只使用文件状态而不读取文件内容，文件被修改后路径随之变化。
+    
+    Args:
+        filepath: ELF 文件路径
+        cache_dir: 缓存目录
+    
+    Returns:
+        缓存文件路径
+    """
+    stat = os.stat(filepath)
+    key = f"{os.path.abspath(filepath)}\0{stat.st_mtime_ns}\0{stat.st_size}\0{__version__}"
+    digest = hashlib.sha256(key.encode('utf-8', 'surrogateescape')).hexdigest()
+    return os.path.join(os.path.expanduser(cache_dir), digest + INFO_SUFFIX)
+
+
+def load_info_text(filepath: str, cache_dir: str = DEFAULT_CACHE_DIR) -> Optional[str]:
+    """
+    读取缓存的基本信息文本
+    
+    Args:
+        filepath: ELF 文件路径
+        cache_dir: 缓存目录
+    
+    Returns:
+        缓存的文本，未命中时返回 None
+    """
+    try:
+        with open(get_info_cache_path(filepath, cache_dir), 'r', encoding='utf-8') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def store_info_text(filepath: str,
+                    text: str,
+                    cache_dir: str = DEFAULT_CACHE_DIR,
+                    max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+    """
+    原子写入基本信息文本并淘汰多余的旧条目，失败时只记录警告
+    
+    Args:
+        filepath: ELF 文件路径
+        text: 要缓存的文本
+        cache_dir: 缓存目录
+        max_entries: 缓存目录中保留的最大基本信息条目数
+    """
+    try:
+        cache_path = get_info_cache_path(filepath, cache_dir)
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        
+        evict_old_entries(cache_dir, INFO_SUFFIX, max_entries)
+    except Exception as e:
+        logging.warning(f"写入基本信息缓存失败: {e}")
+
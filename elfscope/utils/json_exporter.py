@@ -9,15 +9,35 @@ JSON 导出模块
 
 import json
 import os
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 import logging
 
-from ..core.elf_parser import ElfParser
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 from ..core.call_analyzer import CallAnalyzer
 from ..core.path_finder import PathFinder
 
 
+class _StreamObject:
+    """流式写出的 JSON 对象，items 为 (键, 值) 的可迭代对象，值可以是嵌套的流式容器"""
+    
+    def __init__(self, items: Iterable[Tuple[str, Any]]):
+        self.items = items
+
+
+class _StreamArray:
+    """流式写出的 JSON 数组，元素逐个序列化"""
+    
+    def __init__(self, items: Iterable[Any]):
+        self.items = items
+
+
 class JsonExporter:
     """
     JSON 导出器
@@ -29,12 +49,15 @@ class JsonExporter:
         """初始化导出器"""
         self.default_indent = 2
         self.ensure_ascii = False
+        # 最近一次 create_summary_report 使用的统计信息，供调用方复用
+        self.last_statistics: Optional[Dict[str, Any]] = None
     
     def export_call_relationships(self, 
                                 call_analyzer: CallAnalyzer, 
                                 output_file: str,
                                 include_statistics: bool = True,
-                                include_function_details: bool = True) -> bool:
+                                include_function_details: bool = True,
+                                stream: bool = False) -> bool:
         """
         导出函数调用关系到 JSON 文件
         
@@ -43,11 +66,28 @@ class JsonExporter:
             output_file: 输出文件路径
             include_statistics: 是否包含统计信息
             include_function_details: 是否包含详细函数信息
+            stream: 是否逐条流式写出函数和调用关系（每条记录一行，内存占用与单条记录相当）
             
         Returns:
             是否导出成功
         """
         try:
+            if stream:
+                return self._write_json_stream(_StreamObject([
+                    ('metadata', {
+                        'tool_name': 'ElfScope',
+                        'version': '1.0.0',
+                        'export_time': self._current_timestamp(),
+                        'elf_file': call_analyzer.elf_parser.filepath,
+                        'architecture': call_analyzer.architecture
+                    }),
+                    ('functions', self._stream_functions(call_analyzer) if include_function_details
+                     else {}),
+                    ('call_relationships', self._stream_call_relationships(call_analyzer)),
+                    *([('statistics', call_analyzer.get_statistics())]
+                      if include_statistics else [])
+                ]), output_file)
+            
             # 获取调用关系数据
             relationships = call_analyzer.get_call_relationships()
             
@@ -56,7 +96,7 @@ class JsonExporter:
                 'metadata': {
                     'tool_name': 'ElfScope',
                     'version': '1.0.0',
-                    'export_time': datetime.now().isoformat(),
+                    'export_time': self._current_timestamp(),
                     'elf_file': call_analyzer.elf_parser.filepath,
                     'architecture': call_analyzer.architecture
                 },
@@ -88,7 +128,8 @@ class JsonExporter:
                          output_file: str,
                          source_function: Optional[str] = None,
                          max_depth: int = 10,
-                         include_cycles: bool = False) -> bool:
+                         include_cycles: bool = False,
+                         stream: bool = False) -> bool:
         """
         导出调用路径到 JSON 文件
         
@@ -99,11 +140,36 @@ class JsonExporter:
             output_file: 输出文件路径
             max_depth: 最大搜索深度
             include_cycles: 是否包含环
+            stream: 是否在找到每条路径后立即写出（每条路径一行，内存占用与搜索深度相关）
             
         Returns:
             是否导出成功
         """
         try:
+            if stream and target_function in path_finder.call_graph:
+                metadata = {
+                    'tool_name': 'ElfScope',
+                    'version': '1.0.0',
+                    'export_time': self._current_timestamp(),
+                    'elf_file': path_finder.call_analyzer.elf_parser.filepath,
+                    'architecture': path_finder.call_analyzer.architecture,
+                    'query': {
+                        'target_function': target_function,
+                        'source_function': source_function,
+                        'max_depth': max_depth,
+                        'include_cycles': include_cycles
+                    }
+                }
+                fields = [
+                    ('metadata', metadata),
+                    ('path_analysis', _StreamObject(self._stream_path_analysis(
+                        path_finder, target_function, source_function, max_depth, include_cycles)))
+                ]
+                if not source_function:
+                    fields.append(('caller_analysis',
+                                   path_finder.find_all_callers(target_function, max_depth)))
+                return self._write_json_stream(_StreamObject(fields), output_file)
+            
             # 查找路径
             path_result = path_finder.find_paths(
                 target_function=target_function,
@@ -117,7 +183,7 @@ class JsonExporter:
                 'metadata': {
                     'tool_name': 'ElfScope',
                     'version': '1.0.0',
-                    'export_time': datetime.now().isoformat(),
+                    'export_time': self._current_timestamp(),
                     'elf_file': path_finder.call_analyzer.elf_parser.filepath,
                     'architecture': path_finder.call_analyzer.architecture,
                     'query': {
@@ -143,21 +209,43 @@ class JsonExporter:
             return False
     
     def export_complete_analysis(self, 
-                               elf_parser: ElfParser,
                                call_analyzer: CallAnalyzer,
-                               output_file: str) -> bool:
+                               output_file: str,
+                               stream: bool = False) -> bool:
         """
         导出完整的分析结果
         
+        ELF 文件信息取自 call_analyzer.elf_parser。
+        
         Args:
-            elf_parser: ELF解析器
             call_analyzer: 调用关系分析器
             output_file: 输出文件路径
+            stream: 是否逐条流式写出函数和调用关系（每条记录一行，内存占用与单条记录相当）
             
         Returns:
             是否导出成功
         """
+        elf_parser = call_analyzer.elf_parser
+        
         try:
+            if stream:
+                elf_info = dict(elf_parser.get_file_info())
+                elf_info['text_sections'] = elf_parser.get_text_sections()
+                return self._write_json_stream(_StreamObject([
+                    ('metadata', {
+                        'tool_name': 'ElfScope',
+                        'version': '1.0.0',
+                        'export_time': self._current_timestamp(),
+                        'export_type': 'complete_analysis'
+                    }),
+                    ('elf_info', elf_info),
+                    ('analysis', _StreamObject([
+                        ('functions', self._stream_functions(call_analyzer)),
+                        ('call_relationships', self._stream_call_relationships(call_analyzer)),
+                        ('statistics', call_analyzer.get_statistics())
+                    ]))
+                ]), output_file)
+            
             # 获取各种分析数据
             relationships = call_analyzer.get_call_relationships()
             statistics = call_analyzer.get_statistics()
@@ -168,7 +256,7 @@ class JsonExporter:
                 'metadata': {
                     'tool_name': 'ElfScope',
                     'version': '1.0.0',
-                    'export_time': datetime.now().isoformat(),
+                    'export_time': self._current_timestamp(),
                     'export_type': 'complete_analysis'
                 },
                 'elf_info': file_info,
@@ -200,19 +288,19 @@ class JsonExporter:
         Returns:
             格式化后的函数信息
         """
-        formatted = {}
-        
-        for name, func_data in functions.items():
-            formatted[name] = {
-                'name': name,
-                'address': hex(func_data.get('value', 0)),
-                'size': func_data.get('size', 0),
-                'type': func_data.get('type', 'unknown'),
-                'visibility': func_data.get('visibility', 'default'),
-                'external': func_data.get('external', False)
-            }
-        
-        return formatted
+        return {name: self._format_function(name, func_data)
+                for name, func_data in functions.items()}
+    
+    def _format_function(self, name: str, func_data: Dict[str, Any]) -> Dict[str, Any]:
+        """格式化单个函数信息"""
+        return {
+            'name': name,
+            'address': hex(func_data.get('value', 0)),
+            'size': func_data.get('size', 0),
+            'type': func_data.get('type', 'unknown'),
+            'visibility': func_data.get('visibility', 'default'),
+            'external': func_data.get('external', False)
+        }
     
     def _format_call_relationships(self, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -224,26 +312,84 @@ class JsonExporter:
         Returns:
             格式化后的调用关系信息
         """
-        formatted = []
+        return [self._format_call(call) for call in calls]
+    
+    def _format_call(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        """格式化单条调用关系"""
+        formatted_call = {
+            'from_function': call['from_function'],
+            'to_function': call['to_function'],
+            'from_address': hex(call['from_address']),
+            'instruction': call['instruction'],
+            'type': call['type']
+        }
         
-        for call in calls:
-            formatted_call = {
-                'from_function': call['from_function'],
-                'to_function': call['to_function'],
-                'from_address': hex(call['from_address']),
-                'instruction': call['instruction'],
-                'type': call['type']
-            }
-            
-            if 'to_address' in call:
-                formatted_call['to_address'] = hex(call['to_address'])
-            
-            if call.get('external', False):
-                formatted_call['external'] = True
-            
-            formatted.append(formatted_call)
+        if 'to_address' in call:
+            formatted_call['to_address'] = hex(call['to_address'])
+        
+        if call.get('external', False):
+            formatted_call['external'] = True
+        
+        return formatted_call
+    
+    def _stream_path_analysis(self,
+                              path_finder: PathFinder,
+                              target_function: str,
+                              source_function: Optional[str],
+                              max_depth: int,
+                              include_cycles: bool) -> Iterable[Tuple[str, Any]]:
+        """
+        生成与 PathFinder.find_paths 结构相同的路径分析字段
+        
+        路径在找到时逐条格式化写出，统计信息在所有路径写出后生成。
+        """
+        depths = []
+        
+        def formatted_paths():
+            for path in path_finder.iter_paths(target_function, source_function, max_depth,
+                                               include_cycles):
+                depths.append(len(path) - 1)
+                yield path_finder._format_path(path)
         
-        return formatted
+        yield 'target_function', target_function
+        yield 'source_function', source_function
+        yield 'paths', _StreamArray(formatted_paths())
+        yield 'statistics', {
+            'total_paths': len(depths),
+            'max_depth': max(depths) if depths else 0,
+            'min_depth': min(depths) if depths else float('inf'),
+            'average_depth': sum(depths) / len(depths) if depths else 0
+        }
+    
+    def _stream_functions(self, call_analyzer: CallAnalyzer) -> _StreamObject:
+        """按调用图节点逐个生成格式化的函数信息"""
+        if not call_analyzer.analyzed:
+            call_analyzer.analyze()
+        return _StreamObject((name, self._format_function(name, func_data))
+                             for name, func_data in call_analyzer.call_graph.nodes(data=True))
+    
+    def _stream_call_relationships(self, call_analyzer: CallAnalyzer) -> _StreamArray:
+        """按调用方逐条生成格式化的调用关系"""
+        if not call_analyzer.analyzed:
+            call_analyzer.analyze()
+        return _StreamArray(self._format_call(call)
+                            for calls in call_analyzer.function_calls.values()
+                            for call in calls)
+    
+    def _stream_view(self, value: Any) -> Any:
+        """
+        将已构建好的数据包装为流式容器
+        
+        含有列表或字典值的字典、含有容器元素的列表逐层展开为流式容器，
+        其余值（如单条指令、符号等扁平记录）作为一条记录整体序列化。
+        """
+        if isinstance(value, dict):
+            if any(isinstance(item, (dict, list)) for item in value.values()):
+                return _StreamObject((key, self._stream_view(item)) for key, item in value.items())
+        elif isinstance(value, list):
+            if any(isinstance(item, (dict, list)) for item in value):
+                return _StreamArray(self._stream_view(item) for item in value)
+        return value
     
     def _write_json_file(self, data: Dict[str, Any], output_file: str) -> bool:
         """
@@ -262,12 +408,18 @@ class JsonExporter:
             if output_dir and not os.path.exists(output_dir):
                 os.makedirs(output_dir, exist_ok=True)
             
-            # 写入JSON文件
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, 
-                         indent=self.default_indent,
-                         ensure_ascii=self.ensure_ascii,
-                         default=self._json_serializer)
+            # 优先使用 orjson 直接生成 UTF-8 字节，不可用时回退到标准库
+            payload = self._dump_with_orjson(data)
+            if payload is not None:
+                with open(output_file, 'wb') as f:
+                    f.write(payload)
+            else:
+                # json.dump 按片段逐个写出，使用较大的缓冲区合并成少量系统调用
+                with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    json.dump(data, f, 
+                             indent=self.default_indent,
+                             ensure_ascii=self.ensure_ascii,
+                             default=self._json_serializer)
             
             logging.info(f"成功导出到文件: {output_file}")
             return True
@@ -276,6 +428,107 @@ class JsonExporter:
             logging.error(f"写入JSON文件 {output_file} 时出错: {e}")
             return False
     
+    def _write_json_stream(self, root: _StreamObject, output_file: str) -> bool:
+        """
+        流式写入JSON文件
+        
+        流式容器中的元素逐个序列化并立即写出，每个元素独占一行，
+        峰值内存只与单个元素的大小相关。输出仍是一个完整的 JSON 文档。
+        
+        Args:
+            root: 顶层流式对象
+            output_file: 输出文件路径
+            
+        Returns:
+            是否写入成功
+        """
+        try:
+            output_dir = os.path.dirname(output_file)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir, exist_ok=True)
+            
+            with open(output_file, 'wb', buffering=1 << 20) as f:
+                self._write_stream_value(f, root)
+                f.write(b'\n')
+            
+            logging.info(f"成功导出到文件: {output_file}")
+            return True
+            
+        except Exception as e:
+            logging.error(f"写入JSON文件 {output_file} 时出错: {e}")
+            return False
+    
+    def _write_stream_value(self, f, value: Any) -> None:
+        """递归写出流式容器，普通值整体序列化"""
+        if isinstance(value, _StreamObject):
+            f.write(b'{')
+            separator = b'\n'
+            for key, item in value.items:
+                f.write(separator)
+                f.write(self._dumps_compact(str(key)))
+                f.write(b':')
+                self._write_stream_value(f, item)
+                separator = b',\n'
+            f.write(b'\n}')
+        elif isinstance(value, _StreamArray):
+            f.write(b'[')
+            separator = b'\n'
+            for item in value.items:
+                f.write(separator)
+                self._write_stream_value(f, item)
+                separator = b',\n'
+            f.write(b'\n]')
+        else:
+            f.write(self._dumps_compact(value))
+    
+    def _dumps_compact(self, value: Any) -> bytes:
+        """将单个值序列化为紧凑的 UTF-8 JSON 字节串"""
+        if ORJSON_AVAILABLE and not self.ensure_ascii:
+            try:
+                return orjson.dumps(value, default=self._json_serializer,
+                                    option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                pass
+        return json.dumps(value,
+                          ensure_ascii=self.ensure_ascii,
+                          separators=(',', ':'),
+                          default=self._json_serializer).encode('utf-8')
+    
+    def _dump_with_orjson(self, data: Dict[str, Any]) -> Optional[bytes]:
+        """
+        使用 orjson 序列化数据
+        
+        orjson 只支持 2 空格缩进且总是输出非 ASCII 字符，其他配置或
+        orjson 无法处理的数据（如超过 64 位的整数）返回 None，由调用方回退到标准库。
+        
+        Args:
+            data: 要序列化的数据
+            
+        Returns:
+            序列化后的字节串，无法使用 orjson 时返回 None
+        """
+        if not ORJSON_AVAILABLE or self.default_indent != 2 or self.ensure_ascii:
+            return None
+        
+        try:
+            return orjson.dumps(data,
+                                default=self._json_serializer,
+                                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError as e:
+            logging.debug(f"orjson 序列化失败，回退到标准库 json: {e}")
+            return None
+    
+    def _current_timestamp(self) -> str:
+        """
+        获取导出时间戳（UTC，ISO 8601 格式，精确到秒）
+        
+        每次导出只调用一次，同一份导出中的时间戳保持一致。
+        
+        Returns:
+            时间戳字符串
+        """
+        return datetime.now(timezone.utc).isoformat(timespec='seconds')
+    
     def _json_serializer(self, obj):
         """
         JSON序列化器，处理特殊类型
@@ -296,14 +549,14 @@ class JsonExporter:
             return str(obj)
     
     def create_summary_report(self, 
-                            elf_parser: ElfParser, 
                             call_analyzer: CallAnalyzer,
                             output_file: str) -> bool:
         """
         创建分析摘要报告
         
+        文件信息取自 call_analyzer.elf_parser，使用的统计信息保存在 last_statistics。
+        
         Args:
-            elf_parser: ELF解析器
             call_analyzer: 调用关系分析器
             output_file: 输出文件路径
             
@@ -311,8 +564,9 @@ class JsonExporter:
             是否创建成功
         """
         try:
-            file_info = elf_parser.get_file_info()
+            file_info = call_analyzer.elf_parser.get_file_info()
             statistics = call_analyzer.get_statistics()
+            self.last_statistics = statistics
             
             # 查找环
             cycles = call_analyzer.find_cycles()
@@ -322,7 +576,7 @@ class JsonExporter:
                 'metadata': {
                     'tool_name': 'ElfScope',
                     'version': '1.0.0',
-                    'report_time': datetime.now().isoformat(),
+                    'report_time': self._current_timestamp(),
                     'report_type': 'summary'
                 },
                 'file_summary': {
@@ -379,7 +633,8 @@ class JsonExporter:
     def export_function_details(self, 
                               call_analyzer: CallAnalyzer,
                               function_name: str,
-                              output_file: str) -> bool:
+                              output_file: str,
+                              function_info: Optional[Dict[str, Any]] = None) -> bool:
         """
         导出特定函数的详细信息
         
@@ -387,31 +642,40 @@ class JsonExporter:
             call_analyzer: 调用关系分析器
             function_name: 函数名
             output_file: 输出文件路径
+            function_info: CallAnalyzer.analyze_function() 的结果。给出时不依赖完整调用图，
+                          输出中不包含调用深度和可达性
             
         Returns:
             是否导出成功
         """
         try:
-            if function_name not in call_analyzer.call_graph:
-                logging.error(f"函数 '{function_name}' 不存在")
-                return False
-            
-            # 获取函数详细信息
-            callers = call_analyzer.get_callers(function_name)
-            callees = call_analyzer.get_callees(function_name)
-            is_recursive = call_analyzer.is_recursive_function(function_name)
-            depth = call_analyzer.get_function_depth(function_name)
-            
-            # 创建路径查找器
-            path_finder = PathFinder(call_analyzer)
-            reachability = path_finder.analyze_function_reachability(function_name)
+            if function_info is not None:
+                callers = function_info['callers']
+                callees = function_info['callees']
+                is_recursive = function_info['is_recursive']
+                depth = None
+                reachability = None
+            else:
+                if function_name not in call_analyzer.call_graph:
+                    logging.error(f"函数 '{function_name}' 不存在")
+                    return False
+                
+                # 获取函数详细信息
+                callers = call_analyzer.get_callers(function_name)
+                callees = call_analyzer.get_callees(function_name)
+                is_recursive = call_analyzer.is_recursive_function(function_name)
+                depth = call_analyzer.get_function_depth(function_name)
+                
+                # 创建路径查找器
+                path_finder = PathFinder(call_analyzer)
+                reachability = path_finder.analyze_function_reachability(function_name)
             
             # 构建详细信息
             details = {
                 'metadata': {
                     'tool_name': 'ElfScope',
                     'version': '1.0.0',
-                    'export_time': datetime.now().isoformat(),
+                    'export_time': self._current_timestamp(),
                     'elf_file': call_analyzer.elf_parser.filepath,
                     'target_function': function_name
                 },
@@ -436,9 +700,12 @@ class JsonExporter:
             }
             
             # 添加具体调用详情
-            call_details = {}
-            for callee in callees:
-                call_details[callee] = call_analyzer.get_call_details(function_name, callee)
+            if function_info is not None:
+                call_details = function_info['call_details']
+            else:
+                call_details = {}
+                for callee in callees:
+                    call_details[callee] = call_analyzer.get_call_details(function_name, callee)
             
             details['function_details']['call_details'] = call_details
             
@@ -448,18 +715,21 @@ class JsonExporter:
             logging.error(f"导出函数详情时出错: {e}")
             return False
     
-    def export_data(self, data: Dict[str, Any], output_file: str) -> bool:
+    def export_data(self, data: Dict[str, Any], output_file: str, stream: bool = False) -> bool:
         """
         导出任意数据到 JSON 文件
         
         Args:
             data: 要导出的数据
             output_file: 输出文件路径
+            stream: 是否流式写出（不含嵌套容器的字典等记录各占一行，不在内存中生成整份 JSON）
             
         Returns:
             导出是否成功
         """
         try:
+            if stream:
+                return self._write_json_stream(self._stream_view(data), output_file)
             return self._write_json_file(data, output_file)
         except Exception as e:
             logging.error(f"导出数据时出错: {e}")
@@ -34,6 +34,9 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        "fast": ["orjson>=3.6"],
+    },
     entry_points={
         "console_scripts": [
             "elfscope=elfscope.cli:main",
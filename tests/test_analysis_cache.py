@@ -0,0 +1,118 @@
+"""
+分析结果缓存测试用例
+"""
+
+import os
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from elfscope import __version__
+from elfscope.utils import analysis_cache
+from elfscope.utils.analysis_cache import hash_file, get_cache_path
+from elfscope.utils.cache_files import evict_old_entries
+
+
+class TestAnalysisCache:
+    """分析结果缓存测试类"""
+
+    def test_hash_file_matches_content(self, tmp_path):
+        """测试相同内容得到相同哈希，不同内容得到不同哈希"""
+        file_a = tmp_path / "a.bin"
+        file_b = tmp_path / "b.bin"
+        file_c = tmp_path / "c.bin"
+        file_a.write_bytes(b'\x7fELF' + b'\x00' * 60)
+        file_b.write_bytes(b'\x7fELF' + b'\x00' * 60)
+        file_c.write_bytes(b'\x7fELF' + b'\x01' * 60)
+
+        assert hash_file(str(file_a)) == hash_file(str(file_b))
+        assert hash_file(str(file_a)) != hash_file(str(file_c))
+
+    def test_hash_empty_file(self, tmp_path):
+        """测试空文件也能计算哈希"""
+        empty = tmp_path / "empty.bin"
+        empty.write_bytes(b'')
+
+        assert len(hash_file(str(empty))) == 64
+
+    def test_cache_path_contains_version(self, tmp_path):
+        """测试缓存路径包含内容哈希和版本号"""
+        elf = tmp_path / "prog"
+        elf.write_bytes(b'\x7fELF')
+
+        cache_path = get_cache_path(str(elf), str(tmp_path / "cache"))
+
+        assert os.path.dirname(cache_path) == str(tmp_path / "cache")
+        assert os.path.basename(cache_path) == f"{hash_file(str(elf))}-{__version__}.pkl"
+
+    @pytest.mark.parametrize("size", [16, analysis_cache.GZIP_THRESHOLD + 16])
+    def test_write_and_read_roundtrip(self, tmp_path, size):
+        """测试缓存写入后可以原样读回（包括压缩的大缓存）"""
+        cache_path = str(tmp_path / "cache" / "entry.pkl")
+        state = {'payload': os.urandom(size)}
+
+        analysis_cache._write_cache(cache_path, state, max_entries=4)
+
+        assert analysis_cache._read_cache(cache_path) == state
+
+    def test_read_corrupted_cache(self, tmp_path):
+        """测试损坏的缓存被视为未命中"""
+        cache_path = tmp_path / "broken.pkl"
+        cache_path.write_bytes(b'not a pickle')
+
+        assert analysis_cache._read_cache(str(cache_path)) is None
+        assert analysis_cache._read_cache(str(tmp_path / "missing.pkl")) is None
+
+    def test_evict_old_entries(self, tmp_path):
+        """测试只保留最近写入的同后缀缓存条目"""
+        now = time.time()
+        for i in range(5):
+            entry = tmp_path / f"entry{i}.pkl"
+            entry.write_bytes(b'x')
+            os.utime(entry, (now + i, now + i))
+        (tmp_path / "prog.info.txt").write_bytes(b'x')
+
+        evict_old_entries(str(tmp_path), analysis_cache.CACHE_SUFFIX, max_entries=2)
+
+        remaining = sorted(os.listdir(tmp_path))
+        assert remaining == ['entry3.pkl', 'entry4.pkl', 'prog.info.txt']
+
+    def test_load_or_analyze_calls_uses_cache(self, tmp_path):
+        """测试调用关系分析结果写入缓存后，再次加载时跳过分析"""
+        elf = tmp_path / "prog"
+        elf.write_bytes(b'\x7fELF' + b'\x00' * 60)
+        cache_dir = str(tmp_path / "cache")
+
+        with patch.object(analysis_cache, 'ElfParser'), \
+             patch.object(analysis_cache, 'CallAnalyzer') as mock_analyzer_class:
+            first = Mock()
+            first.get_analysis_state.return_value = {'call_graph': 'graph'}
+            second = Mock()
+            mock_analyzer_class.side_effect = [first, second]
+
+            analysis_cache.load_or_analyze_calls(str(elf), cache_dir, jobs=2)
+            _, call_analyzer = analysis_cache.load_or_analyze_calls(str(elf), cache_dir)
+
+        first.analyze.assert_called_once_with(jobs=2, progress=None)
+        assert call_analyzer is second
+        second.analyze.assert_not_called()
+        second.load_analysis_state.assert_called_once_with({'call_graph': 'graph'})
+
+    def test_load_cached_calls_does_not_analyze(self, tmp_path):
+        """测试只读缓存：未命中时返回 None 且不创建分析器，命中时载入缓存结果"""
+        elf = tmp_path / "prog"
+        elf.write_bytes(b'\x7fELF' + b'\x00' * 60)
+        cache_dir = str(tmp_path / "cache")
+
+        with patch.object(analysis_cache, 'ElfParser'), \
+             patch.object(analysis_cache, 'CallAnalyzer') as mock_analyzer_class:
+            assert analysis_cache.load_cached_calls(str(elf), cache_dir) is None
+            mock_analyzer_class.assert_not_called()
+
+            analysis_cache._write_cache(get_cache_path(str(elf), cache_dir),
+                                        {'call_analysis': {'call_graph': 'graph'}}, max_entries=4)
+            _, call_analyzer = analysis_cache.load_cached_calls(str(elf), cache_dir)
+
+        assert call_analyzer is mock_analyzer_class.return_value
+        call_analyzer.analyze.assert_not_called()
+        call_analyzer.load_analysis_state.assert_called_once_with({'call_graph': 'graph'})
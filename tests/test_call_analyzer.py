@@ -2,7 +2,9 @@
 调用关系分析器测试用例
 """
 
+import pickle
 import pytest
+import networkx as nx
 from unittest.mock import Mock, patch, MagicMock
 
 from elfscope.core.call_analyzer import CallAnalyzer
@@ -41,6 +43,7 @@ class TestCallAnalyzer:
             }
         ]
         parser.get_section_data.return_value = b'\x90' * 0x1000  # NOP 指令
+        parser.get_section_view.return_value = memoryview(b'\x90' * 0x1000)
         parser.get_function_by_address.return_value = None
         
         return parser
@@ -87,7 +90,155 @@ class TestCallAnalyzer:
         assert analyzer.analyzed
         assert len(analyzer.function_calls) > 0
         assert 'main' in analyzer.function_calls or 'helper_func' in analyzer.function_calls
+        
+        # 内部以紧凑记录保存，支持字典式访问，对外输出时转换为字典
+        record = analyzer.function_calls['main'][0]
+        assert record['to_function'] == 'helper_func'
+        assert 'external' not in record and record.get('external', False) is False
+        assert pickle.loads(pickle.dumps(record)) == record
+        calls = analyzer.get_call_relationships()['calls']
+        assert all(type(call) is dict for call in calls)
+        assert calls[0] == {
+            'from_function': 'main',
+            'to_function': 'helper_func',
+            'from_address': 0x401010,
+            'to_address': 0x401100,
+            'instruction': 'call 0x401100',
+            'type': 'call'
+        }
+
+    @patch('elfscope.core.call_analyzer.Disassembler')
+    def test_analyze_progress(self, mock_disassembler_class, mock_elf_parser):
+        """测试分析进度回调"""
+        mock_disassembler = Mock()
+        mock_disassembler.analyze_function_calls.return_value = []
+        mock_disassembler_class.return_value = mock_disassembler
+        # 没有函数的代码段不读取数据
+        mock_elf_parser.get_text_sections.return_value = [
+            *mock_elf_parser.get_text_sections.return_value,
+            {'name': '.plt', 'addr': 0x400f00, 'size': 0x100, 'offset': 0xf00}
+        ]
+        
+        updates = []
+        analyzer = CallAnalyzer(mock_elf_parser)
+        analyzer.analyze(progress=lambda done, total: updates.append((done, total)))
+        
+        assert updates
+        assert [c.args[0] for c in mock_elf_parser.get_section_view.call_args_list] == ['.text']
+        total = updates[-1][1]
+        assert [done for done, _ in updates] == list(range(1, total + 1))
+        assert all(t == total for _, t in updates)
+        assert mock_disassembler.analyze_function_calls.call_count == total
+        
+        # iter_analyze 产出同样的进度，迭代结束后才完成分析
+        analyzer = CallAnalyzer(mock_elf_parser)
+        steps = analyzer.iter_analyze()
+        assert next(steps) == updates[0]
+        assert not analyzer.analyzed
+        assert [updates[0]] + list(steps) == updates
+        assert analyzer.analyzed
+    
+    @patch('elfscope.core.call_analyzer.Disassembler')
+    def test_analyze_parallel_matches_serial(self, mock_disassembler_class, mock_elf_parser):
+        """测试并行分析与串行分析结果一致"""
+        from elfscope.core import call_analyzer as call_analyzer_module
+        
+        mock_disassembler = Mock()
+        mock_disassembler.analyze_function_calls.side_effect = lambda func, data, base: [
+            {
+                'from_address': func['value'] + 0x10,
+                'to_address': 0x401100,
+                'instruction': 'call 0x401100',
+                'type': 'call'
+            }
+        ]
+        mock_disassembler_class.return_value = mock_disassembler
+        mock_elf_parser.get_function_by_address.side_effect = (
+            lambda addr: {'name': 'helper_func', 'value': 0x401100} if addr == 0x401100 else None
+        )
+        
+        class InlineExecutor:
+            """在当前进程内按顺序执行的进程池替身"""
+            created = 0
+            worker_setup = None
+            
+            def __init__(self, max_workers, initializer, initargs):
+                InlineExecutor.created += 1
+                InlineExecutor.worker_setup = (initializer, initargs)
+            
+            def __enter__(self):
+                return self
+            
+            def __exit__(self, *args):
+                return False
+            
+            def map(self, fn, iterable):
+                return map(fn, iterable)
+        
+        serial = CallAnalyzer(mock_elf_parser)
+        serial.analyze()
+        
+        parallel = CallAnalyzer(mock_elf_parser)
+        worker_analyzer = CallAnalyzer(mock_elf_parser)
+        with patch.object(call_analyzer_module, 'ProcessPoolExecutor', InlineExecutor), \
+             patch.object(call_analyzer_module, '_worker_analyzer', worker_analyzer), \
+             patch.object(CallAnalyzer, 'MIN_PARALLEL_CHUNK', 1):
+            parallel.analyze(jobs=4)
+        
+        assert InlineExecutor.created == 1
+        # 反汇编引擎只在各工作进程初始化时创建一次，任务本身只携带函数信息
+        assert InlineExecutor.worker_setup == (call_analyzer_module._init_analysis_worker,
+                                               (mock_elf_parser.filepath,))
+        assert parallel.analyzed
+        assert dict(parallel.function_calls) == dict(serial.function_calls)
+        assert dict(parallel.call_targets) == dict(serial.call_targets)
+        assert set(parallel.call_graph.edges) == set(serial.call_graph.edges)
+        
+        # 函数数不足一批时直接串行分析，不启动进程池
+        small = CallAnalyzer(mock_elf_parser)
+        with patch.object(call_analyzer_module, 'ProcessPoolExecutor', InlineExecutor):
+            small.analyze(jobs=4)
+        
+        assert InlineExecutor.created == 1
+        assert dict(small.function_calls) == dict(serial.function_calls)
 
+    @patch('elfscope.core.call_analyzer.Disassembler')
+    def test_analyze_function_matches_full_analysis(self, mock_disassembler_class, mock_elf_parser):
+        """测试单函数分析与完整分析的调用者/被调用函数一致"""
+        mock_disassembler = Mock()
+        mock_disassembler.analyze_function_calls.side_effect = lambda func, data, base: [
+            {
+                'from_address': func['value'] + 0x10,
+                'to_address': 0x401100,
+                'instruction': 'call 0x401100',
+                'type': 'call'
+            }
+        ] if func['name'] == 'main' else []
+        mock_disassembler_class.return_value = mock_disassembler
+        mock_elf_parser.get_function_by_address.side_effect = (
+            lambda addr: {'name': 'helper_func', 'value': 0x401100} if addr == 0x401100 else None
+        )
+        
+        analyzer = CallAnalyzer(mock_elf_parser)
+        helper_info = analyzer.analyze_function('helper_func')
+        main_info = analyzer.analyze_function('main')
+        
+        assert not analyzer.analyzed
+        assert analyzer.analyze_function('nonexistent') is None
+        assert helper_info['callers'] == ['main']
+        assert helper_info['callees'] == []
+        assert main_info['callees'] == ['helper_func']
+        assert not main_info['is_recursive']
+        assert main_info['call_details']['helper_func'][0]['from_address'] == 0x401010
+        
+        analyzer.analyze()
+        helper_callers = analyzer.analyze_function('helper_func')['callers']
+        assert helper_callers == analyzer.get_callers('helper_func')
+        assert analyzer.analyze_function('main')['callees'] == analyzer.get_callees('main')
+        assert analyzer.analyze_function('main')['call_details'] == {
+            'helper_func': analyzer.get_call_details('main', 'helper_func')
+        }
+    
     @patch('elfscope.core.call_analyzer.Disassembler')
     def test_get_call_relationships(self, mock_disassembler_class, mock_elf_parser):
         """测试获取调用关系"""
@@ -122,6 +273,121 @@ class TestCallAnalyzer:
         assert 'main' in callers
         assert 'helper_func' in callees
 
+    @patch('elfscope.core.call_analyzer.Disassembler')
+    def test_predecessor_map(self, mock_disassembler_class, mock_elf_parser):
+        """测试反向邻接表随调用图更新"""
+        mock_disassembler = Mock()
+        mock_disassembler.analyze_function_calls.return_value = []
+        mock_disassembler_class.return_value = mock_disassembler
+        
+        analyzer = CallAnalyzer(mock_elf_parser)
+        analyzer.analyze()
+        
+        assert analyzer.get_predecessor_map() == {'main': [], 'helper_func': []}
+        
+        analyzer.call_graph.add_edge('main', 'helper_func')
+        analyzer.call_graph.add_edge('helper_func', 'helper_func')
+        
+        assert analyzer.get_predecessor_map()['helper_func'] == ['main', 'helper_func']
+        assert analyzer.get_callers('nonexistent') == []
+    
+    @patch('elfscope.core.call_analyzer.Disassembler')
+    def test_callers_after_loading_other_state(self, mock_disassembler_class, mock_elf_parser):
+        """测试载入规模相同的另一份分析结果后调用者随之更新"""
+        analyzer = CallAnalyzer(mock_elf_parser)
+        
+        for names in (('a', 'b', 'c'), ('x', 'y', 'z')):
+            graph = nx.DiGraph()
+            graph.add_edges_from(zip(names, names[1:]))
+            analyzer.load_analysis_state({
+                'call_graph': graph,
+                'function_calls': {},
+                'call_targets': {}
+            })
+            assert analyzer.get_callers(names[-1]) == [names[1]]
+        
+        assert analyzer.get_callers('c') == []
+        assert analyzer.get_predecessor_map() == {'x': [], 'y': ['x'], 'z': ['y']}
+    
+    @patch('elfscope.core.call_analyzer.Disassembler')
+    def test_callers_after_replacing_edge(self, mock_disassembler_class, mock_elf_parser):
+        """测试替换一条边（节点数和边数不变）后调用者随之更新"""
+        graph = nx.DiGraph([('a', 'b'), ('b', 'c')])
+        analyzer = CallAnalyzer(mock_elf_parser)
+        analyzer.load_analysis_state({
+            'call_graph': graph,
+            'function_calls': {},
+            'call_targets': {}
+        })
+        assert analyzer.get_callers('c') == ['b']
+        
+        graph.remove_edge('b', 'c')
+        graph.add_edge('a', 'c')
+        
+        assert analyzer.get_callers('c') == ['a']
+        assert analyzer.get_predecessor_map()['c'] == ['a']
+    
+    @patch('elfscope.core.call_analyzer.Disassembler')
+    def test_has_function(self, mock_disassembler_class, mock_elf_parser):
+        """测试函数存在性检查"""
+        mock_disassembler = Mock()
+        mock_disassembler.analyze_function_calls.return_value = []
+        mock_disassembler_class.return_value = mock_disassembler
+        
+        analyzer = CallAnalyzer(mock_elf_parser)
+        
+        assert analyzer.has_function('main')
+        assert not analyzer.has_function('nonexistent')
+        assert analyzer.analyzed
+    
+    @patch('elfscope.core.call_analyzer.RAPIDFUZZ_AVAILABLE', False)
+    @patch('elfscope.core.call_analyzer.Disassembler')
+    def test_find_similar_functions(self, mock_disassembler_class, mock_elf_parser):
+        """测试相似函数名查找"""
+        mock_disassembler = Mock()
+        mock_disassembler.analyze_function_calls.return_value = []
+        mock_disassembler_class.return_value = mock_disassembler
+        
+        analyzer = CallAnalyzer(mock_elf_parser)
+        
+        assert analyzer.find_similar_functions('HELPER') == ['helper_func']
+        assert analyzer.find_similar_functions('a', limit=1) == ['main']
+        assert analyzer.find_similar_functions('xyz') == []
+        
+        # 未安装 rapidfuzz 时由 difflib 找到拼写错误的名称
+        assert analyzer.find_similar_functions('helpr_fnc') == ['helper_func']
+    
+    @patch('elfscope.core.call_analyzer.Disassembler')
+    def test_find_similar_functions_after_loading_state(self, mock_disassembler_class,
+                                                        mock_elf_parser):
+        """测试载入节点数和边数相同的分析结果后重建名称索引"""
+        analyzer = CallAnalyzer(mock_elf_parser)
+        assert analyzer.find_similar_functions('helpr_fnc') == ['helper_func']
+        
+        graph = nx.DiGraph()
+        graph.add_nodes_from(['start', 'worker_func'])
+        analyzer.load_analysis_state({
+            'call_graph': graph,
+            'function_calls': {},
+            'call_targets': {}
+        })
+        
+        assert analyzer.find_similar_functions('helper') == []
+        assert analyzer.find_similar_functions('workr_fnc') == ['worker_func']
+    
+    @patch('elfscope.core.call_analyzer.Disassembler')
+    def test_find_similar_functions_rapidfuzz(self, mock_disassembler_class, mock_elf_parser):
+        """测试安装了 rapidfuzz 时的模糊匹配"""
+        pytest.importorskip('rapidfuzz')
+        mock_disassembler = Mock()
+        mock_disassembler.analyze_function_calls.return_value = []
+        mock_disassembler_class.return_value = mock_disassembler
+        
+        analyzer = CallAnalyzer(mock_elf_parser)
+        
+        assert analyzer.find_similar_functions('HELPER') == ['helper_func']
+        assert analyzer.find_similar_functions('helpr_fnc')[0] == 'helper_func'
+    
     @patch('elfscope.core.call_analyzer.Disassembler')
     def test_is_recursive_function(self, mock_disassembler_class, mock_elf_parser):
         """测试递归函数检测"""
@@ -156,7 +422,56 @@ class TestCallAnalyzer:
         
         # 应该检测到至少一个环
         assert len(cycles) > 0
+        
+        # 再次调用复用结果，重新分析后重新查找
+        with patch.object(analyzer, '_find_cycles_uncached') as mock_find:
+            assert analyzer.find_cycles() == cycles
+            mock_find.assert_not_called()
+            
+            mock_find.return_value = []
+            analyzer.analyze()
+            assert analyzer.find_cycles() == []
+            mock_find.assert_called_once()
+        
+        # 载入节点数和边数相同但没有环的分析结果后重新查找
+        for edges, expected in (([('a', 'b'), ('b', 'c'), ('c', 'a')], 1),
+                                ([('x', 'y'), ('y', 'z'), ('x', 'z')], 0)):
+            analyzer.load_analysis_state({
+                'call_graph': nx.DiGraph(edges),
+                'function_calls': {},
+                'call_targets': {}
+            })
+            assert len(analyzer.find_cycles()) == expected
 
+    @patch('elfscope.core.call_analyzer.Disassembler')
+    def test_function_depth(self, mock_disassembler_class, mock_elf_parser):
+        """测试调用深度计算及缓存"""
+        mock_disassembler = Mock()
+        mock_disassembler.analyze_function_calls.return_value = []
+        mock_disassembler_class.return_value = mock_disassembler
+        
+        analyzer = CallAnalyzer(mock_elf_parser)
+        analyzer.analyze()
+        analyzer.call_graph.add_edge('main', 'helper_func')
+        
+        assert analyzer.get_function_depth('main') == 1
+        assert analyzer.get_function_depth('nonexistent') == 0
+        assert analyzer.get_all_depths() == {'main': 1, 'helper_func': 0}
+        
+        # 载入节点数和边数相同的另一份分析结果后重新计算
+        analyzer.load_analysis_state({
+            'call_graph': nx.DiGraph([('helper_func', 'main')]),
+            'function_calls': {},
+            'call_targets': {}
+        })
+        assert analyzer.get_function_depth('main') == 0
+        assert analyzer.get_all_depths() == {'main': 0, 'helper_func': 1}
+        
+        # 重新分析后重新计算
+        analyzer.call_graph.add_edge('main', 'helper_func')
+        analyzer.analyze()
+        assert analyzer.get_function_depth('main') == 1
+    
     @patch('elfscope.core.call_analyzer.Disassembler')
     def test_get_statistics(self, mock_disassembler_class, mock_elf_parser):
         """测试统计信息"""
@@ -181,6 +496,18 @@ class TestCallAnalyzer:
         assert stats['total_functions'] == 2
         assert isinstance(stats['total_calls'], int)
         assert isinstance(stats['average_calls_per_function'], (int, float))
+        
+        # 出入度、递归和外部函数计数
+        analyzer.call_graph.add_node('external_0x1000', external=True)
+        analyzer.call_graph.add_edge('main', 'helper_func')
+        analyzer.call_graph.add_edge('main', 'external_0x1000')
+        analyzer.call_graph.add_edge('helper_func', 'helper_func')
+        
+        stats = analyzer.get_statistics()
+        assert stats['max_calls_from_function'] == 2
+        assert stats['max_calls_to_function'] == 2
+        assert stats['recursive_functions'] == 1
+        assert stats['external_functions'] == 1
 
     @patch('elfscope.core.call_analyzer.Disassembler')
     def test_external_function_handling(self, mock_disassembler_class, mock_elf_parser):
@@ -0,0 +1,157 @@
+"""
+命令行接口测试用例
+"""
+
+import os
+import json
+import shutil
+import pytest
+from unittest.mock import Mock, patch
+from click.testing import CliRunner
+
+from elfscope import cli as cli_module
+from elfscope.cli import cli
+
+
+class TestBatchCommand:
+    """batch 命令测试类"""
+
+    @pytest.fixture(autouse=True)
+    def restore_cache_flag(self, monkeypatch):
+        """batch 会修改全局缓存开关，测试结束后恢复"""
+        monkeypatch.setattr(cli_module, '_disk_cache_enabled', True)
+
+    def test_batch_multiple_files(self, sample_elf_path, temp_dir):
+        """测试多个文件并行分析，无法解析的文件报告错误但不影响其他文件"""
+        if sample_elf_path is None:
+            pytest.skip("没有可用的 ELF 文件")
+
+        input_dir = os.path.join(temp_dir, 'input')
+        output_dir = os.path.join(temp_dir, 'output')
+        os.makedirs(input_dir)
+        for name in ('first', 'second'):
+            shutil.copy(sample_elf_path, os.path.join(input_dir, name))
+        with open(os.path.join(input_dir, 'broken'), 'w') as f:
+            f.write('not an elf file')
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ['--no-cache', 'batch', os.path.join(input_dir, '*'),
+                                     '-o', output_dir, '-j', '2'])
+
+        assert result.exit_code == 1
+        assert '2 个成功，1 个失败' in result.output
+        assert 'broken' in result.output
+        assert sorted(os.listdir(output_dir)) == ['first.json', 'second.json']
+        for name in ('first.json', 'second.json'):
+            with open(os.path.join(output_dir, name)) as f:
+                assert 'call_relationships' in json.load(f)
+
+    def test_batch_no_matching_files(self, temp_dir):
+        """测试没有匹配的文件"""
+        runner = CliRunner()
+        result = runner.invoke(cli, ['batch', os.path.join(temp_dir, '*.elf'),
+                                     '-o', os.path.join(temp_dir, 'output')])
+
+        assert result.exit_code == 1
+        assert '没有匹配的文件' in result.output
+
+    @patch('elfscope.cli._get_exporter')
+    @patch('elfscope.cli._get_analyzer')
+    def test_batch_analyze_one_releases_cache(self, mock_get_analyzer, mock_get_exporter):
+        """测试单个文件处理完成后释放解析结果，成功和失败时都是如此"""
+        parser = Mock()
+
+        def get_analyzer(elf_file):
+            cli_module._analyzer_cache[(elf_file, 0, 0)] = (parser, Mock())
+            if elf_file == 'broken':
+                raise ValueError('不是有效的 ELF 文件')
+            return cli_module._analyzer_cache[(elf_file, 0, 0)]
+
+        mock_get_analyzer.side_effect = get_analyzer
+        mock_get_exporter.return_value.export_call_relationships.return_value = True
+
+        result = cli_module._batch_analyze_one('good', 'good.json', False, False)
+        assert result == ('good', 'good.json', None)
+        assert cli_module._analyzer_cache == {}
+        assert parser.close.call_count == 1
+
+        result = cli_module._batch_analyze_one('broken', 'broken.json', False, False)
+        assert result == ('broken', 'broken.json', '不是有效的 ELF 文件')
+        assert cli_module._analyzer_cache == {}
+        assert parser.close.call_count == 2
+
+
+class TestFunctionCommand:
+    """function 命令测试类"""
+
+    @pytest.fixture(autouse=True)
+    def isolate_caches(self, monkeypatch):
+        """使用独立的进程内缓存，并在测试结束后恢复全局缓存开关"""
+        monkeypatch.setattr(cli_module, '_disk_cache_enabled', True)
+        monkeypatch.setattr(cli_module, '_analyzer_cache', {})
+
+    @pytest.fixture
+    def elf_file(self, temp_dir):
+        """命令行参数要求文件存在，分析器均被模拟，文件内容无关"""
+        path = os.path.join(temp_dir, 'prog')
+        with open(path, 'wb') as f:
+            f.write(b'\x7fELF')
+        return path
+
+    def _invoke_fast(self, elf_file, temp_dir):
+        """以 --fast 运行 function 命令，导出器被模拟"""
+        with patch('elfscope.cli._get_exporter') as mock_get_exporter:
+            mock_get_exporter.return_value.export_function_details.return_value = True
+            return CliRunner().invoke(cli, ['function', elf_file, 'main', '--fast',
+                                            '-o', os.path.join(temp_dir, 'main.json')])
+
+    def test_fast_uses_cached_analysis(self, elf_file, temp_dir):
+        """测试 --fast 在有缓存的分析结果时直接使用，不再扫描全部函数"""
+        call_analyzer = Mock()
+        call_analyzer.analyze_function.return_value = {
+            'name': 'main', 'callers': [], 'callees': ['helper'], 'is_recursive': False,
+            'call_details': {'helper': []}
+        }
+
+        with patch('elfscope.utils.analysis_cache.load_cached_calls',
+                   return_value=(Mock(), call_analyzer)) as mock_load, \
+                patch('elfscope.core.elf_parser.ElfParser') as mock_parser_class:
+            result = self._invoke_fast(elf_file, temp_dir)
+
+        assert result.exit_code == 0, result.output
+        mock_load.assert_called_once_with(elf_file)
+        mock_parser_class.assert_not_called()
+        call_analyzer.analyze_function.assert_called_once_with('main')
+        assert '被调用函数数量: 1' in result.output
+
+    def test_fast_analyzes_function_on_cache_miss(self, elf_file, temp_dir):
+        """测试 --fast 在缓存未命中时才进行单函数分析"""
+        with patch('elfscope.utils.analysis_cache.load_cached_calls', return_value=None), \
+                patch('elfscope.core.elf_parser.ElfParser'), \
+                patch('elfscope.core.call_analyzer.CallAnalyzer') as mock_analyzer_class:
+            mock_analyzer_class.return_value.analyze_function.return_value = {
+                'name': 'main', 'callers': ['_start'], 'callees': [], 'is_recursive': False,
+                'call_details': {}
+            }
+            result = self._invoke_fast(elf_file, temp_dir)
+
+        assert result.exit_code == 0, result.output
+        mock_analyzer_class.return_value.analyze_function.assert_called_once_with('main')
+        mock_analyzer_class.return_value.analyze.assert_not_called()
+        assert '调用者数量: 1' in result.output
+
+    def test_get_cached_analyzer(self, elf_file, monkeypatch):
+        """测试只查找进程内结果和磁盘缓存，从磁盘载入的结果供之后复用"""
+        cached = (Mock(), Mock())
+
+        with patch('elfscope.utils.analysis_cache.load_cached_calls',
+                   return_value=cached) as mock_load:
+            assert cli_module._get_cached_analyzer(elf_file) is cached
+            assert cli_module._get_cached_analyzer(elf_file) is cached
+        mock_load.assert_called_once_with(elf_file)
+
+        cli_module._analyzer_cache.clear()
+        monkeypatch.setattr(cli_module, '_disk_cache_enabled', False)
+        with patch('elfscope.utils.analysis_cache.load_cached_calls') as mock_load:
+            assert cli_module._get_cached_analyzer(elf_file) is None
+        mock_load.assert_not_called()
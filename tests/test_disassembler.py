@@ -0,0 +1,94 @@
+"""
+反汇编器测试用例
+"""
+
+import pytest
+
+from elfscope.core.disassembler import Disassembler, DisassemblerError
+
+
+class TestDisassembler:
+    """反汇编器测试类"""
+
+    @pytest.fixture
+    def disassembler(self):
+        """创建 x86_64 反汇编器"""
+        return Disassembler('x86_64')
+
+    def test_unsupported_architecture(self):
+        """测试不支持的架构"""
+        with pytest.raises(DisassemblerError):
+            Disassembler('sparc')
+
+    def test_parse_bare_immediate(self, disassembler):
+        """测试直接调用的十六进制立即数"""
+        assert disassembler._parse_target_address('0x401005') == 0x401005
+
+    def test_parse_arm_immediate(self):
+        """测试 ARM 带 # 前缀的立即数"""
+        disassembler = Disassembler('aarch64')
+        assert disassembler._parse_target_address('#0x1000') == 0x1000
+
+    @pytest.mark.parametrize('op_str', [
+        'qword ptr [rip + 0x2fe2]',
+        'qword ptr [rbp - 0x18]',
+        '[rax]'
+    ])
+    def test_parse_memory_operand(self, disassembler, op_str):
+        """测试内存操作数是间接调用，不把位移当作目标地址"""
+        assert disassembler._parse_target_address(op_str) is None
+
+    @pytest.mark.parametrize('op_str', ['rax', 'x8', 'r3'])
+    def test_parse_register_operand(self, disassembler, op_str):
+        """测试寄存器操作数无法确定目标"""
+        assert disassembler._parse_target_address(op_str) is None
+
+    @pytest.mark.parametrize('op_str', ['', 'far ptr', '#-', '0xzz'])
+    def test_parse_unparseable(self, disassembler, op_str):
+        """测试无法解析的操作数"""
+        assert disassembler._parse_target_address(op_str) is None
+
+    def test_find_calls_in_function(self, disassembler):
+        """测试直接调用解析出目标地址，间接调用不带目标地址"""
+        code = (
+            b'\xe8\x00\x00\x00\x00'          # call 0x401005
+            b'\xff\x15\x10\x00\x00\x00'      # call qword ptr [rip + 0x10]
+            b'\xff\xd0'                      # call rax
+        )
+        calls = disassembler.find_calls_in_function(code, 0x401000, len(code))
+
+        assert [call['from_address'] for call in calls] == [0x401000, 0x401005, 0x40100b]
+        assert calls[0]['to_address'] == 0x401005
+        assert 'to_address' not in calls[1]
+        assert 'to_address' not in calls[2]
+
+    def test_skipdata_disabled_by_default(self, disassembler):
+        """测试调用分析默认在无法解码的字节处停止，不把数据解码为指令"""
+        code = b'\x06' + b'\xe8\x00\x00\x00\x00'
+        assert disassembler.find_calls_in_function(code, 0x401000, len(code)) == []
+
+        listing = Disassembler('x86_64', skipdata=True)
+        insns = list(listing.disassemble_lite(code, 0x401000))
+        assert insns[0][2] == '.byte'
+        assert insns[1][2] == 'call'
+
+    def test_disassemble_lite_targets(self, disassembler):
+        """测试轻量反汇编只为调用/跳转指令解析目标地址"""
+        code = (
+            b'\xe8\x00\x00\x00\x00'          # call 0x401005
+            b'\x48\x83\xec\x18'              # sub rsp, 0x18
+            b'\xff\xd0'                      # call rax
+            b'\xeb\xf3'                      # jmp 0x401000
+        )
+        insns = list(disassembler.disassemble_lite_targets(code, 0x401000))
+
+        assert [insn[4] for insn in insns] == [0x401005, None, None, 0x401000]
+        assert [insn[:4] for insn in insns] == list(disassembler.disassemble_lite(code, 0x401000))
+
+    def test_disassemble_lite_memoryview_across_chunks(self, disassembler):
+        """测试传入 memoryview 时逐块解码的结果与 bytes 相同"""
+        code = b'\x48\x83\xec\x18' * (Disassembler.LITE_CHUNK_INSNS + 3)
+        expected = list(disassembler.disassemble_lite(code, 0x401000))
+
+        assert len(expected) == Disassembler.LITE_CHUNK_INSNS + 3
+        assert list(disassembler.disassemble_lite(memoryview(code), 0x401000)) == expected
@@ -0,0 +1,126 @@
+"""
+iced-x86 反汇编器测试用例
+"""
+
+import os
+import pytest
+
+pytest.importorskip('iced_x86')
+
+from elfscope.core.disassembler import Disassembler, DisassemblerError  # noqa: E402
+from elfscope.core.disassembler_iced import IcedDisassembler  # noqa: E402
+from elfscope.core.elf_parser import ElfParser  # noqa: E402
+from elfscope.core.objdump import ObjdumpAnalyzer  # noqa: E402
+
+
+# 仓库中编译好的示例程序
+DEMO_PROGRAM = os.path.join(os.path.dirname(__file__), '..', 'demo', 'test_program')
+
+
+# 与 Capstone 输出对照的 x86_64 字节序列
+X86_64_SAMPLES = [
+    b'\xe8\x00\x00\x00\x00',              # call rel32
+    b'\x74\x05',                          # je rel8
+    b'\x0f\x85\x10\x00\x00\x00',          # jne rel32
+    b'\xff\x15\x10\x00\x00\x00',          # call qword ptr [rip + 0x10]
+    b'\xff\xd0',                          # call rax
+    b'\x48\x8b\x45\xe8',                  # mov rax, qword ptr [rbp - 0x18]
+    b'\x48\x83\xec\x18',                  # sub rsp, 0x18
+    b'\x06',                              # 64 位模式下无效，输出 .byte
+    b'\x66\x90',                          # nop（iced-x86 默认为 xchg ax, ax）
+    b'\x66\x2e\x0f\x1f\x84\x00\x00\x00\x00\x00',  # nop word ptr cs:[rax + rax]
+    b'\x48\xba\xab\xaa\xaa\xaa\xaa\xaa\xaa\xaa',  # movabs rdx, 0xaaaaaaaaaaaaaaab
+    b'\xa0\x88\x77\x66\x55\x44\x33\x22\x11',      # movabs al, byte ptr [0x1122334455667788]
+    b'\x48\x69\xc0\x56\x55\x55\x55',          # imul rax, rax, 0x55555556
+    b'\x83\x7d\x98\xff',                  # cmp dword ptr [rbp - 0x68], -1
+    b'\x48\x05\x00\x00\x00\xff',          # add rax, -0x1000000
+    b'\x48\x83\xe4\xf0',                  # and rsp, 0xfffffffffffffff0
+    b'\xb8\x19\xfc\xff\xff',              # mov eax, 0xfffffc19
+]
+
+
+class TestIcedDisassembler:
+    """iced-x86 反汇编器测试类"""
+
+    @pytest.fixture
+    def disassembler(self):
+        """创建 x86_64 反汇编器"""
+        return IcedDisassembler('x86_64')
+
+    def test_unsupported_architecture(self):
+        """测试非 x86 架构"""
+        with pytest.raises(DisassemblerError):
+            IcedDisassembler('aarch64')
+
+    @pytest.mark.parametrize('code', X86_64_SAMPLES)
+    def test_matches_capstone(self, disassembler, code):
+        """测试助记符和操作数与 Capstone 的 Intel 语法输出一致"""
+        capstone_disassembler = Disassembler('x86_64', skipdata=True)
+        expected = [(mnemonic, op_str) for _, _, mnemonic, op_str in
+                    capstone_disassembler.disassemble_lite(code, 0x401000)]
+
+        actual = [(insn.mnemonic, insn.op_str)
+                  for insn in disassembler.disassemble(code, 0x401000)]
+
+        assert actual == expected
+
+    def test_branch_target_only_for_direct_branches(self, disassembler):
+        """测试只有直接调用/跳转带解码出的目标地址"""
+        insns = list(disassembler.disassemble(b''.join(X86_64_SAMPLES), 0x401000))
+        targets = {insn.mnemonic: insn.branch_target for insn in insns
+                   if insn.mnemonic in ('je', 'jne', 'mov', 'sub', '.byte')}
+
+        assert insns[0].branch_target == 0x401005
+        assert targets['je'] == 0x40100c
+        assert targets['jne'] == 0x40101d
+        assert targets['mov'] is None
+        assert targets['sub'] is None
+        assert targets['.byte'] is None
+        # 间接调用的目标在运行时才能确定
+        assert insns[3].branch_target is None
+        assert insns[4].branch_target is None
+
+    def test_inherited_methods_work_without_capstone(self, disassembler):
+        """测试不使用 Capstone 句柄时继承的分析方法仍可用"""
+        code = b'\xe8\x00\x00\x00\x00\xff\xd0\xc3'
+
+        calls = disassembler.find_calls_in_function(code, 0x401000, len(code))
+        assert [call.get('to_address') for call in calls] == [0x401005, None]
+
+        instructions = disassembler.disassemble_function(code, 0x401000, len(code))
+        assert [insn['type'] for insn in instructions] == ['call', 'call', 'normal']
+        assert instructions[0]['target'] == 0x401005
+
+    def test_lite_targets_match_instruction_objects(self, disassembler):
+        """测试轻量解码与指令对象的结果一致，带前缀的助记符完整保留"""
+        code = b''.join(X86_64_SAMPLES) + b'\xf3\x48\xab' + b'\xf0\x48\x01\x07'
+        expected = [(insn.address, insn.size, insn.mnemonic, insn.op_str, insn.branch_target)
+                    for insn in disassembler.disassemble(code, 0x401000)]
+
+        lite = list(disassembler.disassemble_lite_targets(code, 0x401000))
+
+        assert lite == expected
+        assert lite[-2][2] == 'rep stosq'
+        assert lite[-1][2:4] == ('lock add', 'qword ptr [rdi], rax')
+
+    @pytest.mark.skipif(not os.path.exists(DEMO_PROGRAM), reason="没有示例程序")
+    def test_objdump_listing_matches_capstone(self):
+        """测试示例程序全部代码段的反汇编结果（含 JSON 字段）与 Capstone 完全一致"""
+        with ElfParser(DEMO_PROGRAM) as elf_parser:
+            expected = ObjdumpAnalyzer(elf_parser).disassemble_section()
+            actual = ObjdumpAnalyzer(elf_parser, use_iced=True).disassemble_section()
+
+        assert [section['name'] for section in actual['sections']] == \
+            [section['name'] for section in expected['sections']]
+        for actual_section, expected_section in zip(actual['sections'], expected['sections']):
+            assert actual_section['instructions'] == expected_section['instructions']
+
+    def test_objdump_defaults_to_capstone(self, sample_elf_path):
+        """测试已安装 iced-x86 时 objdump 默认仍使用 Capstone，需要显式选用 iced-x86"""
+        if sample_elf_path is None:
+            pytest.skip("没有可用的 ELF 文件")
+
+        with ElfParser(sample_elf_path) as elf_parser:
+            assert not isinstance(ObjdumpAnalyzer(elf_parser).disassembler, IcedDisassembler)
+            assert isinstance(ObjdumpAnalyzer(elf_parser, use_iced=True).disassembler,
+                              IcedDisassembler)
@@ -5,7 +5,7 @@ ELF 解析器测试用例
 import os
 import pytest
 import tempfile
-from unittest.mock import patch, mock_open
+from unittest.mock import Mock, patch, mock_open
 
 from elfscope.core.elf_parser import ElfParser
 from elftools.common.exceptions import ELFError
@@ -104,13 +104,30 @@ class TestElfParser:
         mock_elffile.return_value = mock_elf
         
         # 创建解析器并测试
-        parser = ElfParser("/path/to/test.elf")
+        parser = ElfParser("/path/to/test.elf", lazy=False)
+        mock_symtab.iter_symbols.assert_called_once()
         functions = parser.get_functions()
         
         assert len(functions) == 1
         assert functions[0]['name'] == 'test_function'
         assert functions[0]['value'] == 0x401000
         assert functions[0]['size'] == 100
+        
+        # 默认延迟解析，首次获取函数才遍历符号表
+        mock_symtab.iter_symbols.reset_mock()
+        lazy_parser = ElfParser("/path/to/test.elf")
+        mock_symtab.iter_symbols.assert_not_called()
+        assert lazy_parser.get_functions() == functions
+        # 符号数量在解析函数符号时顺带统计，不再遍历符号表
+        assert lazy_parser.get_file_info()['num_symbols'] == 1
+        mock_symtab.iter_symbols.assert_called_once()
+        
+        # 同一函数在多个符号表中出现时只保留一个
+        mock_symtab.iter_symbols.return_value = [mock_symbol, mock_symbol]
+        dup_parser = ElfParser("/path/to/test.elf")
+        assert dup_parser.get_functions() == functions
+        assert dup_parser.num_symbols == 2
+        assert len(dup_parser.symbols) == 2
 
     @patch('elfscope.core.elf_parser.ELFFile')
     @patch('builtins.open')
@@ -153,6 +170,128 @@ class TestElfParser:
         func = parser.get_function_by_address(0x402000)
         assert func is None
 
+    def test_get_function_by_address_overlapping(self):
+        """测试函数地址重叠时返回符号表中靠前的函数"""
+        outer = {'name': 'outer', 'value': 0x1000, 'size': 0x100}
+        alias = {'name': 'alias', 'value': 0x1000, 'size': 0x100}
+        inner = {'name': 'inner', 'value': 0x1040, 'size': 0x10}
+        tail = {'name': 'tail', 'value': 0x1100, 'size': 0x20}
+        
+        parser = ElfParser.__new__(ElfParser)
+        parser._function_symbols = [inner, outer, alias, tail]
+        parser._build_function_index(parser._function_symbols)
+        
+        assert parser.get_function_by_address(0xfff) is None
+        assert parser.get_function_by_address(0x1000) is outer
+        assert parser.get_function_by_address(0x1045) is inner
+        assert parser.get_function_by_address(0x1050) is outer
+        assert parser.get_function_by_address(0x1100) is tail
+        assert parser.get_function_by_address(0x1120) is None
+        assert parser.get_function_by_name('alias') is alias
+    
+    @patch('elfscope.core.elf_parser.ELFFile')
+    def test_file_is_memory_mapped(self, mock_elffile):
+        """测试真实文件通过内存映射交给 pyelftools，关闭时释放映射"""
+        self._setup_basic_mocks(Mock(), Mock(), Mock(), mock_elffile)
+        
+        with tempfile.NamedTemporaryFile(suffix='.elf', delete=False) as tmp_file:
+            tmp_file.write(b'\x7fELF' + b'\x00' * 60)
+            path = tmp_file.name
+        
+        try:
+            parser = ElfParser(path)
+            stream = mock_elffile.call_args[0][0]
+            assert stream[:4] == b'\x7fELF'
+            
+            parser.close()
+            assert stream.closed
+            assert parser._file_handle is None
+            
+            # 作为上下文管理器使用时退出即关闭
+            with ElfParser(path) as parser:
+                stream = mock_elffile.call_args[0][0]
+            assert stream.closed
+        finally:
+            os.unlink(path)
+
+    @patch('elfscope.core.elf_parser.ELFFile')
+    def test_get_section_view(self, mock_elffile):
+        """测试节区视图直接引用内存映射的数据"""
+        self._setup_basic_mocks(Mock(), Mock(), Mock(), mock_elffile)
+        
+        with tempfile.NamedTemporaryFile(suffix='.elf', delete=False) as tmp_file:
+            tmp_file.write(b'\x00' * 0x1000 + b'\xcc' * 0x1000)
+            path = tmp_file.name
+        
+        try:
+            parser = ElfParser(path)
+            view = parser.get_section_view('.text')
+            
+            assert parser.get_text_section_by_address(0x401800)['name'] == '.text'
+            assert parser.get_text_section_by_address(0x402000) is None
+            assert parser.get_text_section_by_address(0x400fff) is None
+            assert isinstance(view, memoryview)
+            assert view.tobytes() == b'\xcc' * 0x1000
+            assert parser.get_section_view('.nonexistent') is None
+            
+            view.release()
+            parser.close()
+        finally:
+            os.unlink(path)
+
+    @patch('elfscope.core.elf_parser.ELFFile')
+    def test_get_section_data_is_cached(self, mock_elffile):
+        """测试节区数据只从 pyelftools 读取一次，释放缓存后重新读取"""
+        self._setup_basic_mocks(Mock(), Mock(), Mock(), mock_elffile)
+        
+        with tempfile.NamedTemporaryFile(suffix='.elf', delete=False) as tmp_file:
+            tmp_file.write(b'\x00' * 0x2000)
+            path = tmp_file.name
+        
+        try:
+            parser = ElfParser(path)
+            section = Mock()
+            section.data.return_value = b'\xcc' * 16
+            
+            with patch.object(parser.elffile, 'get_section_by_name', create=True,
+                              side_effect=lambda name: section if name == '.text' else None):
+                assert parser.get_section_data('.text') == b'\xcc' * 16
+                assert parser.get_section_data('.text') == b'\xcc' * 16
+                assert section.data.call_count == 1
+                assert parser.get_section_data('.nonexistent') is None
+                
+                parser.release_section_cache()
+                parser.get_section_data('.text')
+                assert section.data.call_count == 2
+            
+            parser.close()
+        finally:
+            os.unlink(path)
+    
+    @patch('elfscope.core.elf_parser.ELFFile')
+    def test_read_section_range(self, mock_elffile):
+        """测试只读取节区内的指定范围（内存映射和 pread 两种方式）"""
+        self._setup_basic_mocks(Mock(), Mock(), Mock(), mock_elffile)
+        
+        with tempfile.NamedTemporaryFile(suffix='.elf', delete=False) as tmp_file:
+            tmp_file.write(b'\x00' * 0x1000 + bytes(range(256)) * 16)
+            path = tmp_file.name
+        
+        try:
+            parser = ElfParser(path)
+            assert parser.read_section_range('.text', 0x10, 4) == bytes([0x10, 0x11, 0x12, 0x13])
+            # 不超过节区末尾
+            assert parser.read_section_range('.text', 0xffe, 16) == bytes([0xfe, 0xff])
+            assert parser.read_section_range('.nonexistent', 0, 4) is None
+            
+            with patch.object(parser, '_mmap', None):
+                expected = bytes([0x10, 0x11, 0x12, 0x13])
+                assert parser.read_section_range('.text', 0x10, 4) == expected
+            
+            parser.close()
+        finally:
+            os.unlink(path)
+    
     def _setup_basic_mocks(self, mock_access, mock_isfile, mock_exists, mock_elffile):
         """设置基本的模拟对象"""
         mock_exists.return_value = True
@@ -0,0 +1,49 @@
+"""
+ELF 文件基本信息缓存测试用例
+"""
+
+import os
+
+from elfscope.utils import info_cache
+
+
+class TestInfoCache:
+    """基本信息缓存测试类"""
+
+    def test_store_and_load_roundtrip(self, tmp_path):
+        """测试写入的信息文本可以原样读回"""
+        elf = tmp_path / "prog"
+        elf.write_bytes(b'\x7fELF' + b'\x00' * 60)
+        cache_dir = str(tmp_path / "cache")
+
+        assert info_cache.load_info_text(str(elf), cache_dir) is None
+
+        info_cache.store_info_text(str(elf), "架构:       x86_64\n", cache_dir)
+
+        assert info_cache.load_info_text(str(elf), cache_dir) == "架构:       x86_64\n"
+
+    def test_modified_file_misses_cache(self, tmp_path):
+        """测试文件修改后缓存失效"""
+        elf = tmp_path / "prog"
+        elf.write_bytes(b'\x7fELF' + b'\x00' * 60)
+        cache_dir = str(tmp_path / "cache")
+        info_cache.store_info_text(str(elf), "old\n", cache_dir)
+
+        stat = os.stat(elf)
+        os.utime(elf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert info_cache.load_info_text(str(elf), cache_dir) is None
+
+    def test_evicts_only_info_entries(self, tmp_path):
+        """测试只淘汰多余的基本信息缓存，不影响分析结果缓存"""
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        (cache_dir / "analysis.pkl").write_bytes(b'x')
+        for i in range(3):
+            elf = tmp_path / f"prog{i}"
+            elf.write_bytes(b'\x7fELF')
+            info_cache.store_info_text(str(elf), f"{i}\n", str(cache_dir), max_entries=2)
+
+        names = os.listdir(cache_dir)
+        assert 'analysis.pkl' in names
+        assert len([n for n in names if n.endswith(info_cache.INFO_SUFFIX)]) == 2
@@ -82,7 +82,6 @@ class TestIntegration:
                 try:
                     exporter = JsonExporter()
                     success = exporter.export_complete_analysis(
-                        elf_parser=elf_parser,
                         call_analyzer=call_analyzer,
                         output_file=output_file
                     )
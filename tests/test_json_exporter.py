@@ -227,7 +227,6 @@ class TestJsonExporter:
         
         try:
             success = exporter.export_complete_analysis(
-                elf_parser=mock_elf_parser,
                 call_analyzer=mock_call_analyzer,
                 output_file=output_file
             )
@@ -259,13 +258,14 @@ class TestJsonExporter:
         
         try:
             success = exporter.create_summary_report(
-                elf_parser=mock_elf_parser,
                 call_analyzer=mock_call_analyzer,
                 output_file=output_file
             )
             
             assert success
             assert os.path.exists(output_file)
+            assert exporter.last_statistics is mock_call_analyzer.get_statistics.return_value
+            mock_call_analyzer.get_statistics.assert_called_once()
             
             # 验证内容
             with open(output_file, 'r', encoding='utf-8') as f:
@@ -448,6 +448,88 @@ class TestJsonExporter:
         result = exporter._json_serializer(obj)
         assert 'value' in result
 
+    def test_export_call_relationships_stream(self, exporter, mock_call_analyzer, tmp_path):
+        """测试流式导出与一次性导出的内容一致"""
+        relationships = mock_call_analyzer.get_call_relationships.return_value
+        mock_call_analyzer.analyzed = True
+        mock_call_analyzer.call_graph = Mock()
+        mock_call_analyzer.call_graph.nodes.return_value = list(relationships['functions'].items())
+        mock_call_analyzer.function_calls = {'main': relationships['calls']}
+
+        buffered_file = tmp_path / "buffered.json"
+        streamed_file = tmp_path / "streamed.json"
+        assert exporter.export_call_relationships(mock_call_analyzer, str(buffered_file))
+        assert exporter.export_call_relationships(mock_call_analyzer, str(streamed_file),
+                                                  stream=True)
+
+        buffered = json.loads(buffered_file.read_text(encoding='utf-8'))
+        streamed = json.loads(streamed_file.read_text(encoding='utf-8'))
+        buffered['metadata'].pop('export_time')
+        streamed['metadata'].pop('export_time')
+        assert streamed == buffered
+        # 每条调用关系独占一行
+        streamed_text = streamed_file.read_text(encoding='utf-8')
+        assert '{"from_function":"main","to_function":"helper"' in streamed_text
+
+    def test_export_call_paths_stream(self, exporter, mock_call_analyzer, tmp_path):
+        """测试流式导出调用路径与一次性导出的内容一致"""
+        import networkx as nx
+        
+        call_graph = nx.DiGraph()
+        call_graph.add_edge('main', 'helper')
+        call_graph.add_edge('helper', 'leaf')
+        call_graph.add_edge('main', 'leaf')
+        mock_call_analyzer.analyzed = True
+        mock_call_analyzer.call_graph = call_graph
+        mock_call_analyzer.get_call_details.return_value = []
+        path_finder = PathFinder(mock_call_analyzer)
+        
+        buffered_file = tmp_path / "buffered.json"
+        streamed_file = tmp_path / "streamed.json"
+        assert exporter.export_call_paths(path_finder, 'leaf', str(buffered_file))
+        assert exporter.export_call_paths(path_finder, 'leaf', str(streamed_file), stream=True)
+        
+        buffered = json.loads(buffered_file.read_text(encoding='utf-8'))
+        streamed = json.loads(streamed_file.read_text(encoding='utf-8'))
+        buffered['metadata'].pop('export_time')
+        streamed['metadata'].pop('export_time')
+        assert streamed == buffered
+        assert streamed['path_analysis']['statistics']['total_paths'] == 3
+
+    def test_export_data_stream(self, exporter, tmp_path):
+        """测试流式导出任意数据与一次性导出的内容一致"""
+        data = {
+            'disassembly': {
+                'sections': [{
+                    'name': '.text',
+                    'instructions': [
+                        {'address': 0x1000, 'mnemonic': 'push', 'op_str': 'rbp'},
+                        {'address': 0x1001, 'mnemonic': 'ret', 'op_str': ''}
+                    ]
+                }],
+                'total_instructions': 2
+            },
+            'symbols': {'symbols': [], 'total_count': 0}
+        }
+
+        buffered_file = tmp_path / "buffered.json"
+        streamed_file = tmp_path / "streamed.json"
+        assert exporter.export_data(data, str(buffered_file))
+        assert exporter.export_data(data, str(streamed_file), stream=True)
+
+        assert json.loads(streamed_file.read_text(encoding='utf-8')) == \
+            json.loads(buffered_file.read_text(encoding='utf-8'))
+        # 每条指令独占一行
+        lines = streamed_file.read_text(encoding='utf-8').splitlines()
+        assert '{"address":4096,"mnemonic":"push","op_str":"rbp"},' in lines
+
+    def test_current_timestamp_is_utc(self, exporter):
+        """测试导出时间戳为 UTC ISO 格式"""
+        timestamp = exporter._current_timestamp()
+
+        assert timestamp.endswith('+00:00')
+        assert datetime.fromisoformat(timestamp).utcoffset().total_seconds() == 0
+
     def test_export_without_statistics(self, exporter, mock_call_analyzer):
         """测试不包含统计信息的导出"""
         with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp_file:
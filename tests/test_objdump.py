@@ -0,0 +1,119 @@
+"""
+objdump 输出的黄金测试用例
+
+tests/golden/objdump 下的期望输出由示例程序 demo/test_program 生成，
+使用默认的 Capstone 后端；修改输出格式时需同步更新这些文件。
+"""
+
+import os
+import json
+import pytest
+from click.testing import CliRunner
+
+from elfscope.cli import cli
+from elfscope.core.elf_parser import ElfParser
+from elfscope.core.objdump import ObjdumpAnalyzer
+
+
+DEMO_PROGRAM = os.path.join(os.path.dirname(__file__), '..', 'demo', 'test_program')
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), 'golden', 'objdump')
+
+# (黄金文件名, objdump 命令参数)
+GOLDEN_CASES = [
+    ('range', ['-d', '--start-addr', '0x11e0', '--stop-addr', '0x13b2']),
+    ('main', ['-d', '-f', 'main']),
+    ('syms', ['-t']),
+    ('headers', ['-h']),
+    ('rodata', ['-s', '--section', '.rodata']),
+    ('reloc', ['-r']),
+]
+
+pytestmark = pytest.mark.skipif(not os.path.exists(DEMO_PROGRAM), reason="没有示例程序")
+
+
+def _read_golden(filename):
+    """读取黄金文件内容"""
+    with open(os.path.join(GOLDEN_DIR, filename), encoding='utf-8') as f:
+        return f.read()
+
+
+def _run_objdump(args):
+    """运行 objdump 命令并返回输出"""
+    result = CliRunner().invoke(cli, ['objdump', DEMO_PROGRAM, *args])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+class TestObjdumpGolden:
+    """objdump 黄金输出测试类"""
+
+    @pytest.mark.parametrize('name,args', GOLDEN_CASES, ids=[name for name, _ in GOLDEN_CASES])
+    def test_text_output(self, name, args):
+        """测试文本输出与黄金文件逐字节一致"""
+        assert _run_objdump(args) == _read_golden(f'{name}.txt')
+
+    @pytest.mark.parametrize('name,args', GOLDEN_CASES, ids=[name for name, _ in GOLDEN_CASES])
+    @pytest.mark.parametrize('stream', [False, True], ids=['json', 'stream'])
+    def test_json_output(self, name, args, stream, temp_dir):
+        """测试 JSON 输出（含流式写出）与黄金文件内容一致"""
+        output_file = os.path.join(temp_dir, f'{name}.json')
+        _run_objdump(args + ['-o', output_file] + (['--stream'] if stream else []))
+
+        with open(output_file, encoding='utf-8') as f:
+            assert json.load(f) == json.loads(_read_golden(f'{name}.json'))
+
+    def test_range_marks_functions_and_call_targets(self):
+        """测试地址范围跨越多个函数时标注函数起始和直接调用目标，内存间接调用不带目标"""
+        instructions = json.loads(_read_golden('range.json'))['disassembly']['instructions']
+        by_address = {insn['address']: insn for insn in instructions}
+
+        # 大小为 0 的符号（如 deregister_tm_clones）不作为函数起始标注
+        assert [(insn['address'], insn['function']) for insn in instructions
+                if 'function' in insn] == [
+            (0x11e0, '_start'), (0x12c9, 'print_message'), (0x12f7, 'debug_info'),
+            (0x132a, 'error_handler'), (0x135f, 'fibonacci_recursive')
+        ]
+        assert by_address[0x11ff]['op_str'] == 'qword ptr [rip + 0x3dd3]'
+        assert 'call_target' not in by_address[0x11ff]
+        assert by_address[0x12a7]['call_target'] == 0x1210
+        assert 'call_target_name' not in by_address[0x12a7]
+        assert by_address[0x137e]['call_target_name'] == 'debug_info'
+
+
+@pytest.fixture(scope='module')
+def listing():
+    """反汇编示例程序的全部代码段，同时返回节区信息"""
+    with ElfParser(DEMO_PROGRAM) as elf_parser:
+        return ObjdumpAnalyzer(elf_parser).disassemble_section(), dict(elf_parser.sections)
+
+
+class TestObjdumpSections:
+    """整段反汇编测试类"""
+
+    def test_sections_decode_without_gaps(self, listing):
+        """测试每个代码段的指令首尾相接、覆盖整个节区"""
+        disassembly, headers = listing
+
+        assert [sec['name'] for sec in disassembly['sections']] == [
+            '.init', '.plt', '.plt.got', '.plt.sec', '.text', '.fini'
+        ]
+        for sec in disassembly['sections']:
+            instructions = sec['instructions']
+            address = headers[sec['name']]['addr']
+            for insn in instructions:
+                assert insn['address'] == address
+                assert len(insn['bytes']) == insn['size'] * 2
+                address += insn['size']
+            assert address == headers[sec['name']]['addr'] + headers[sec['name']]['size']
+
+        assert disassembly['total_instructions'] == sum(
+            len(sec['instructions']) for sec in disassembly['sections'])
+
+    def test_range_matches_section_listing(self, listing):
+        """测试地址范围反汇编是整段反汇编结果的切片"""
+        disassembly, _ = listing
+        text = next(sec for sec in disassembly['sections'] if sec['name'] == '.text')
+        expected = [insn for insn in text['instructions'] if 0x11e0 <= insn['address'] < 0x13b2]
+        golden = json.loads(_read_golden('range.json'))['disassembly']['instructions']
+
+        assert expected == golden
@@ -97,6 +97,44 @@ class TestPathFinder:
         assert result['source_function'] is None
         assert len(result['paths']) > 0
 
+    def test_iter_paths_is_lazy(self, mock_call_analyzer):
+        """测试逐条生成路径，与 find_paths 的结果一致"""
+        finder = PathFinder(mock_call_analyzer)
+        
+        paths = finder.iter_paths('leaf_func', max_depth=5)
+        first = next(paths)
+        remaining = list(paths)
+        
+        result = finder.find_paths('leaf_func', max_depth=5)
+        assert [first] + remaining == [p['path'] for p in result['paths']]
+        assert sorted(map(tuple, [first] + remaining)) == sorted([
+            ('main', 'func_a', 'func_b', 'leaf_func'),
+            ('main', 'func_c', 'leaf_func'),
+            ('func_a', 'func_b', 'leaf_func'),
+            ('func_b', 'leaf_func'),
+            ('func_c', 'leaf_func'),
+        ])
+        assert list(finder.iter_paths('nonexistent_func')) == []
+
+    def test_deep_call_chain_without_recursion_limit(self):
+        """测试超过 Python 递归深度的调用链"""
+        analyzer = Mock(spec=CallAnalyzer)
+        analyzer.analyzed = True
+        analyzer.call_graph = nx.DiGraph()
+        analyzer.get_call_details.return_value = []
+        depth = 1500
+        for i in range(depth):
+            analyzer.call_graph.add_edge(f'func_{i}', f'func_{i + 1}')
+        
+        finder = PathFinder(analyzer)
+        
+        paths = list(finder.iter_paths(f'func_{depth}', 'func_0', max_depth=depth))
+        assert len(paths) == 1
+        assert len(paths[0]) == depth + 1
+        
+        callers = finder.find_all_callers(f'func_{depth}', max_depth=depth)
+        assert callers['total_callers'] == depth
+
     def test_find_paths_nonexistent_target(self, mock_call_analyzer):
         """测试查找不存在的目标函数"""
         finder = PathFinder(mock_call_analyzer)
@@ -144,6 +182,17 @@ class TestPathFinder:
         caller_names = [caller['function'] for caller in result['callers']]
         assert 'func_b' in caller_names or 'func_c' in caller_names
 
+    def test_find_all_callers_after_replacing_edge(self, mock_call_analyzer):
+        """测试替换一条边（节点数和边数不变）后向上搜索使用新的调用关系"""
+        finder = PathFinder(mock_call_analyzer)
+        assert finder.find_all_callers('func_b')['total_callers'] == 2
+        
+        mock_call_analyzer.call_graph.remove_edge('func_a', 'func_b')
+        mock_call_analyzer.call_graph.add_edge('func_c', 'func_b')
+        
+        result = finder.find_all_callers('func_b')
+        assert sorted(caller['function'] for caller in result['callers']) == ['func_c', 'main']
+
     def test_analyze_function_reachability(self, mock_call_analyzer):
         """测试函数可达性分析"""
         finder = PathFinder(mock_call_analyzer)
@@ -222,6 +271,18 @@ class TestPathFinder:
         
         # 应该能找到路径，即使有环存在
         assert len(result['paths']) > 0
+        
+        # 环上的函数最多重复一次，路径最多包含 max_depth 个函数
+        paths = sorted(finder.iter_paths('leaf_func', 'main', max_depth=8, include_cycles=True))
+        assert paths == [
+            ['main', 'func_a', 'func_b', 'func_a', 'func_b', 'leaf_func'],
+            ['main', 'func_a', 'func_b', 'leaf_func'],
+            ['main', 'func_c', 'leaf_func'],
+        ]
+        assert sorted(finder.iter_paths('leaf_func', 'main', max_depth=5, include_cycles=True)) == [
+            ['main', 'func_a', 'func_b', 'leaf_func'],
+            ['main', 'func_c', 'leaf_func'],
+        ]
 
     def test_find_paths_max_depth_limit(self, mock_call_analyzer):
         """测试最大深度限制"""
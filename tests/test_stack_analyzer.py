@@ -0,0 +1,158 @@
+"""
+栈消耗分析器测试用例
+"""
+
+import sys
+import pytest
+from unittest.mock import Mock, patch
+import networkx as nx
+
+from elfscope.core.stack_analyzer import StackAnalyzer
+from elfscope.core.call_analyzer import CallAnalyzer
+from elfscope.core.elf_parser import ElfParser
+
+
+class TestStackAnalyzer:
+    """栈消耗分析器测试类"""
+
+    @pytest.fixture
+    def mock_call_analyzer(self):
+        """创建模拟的调用关系分析器"""
+        parser = Mock(spec=ElfParser)
+        parser.filepath = "/test/binary"
+        parser.get_text_section_by_address.return_value = {
+            'name': '.text',
+            'addr': 0x401000,
+            'size': 0x1000
+        }
+        parser.get_section_view.return_value = memoryview(b'\x90' * 0x1000)
+
+        analyzer = Mock(spec=CallAnalyzer)
+        analyzer.architecture = "x86_64"
+        analyzer.analyzed = True
+        analyzer.elf_parser = parser
+        analyzer.call_graph = nx.DiGraph()
+
+        return analyzer
+
+    def test_aliases_share_stack_frame(self, mock_call_analyzer):
+        """测试共享 (地址, 大小) 的符号别名得到相同栈帧且只反汇编一次"""
+        mock_call_analyzer.elf_parser.get_functions.return_value = [
+            {'name': 'memcpy', 'value': 0x401000, 'size': 0x40},
+            {'name': '__memcpy_alias', 'value': 0x401000, 'size': 0x40},
+            {'name': 'other', 'value': 0x401100, 'size': 0x20},
+            {'name': 'empty', 'value': 0x401200, 'size': 0}
+        ]
+        analyzer = StackAnalyzer(mock_call_analyzer)
+
+        with patch.object(analyzer, '_analyze_function_stack_frame',
+                          side_effect=[0x30, 0x10]) as mock_frame:
+            analyzer._analyze_stack_frames()
+
+        assert mock_frame.call_count == 2
+        assert analyzer.function_stack_frames == {
+            'memcpy': 0x30,
+            '__memcpy_alias': 0x30,
+            'other': 0x10,
+            'empty': 0
+        }
+
+    def test_call_chain_deeper_than_recursion_limit(self, mock_call_analyzer):
+        """测试调用链深度超过 Python 递归限制时仍能完成计算"""
+        depth = sys.getrecursionlimit() + 100
+        names = [f'func_{i}' for i in range(depth)]
+        mock_call_analyzer.call_graph.add_nodes_from(names)
+        mock_call_analyzer.call_graph.add_edges_from(zip(names, names[1:]))
+
+        analyzer = StackAnalyzer(mock_call_analyzer)
+        analyzer.function_stack_frames = {name: 16 for name in names}
+        analyzer._calculate_call_chain_stack()
+
+        assert analyzer.function_max_stack['func_0'] == 16 * depth
+        assert analyzer.function_max_stack[names[-1]] == 16
+        assert analyzer.function_max_stack_paths['func_0'] == names
+        assert analyzer.function_max_stack_paths[names[-1]] == names
+
+    def test_call_chain_with_recursive_cycle(self, mock_call_analyzer):
+        """测试调用环的栈消耗和路径与递归实现的结果一致"""
+        graph = mock_call_analyzer.call_graph
+        graph.add_nodes_from(['main', 'func_a', 'func_b', 'printf'])
+        graph.add_edges_from([
+            ('main', 'func_a'),
+            ('func_a', 'func_b'),
+            ('func_b', 'func_a'),
+            ('func_b', 'printf')
+        ])
+
+        analyzer = StackAnalyzer(mock_call_analyzer)
+        analyzer.function_stack_frames = {'main': 16, 'func_a': 32, 'func_b': 48}
+        analyzer._calculate_call_chain_stack()
+
+        cycle = '[循环: func_a → func_b] (递归 x10)'
+        assert analyzer.function_max_stack == {
+            'main': 1376,
+            'func_a': 1360,
+            'func_b': 1328,
+            'printf': 64
+        }
+        assert analyzer.function_max_stack_paths == {
+            'main': [cycle, 'func_b (递归 x10)'],
+            'func_a': ['main', cycle, 'func_b (递归 x10)'],
+            'func_b': ['main', 'func_a', cycle, 'func_b (递归 x10)'],
+            'printf': ['main', 'func_a', 'func_b', 'printf']
+        }
+
+    def _loaded_analyzer(self, mock_call_analyzer, frames, max_stack):
+        """创建已载入栈分析结果的分析器"""
+        analyzer = StackAnalyzer(mock_call_analyzer)
+        analyzer.load_analysis_state({
+            'function_stack_frames': frames,
+            'function_max_stack': max_stack,
+            'function_max_stack_paths': {name: [name] for name in frames}
+        })
+        return analyzer
+
+    def test_stack_heavy_functions_limits_are_prefixes(self, mock_call_analyzer):
+        """测试不同 limit 的结果是同一排序的前缀"""
+        frames = {'main': 16, 'func_a': 64, 'func_b': 32, 'func_c': 8}
+        max_stack = {'main': 120, 'func_a': 96, 'func_b': 32, 'func_c': 200}
+        analyzer = self._loaded_analyzer(mock_call_analyzer, frames, max_stack)
+
+        full = analyzer.find_stack_heavy_functions(limit=10)
+        assert [f['function'] for f in full] == ['func_c', 'main', 'func_a', 'func_b']
+        for limit in range(len(full) + 1):
+            assert analyzer.find_stack_heavy_functions(limit=limit) == full[:limit]
+
+        local = analyzer.find_stack_heavy_functions(limit=10, sort_by='local')
+        assert [f['function'] for f in local] == ['func_a', 'func_b', 'main', 'func_c']
+        assert analyzer.find_stack_heavy_functions(limit=2, sort_by='local') == local[:2]
+
+    def test_stack_heavy_order_reset_on_load(self, mock_call_analyzer):
+        """测试载入新的分析结果后重新排序"""
+        analyzer = self._loaded_analyzer(mock_call_analyzer,
+                                         {'main': 16, 'func_a': 64},
+                                         {'main': 80, 'func_a': 64})
+        assert analyzer.find_stack_heavy_functions(limit=1)[0]['function'] == 'main'
+
+        analyzer.load_analysis_state({
+            'function_stack_frames': {'main': 16, 'func_a': 64},
+            'function_max_stack': {'main': 16, 'func_a': 64},
+            'function_max_stack_paths': {}
+        })
+        assert analyzer.find_stack_heavy_functions(limit=1)[0]['function'] == 'func_a'
+
+    def test_stack_heavy_order_reset_on_analyze(self, mock_call_analyzer):
+        """测试重新分析后重新排序"""
+        analyzer = self._loaded_analyzer(mock_call_analyzer,
+                                         {'main': 16, 'func_a': 64},
+                                         {'main': 80, 'func_a': 64})
+        assert analyzer.find_stack_heavy_functions(limit=1)[0]['function'] == 'main'
+
+        def reanalyze():
+            analyzer.function_max_stack = {'main': 16, 'func_a': 64}
+
+        with patch.object(analyzer, '_analyze_stack_frames'), \
+                patch.object(analyzer, '_calculate_call_chain_stack', side_effect=reanalyze):
+            analyzer.analyze()
+
+        assert analyzer.find_stack_heavy_functions(limit=1)[0]['function'] == 'func_a'